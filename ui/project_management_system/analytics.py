@@ -0,0 +1,412 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database import DatabaseManager
+
+DONE = 'Tamamlandı'
+IN_PROGRESS = 'Devam Ediyor'
+
+HISTORY_QUERY = """
+    SELECT history_id, task_id, old_status, new_status, changed_at
+    FROM TaskStatusHistory
+    WHERE history_id > ?
+    ORDER BY history_id
+"""
+
+TASK_COLUMNS = """
+    SELECT t.task_id, t.project_id, e.DepartmentID AS department_id, t.due_date
+    FROM Tasks t
+    LEFT JOIN Employees e ON e.EmployeeID = t.employee_id
+"""
+
+# Görev satırındaki proje/son tarih/çalışan değişiklikleri (migration 007); tablo filtresi
+# Python'da uygulanır, boşluk tespiti ardışık change_id'lere dayanır
+CHANGES_QUERY = """
+    SELECT change_id, table_name, row_id, operation, changed_at
+    FROM ChangeLog
+    WHERE change_id > ?
+    ORDER BY change_id
+"""
+
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M'}
+
+
+class AnalyticsError(ValueError):
+    """Geçersiz rapor parametresi verildiğinde fırlatılır"""
+
+
+def _days(delta: pd.Series) -> pd.Series:
+    return (delta / pd.Timedelta(days=1)).round(2)
+
+
+def _percentiles(values: pd.Series) -> Dict[str, Any]:
+    values = values.dropna()
+    if values.empty:
+        return {'count': 0, 'mean': None, 'p50': None, 'p85': None, 'p95': None}
+    p50, p85, p95 = np.percentile(values.to_numpy(), [50, 85, 95])
+    return {'count': int(values.size), 'mean': round(float(values.mean()), 2),
+            'p50': round(float(p50), 2), 'p85': round(float(p85), 2), 'p95': round(float(p95), 2)}
+
+
+class TaskAnalytics:
+    """
+    TaskStatusHistory üzerinde vektörel (pandas/NumPy) görev analitiği
+
+    İlk çağrıda geçmiş, görev özellikleri ve isimler get_dataframe ile toplu
+    okunur; sonraki refresh() çağrıları yalnızca son history_id'den sonraki
+    geçmiş satırlarını ve ChangeLog'daki görev değişikliklerini okur. Bellekte
+    tutulan çerçeveler:
+
+        history   ham durum geçişleri (durumlar int8 kod olarak)
+        tasks     görev başına proje, departman ve son tarih
+        state     görev başına oluşturulma/başlama/tamamlanma zamanı ve durum
+        flow      (proje, gün, durum) başına o gün duruma giren - çıkan görev
+
+    Yeni satırlar yalnızca dokundukları görevlerin state'ini yeniden hesaplar
+    ve flow'a eklenir; projesi değişen veya silinen görevlerin eski katkısı
+    flow'dan çıkarılır. Raporlar bu çerçevelerden hesaplanır ve bir sonraki
+    değişikliğe kadar önbellekte kalır.
+
+    IDENTITY değerleri commit sırasından önce dağıtıldığından, id dizisindeki
+    bir boşluktan sonraki satırlar settle saniyeden eskiyene kadar işlenmez
+    (ChangeFeed ile aynı kural).
+    """
+
+    def __init__(self, db: DatabaseManager, min_interval: float = 5.0, settle: float = 5.0):
+        """
+        Args:
+            db: Veritabanı yöneticisi
+            min_interval: Raporlar arasında refresh() için beklenecek en kısa süre (saniye)
+            settle: id boşluğu sonrasındaki satırların bekletileceği süre (saniye)
+        """
+        self.db = db
+        self.min_interval = min_interval
+        self.settle = timedelta(seconds=settle)
+
+        self._lock = threading.RLock()
+        self._statuses: List[str] = []
+        self._history: Optional[pd.DataFrame] = None
+        self._tasks: Optional[pd.DataFrame] = None
+        self._state: Optional[pd.DataFrame] = None
+        self._flow: Optional[pd.Series] = None
+        self._projects: Dict[int, str] = {}
+        self._departments: Dict[int, str] = {}
+        self._history_mark = 0
+        self._change_mark = 0
+        self._refreshed_at = 0.0
+        self._results: Dict[Any, Any] = {}
+
+        self.generation = 0
+        self.last_refresh: Dict[str, Any] = {}
+
+    # ============================================
+    # YÜKLEME VE ARTIMLI GÜNCELLEME
+    # ============================================
+    def load(self) -> Dict[str, Any]:
+        """Tüm çerçeveleri veritabanından baştan oku (ilk çağrı veya ChangeLog budandığında)"""
+        with self._lock:
+            started = time.perf_counter()
+            history, tasks, change_mark, projects, departments = self.db.fan_out(
+                lambda: self.db.get_dataframe(HISTORY_QUERY, (0,)),
+                lambda: self.db.get_dataframe(TASK_COLUMNS),
+                lambda: self.db.execute_scalar("SELECT ISNULL(MAX(change_id), 0) FROM ChangeLog"),
+                lambda: self.db.execute_query("SELECT project_id, project_name FROM Projects"),
+                lambda: self.db.execute_query("SELECT department_id, department_name FROM Departments")
+            )
+            self._statuses = []
+            self._tasks = self._prepare_tasks(tasks)
+            self._history = self._prepare_history(history)
+            self._state = self._task_state(self._history)
+            self._flow = self._flow_of(self._history, self._tasks)
+            self._projects = {row['project_id']: row['project_name'] for row in projects}
+            self._departments = {row['department_id']: row['department_name'] for row in departments}
+            # ChangeLog token'ı geçmişten sonra okunursa aradaki görev değişiklikleri tekrar işlenir (zararsız)
+            self._change_mark = change_mark
+            self._history_mark = int(self._history['history_id'].max()) if len(self._history) else 0
+            self._changed(len(self._history), len(self._tasks), started, full=True)
+            return self.last_refresh
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """Son okumadan sonra eklenen geçmiş satırlarını ve görev değişikliklerini uygula"""
+        with self._lock:
+            if self._history is None:
+                return self.load()
+            if not force and time.monotonic() - self._refreshed_at < self.min_interval:
+                return self.last_refresh
+
+            started = time.perf_counter()
+            history, changes, oldest_change = self.db.fan_out(
+                lambda: self.db.get_dataframe(HISTORY_QUERY, (self._history_mark,)),
+                lambda: self.db.get_dataframe(CHANGES_QUERY, (self._change_mark,)),
+                lambda: self.db.execute_scalar("SELECT MIN(change_id) FROM ChangeLog")
+            )
+            if oldest_change is not None and self._change_mark < oldest_change - 1:
+                return self.load()  # budanan görev değişiklikleri bilinemez
+
+            history = self._settled(history, 'history_id', self._history_mark)
+            changes = self._settled(changes, 'change_id', self._change_mark)
+            change_mark = int(changes['change_id'].max()) if len(changes) else self._change_mark
+            projects_changed = bool((changes['table_name'] == 'Projects').any())
+            changes = changes[changes['table_name'] == 'Tasks']
+            if history.empty and changes.empty and not projects_changed:
+                self._change_mark = change_mark
+                self._refreshed_at = time.monotonic()
+                self.last_refresh = dict(self.last_refresh, rows=0, tasks=0, full=False,
+                                         elapsed=time.perf_counter() - started)
+                return self.last_refresh
+
+            new_history = self._prepare_history(history)
+            deleted = pd.Index(changes.loc[changes['operation'] == 'D', 'row_id'].unique())
+            changed = pd.Index(changes.loc[changes['operation'] != 'D', 'row_id'].unique())
+            unknown = pd.Index(new_history['task_id'].unique()).difference(self._tasks.index)
+            fetched = self._fetch_tasks(changed.union(unknown).difference(deleted))
+
+            # Özelliği değişen (veya silinen) görevlerin eski katkısı flow'dan çıkarılır
+            previous = self._tasks.reindex(fetched.index)
+            moved = fetched.index[(previous['project_id'].notna() & (previous['project_id'] != fetched['project_id']))
+                                  .to_numpy(dtype=bool, na_value=False)]
+            retract = moved.union(deleted.intersection(self._tasks.index))
+            if len(retract):
+                old_rows = self._history[self._history['task_id'].isin(retract)]
+                self._flow = self._flow.sub(self._flow_of(old_rows, self._tasks), fill_value=0)
+
+            tasks = pd.concat([self._tasks.drop(fetched.index.union(deleted), errors='ignore'), fetched])
+            history = pd.concat([self._history, new_history], ignore_index=True)
+            if len(deleted):
+                history = history[~history['task_id'].isin(deleted)]
+            self._tasks, self._history = tasks, history
+
+            # Taşınan görevlerin tüm geçmişi ve yeni satırlar güncel özelliklerle eklenir
+            added = pd.concat([history[history['task_id'].isin(moved)], new_history[~new_history['task_id']
+                               .isin(moved.union(deleted))]], ignore_index=True)
+            self._flow = self._flow.add(self._flow_of(added, tasks), fill_value=0)
+            self._flow = self._flow[self._flow != 0].astype(np.int64).sort_index()
+
+            touched = pd.Index(new_history['task_id'].unique()).union(fetched.index).union(deleted)
+            state = self._task_state(history[history['task_id'].isin(touched)])
+            self._state = pd.concat([self._state.drop(touched, errors='ignore'), state])
+
+            if len(new_history):
+                self._history_mark = int(new_history['history_id'].max())
+            self._change_mark = change_mark
+            if projects_changed:
+                self._projects = {row['project_id']: row['project_name'] for row in
+                                  self.db.execute_query("SELECT project_id, project_name FROM Projects")}
+            self._changed(len(new_history), len(touched), started, full=False)
+            return self.last_refresh
+
+    def _changed(self, rows: int, tasks: int, started: float, full: bool):
+        self.generation += 1
+        self._results.clear()
+        self._refreshed_at = time.monotonic()
+        self.last_refresh = {
+            'generation': self.generation,
+            'full': full,
+            'rows': rows,
+            'tasks': tasks,
+            'history_rows': len(self._history),
+            'elapsed': time.perf_counter() - started,
+            'refreshed_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def _settled(self, frame: pd.DataFrame, id_column: str, mark: int) -> pd.DataFrame:
+        """Commit edilmemiş olabilecek ilk genç boşluğa kadar olan satırlar"""
+        if frame.empty:
+            return frame
+        ids = frame[id_column].to_numpy()
+        gaps = np.flatnonzero(np.diff(ids, prepend=mark) != 1)
+        if len(gaps):
+            changed_at = pd.to_datetime(frame['changed_at'])
+            young = gaps[(changed_at.iloc[gaps] > datetime.now() - self.settle).to_numpy()]
+            if len(young):
+                return frame.iloc[:young[0]]
+        return frame
+
+    def _fetch_tasks(self, task_ids: Iterable[int]) -> pd.DataFrame:
+        ids = [int(task_id) for task_id in task_ids]
+        frames = [self.db.get_dataframe(
+            f"{TASK_COLUMNS} WHERE t.task_id IN ({', '.join('?' for _ in chunk)})", tuple(chunk))
+            for chunk in (ids[start:start + 500] for start in range(0, len(ids), 500))]
+        if not frames:
+            return self._tasks.iloc[:0]
+        return self._prepare_tasks(pd.concat(frames, ignore_index=True))
+
+    # ============================================
+    # VEKTÖREL HESAPLAR
+    # ============================================
+    def _codes(self, values: pd.Series) -> np.ndarray:
+        """Durum metinlerini int8 koda çevir (NULL -> -1); yeni durumlar listeye eklenir"""
+        present = values.dropna().unique()
+        self._statuses.extend(status for status in present if status not in self._statuses)
+        return pd.Index(self._statuses).get_indexer(values).astype(np.int8)
+
+    def _code(self, status: str) -> int:
+        return self._statuses.index(status) if status in self._statuses else -2
+
+    def _prepare_history(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({
+            'history_id': frame['history_id'].to_numpy(np.int64),
+            'task_id': frame['task_id'].to_numpy(np.int64),
+            'old_status': self._codes(frame['old_status']),
+            'new_status': self._codes(frame['new_status']),
+            'changed_at': pd.to_datetime(frame['changed_at']).to_numpy('datetime64[ns]'),
+        })
+
+    @staticmethod
+    def _prepare_tasks(frame: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({
+            'project_id': pd.to_numeric(frame['project_id']).astype('Int64').to_numpy(),
+            'department_id': pd.to_numeric(frame['department_id']).astype('Int64').to_numpy(),
+            'due_date': pd.to_datetime(frame['due_date']).to_numpy('datetime64[ns]'),
+        }, index=pd.Index(frame['task_id'].to_numpy(np.int64), name='task_id'))
+
+    def _task_state(self, history: pd.DataFrame) -> pd.DataFrame:
+        """Görev başına oluşturulma, ilk başlama, tamamlanma zamanı ve son durum"""
+        ordered = history.sort_values('history_id')
+        grouped = ordered.groupby('task_id', sort=False)
+        last = grouped.tail(1).set_index('task_id')
+        started = (ordered[ordered['new_status'] == self._code(IN_PROGRESS)]
+                   .groupby('task_id')['changed_at'].min())
+        return pd.DataFrame({
+            'created_at': grouped['changed_at'].min(),
+            'started_at': started,
+            'completed_at': last['changed_at'].where(last['new_status'] == self._code(DONE)),
+            'status': last['new_status'],
+        })
+
+    def _flow_of(self, history: pd.DataFrame, tasks: pd.DataFrame) -> pd.Series:
+        """(proje, gün, durum) başına net görev değişimi: yeni duruma +1, eski duruma -1"""
+        project = tasks['project_id'].reindex(history['task_id'].to_numpy()).to_numpy('float64', na_value=np.nan)
+        day = history['changed_at'].dt.normalize().to_numpy()
+        leaving = history['old_status'].to_numpy() >= 0
+        events = pd.DataFrame({
+            'project_id': np.concatenate([project, project[leaving]]),
+            'day': np.concatenate([day, day[leaving]]),
+            'status': np.concatenate([history['new_status'].to_numpy(), history['old_status'].to_numpy()[leaving]]),
+            'n': np.concatenate([np.ones(len(history), np.int64), -np.ones(int(leaving.sum()), np.int64)]),
+        }).dropna(subset=['project_id'])
+        events['project_id'] = events['project_id'].astype(np.int64)
+        return events.groupby(['project_id', 'day', 'status'])['n'].sum()
+
+    def _timed_state(self) -> pd.DataFrame:
+        state = self._state.join(self._tasks, how='inner')
+        state['lead_time'] = _days(state['completed_at'] - state['created_at'])
+        state['cycle_time'] = _days(state['completed_at'] - state['started_at'])
+        return state
+
+    def _cached(self, key, compute):
+        with self._lock:
+            self.refresh()
+            if key not in self._results:
+                self._results[key] = compute()
+            return self._results[key]
+
+    # ============================================
+    # RAPORLAR (JSON'a hazır)
+    # ============================================
+    def cycle_times(self, project_id: Optional[int] = None, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Tamamlanan görevlerin lead time (oluşturma -> tamamlanma) ve cycle time
+        (ilk 'Devam Ediyor' -> tamamlanma) süreleri, gün cinsinden
+
+        project_id verilirse görev bazında liste (en yeni limit kadar) de döner.
+        """
+        def compute():
+            state = self._timed_state()
+            done = state[state['completed_at'].notna()]
+            if project_id is not None:
+                done = done[done['project_id'] == project_id]
+            result = {'lead_time': _percentiles(done['lead_time']),
+                      'cycle_time': _percentiles(done['cycle_time'])}
+            if project_id is not None:
+                recent = done.sort_values('completed_at', ascending=False).head(limit)
+                result['tasks'] = [
+                    {'task_id': int(task_id), 'completed_at': completed.isoformat(),
+                     'lead_time': None if pd.isna(lead) else float(lead),
+                     'cycle_time': None if pd.isna(cycle) else float(cycle)}
+                    for task_id, completed, lead, cycle in zip(recent.index, recent['completed_at'],
+                                                               recent['lead_time'], recent['cycle_time'])]
+            return result
+        return self._cached(('cycle_times', project_id, limit), compute)
+
+    def flow(self, project_id: int) -> Dict[str, Any]:
+        """Projenin günlük kümülatif akışı (durum başına görev sayısı) ve burndown'u"""
+        def compute():
+            if project_id not in self._flow.index.get_level_values(0):
+                raise AnalyticsError(f"Proje için durum geçmişi yok: {project_id}")
+            daily = self._flow.xs(project_id, level='project_id').unstack('status', fill_value=0)
+            daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq='D'), fill_value=0)
+            cumulative = daily.cumsum()
+            cumulative.columns = [self._statuses[code] for code in cumulative.columns]
+            scope = cumulative.sum(axis=1)
+            remaining = scope - cumulative.get(DONE, 0)
+            return {
+                'project_id': project_id,
+                'project_name': self._projects.get(project_id),
+                'dates': [day.strftime('%Y-%m-%d') for day in cumulative.index],
+                'cumulative_flow': {status: cumulative[status].astype(int).tolist()
+                                    for status in cumulative.columns},
+                'burndown': {'scope': scope.astype(int).tolist(), 'remaining': remaining.astype(int).tolist()},
+            }
+        return self._cached(('flow', project_id), compute)
+
+    def throughput(self, period: str = 'week') -> Dict[str, Any]:
+        """Departman başına dönem dönem tamamlanan görev sayısı"""
+        if period not in PERIODS:
+            raise AnalyticsError(f"period {', '.join(PERIODS)} değerlerinden biri olmalı")
+
+        def compute():
+            state = self._state.join(self._tasks, how='inner')
+            done = state[state['completed_at'].notna()]
+            counts = done.groupby([done['department_id'],
+                                   done['completed_at'].dt.to_period(PERIODS[period]).dt.start_time]).size()
+            departments = {}
+            for department_id, series in counts.groupby(level=0):
+                series = series.droplevel(0)
+                departments[self._departments.get(int(department_id), str(department_id))] = {
+                    'periods': [start.strftime('%Y-%m-%d') for start in series.index],
+                    'completed': series.astype(int).tolist(),
+                }
+            return {'period': period, 'departments': departments}
+        return self._cached(('throughput', period), compute)
+
+    def on_time(self) -> Dict[str, Any]:
+        """Son tarihi olan tamamlanmış görevlerde zamanında tamamlanma oranı (genel, proje, departman)"""
+        def compute():
+            state = self._state.join(self._tasks, how='inner')
+            done = state[state['completed_at'].notna() & state['due_date'].notna()]
+            on_time = done['completed_at'].dt.normalize() <= done['due_date']
+
+            def rates(key):
+                grouped = on_time.groupby(done[key])
+                frame = pd.DataFrame({'completed': grouped.size(), 'on_time': grouped.sum()})
+                frame['rate'] = (frame['on_time'] / frame['completed']).round(4)
+                return frame
+
+            projects, departments = rates('project_id'), rates('department_id')
+            return {
+                'overall': {'completed': int(len(done)), 'on_time': int(on_time.sum()),
+                            'rate': round(float(on_time.mean()), 4) if len(done) else None},
+                'projects': [{'project_id': int(key), 'project_name': self._projects.get(int(key)),
+                              'completed': int(row.completed), 'on_time': int(row.on_time), 'rate': row.rate}
+                             for key, row in projects.iterrows()],
+                'departments': [{'department_id': int(key), 'department_name': self._departments.get(int(key)),
+                                 'completed': int(row.completed), 'on_time': int(row.on_time),
+                                 'rate': row.rate}
+                                for key, row in departments.iterrows()],
+            }
+        return self._cached(('on_time',), compute)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            loaded = self._history is not None
+            return dict(self.last_refresh,
+                        memory_bytes=int(sum(frame.memory_usage(deep=True).sum() for frame in
+                                             (self._history, self._tasks, self._state)) + self._flow.nbytes)
+                        if loaded else 0,
+                        cached_results=len(self._results))
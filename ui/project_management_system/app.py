@@ -1,32 +1,319 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import (Blueprint, Flask, render_template, request, jsonify, redirect, url_for, session, Response, g,
+                   current_app, has_request_context, make_response, before_render_template, template_rendered)
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.local import LocalProxy
 from database import DatabaseManager
+from change_feed import ChangeFeed, ChangeFeedError
+from data_versions import DataVersions, base_tables
+from dashboard_stats import DashboardStatsService
+from pagination import KeysetPaginator, PaginationError, parse_date
+from profiling import RequestProfiler
+from query_cache import QueryCache
+from query_metrics import QueryMetrics
+from retention import RetentionJob, default_policies
+from search_index import SearchError, SearchIndex, SearchSource
+from export import EXPORT_FORMATS, iter_export
+from migrations import migrate
+from notification_scanner import NotificationScanner
+from notification_stream import (NOTIFICATION_COLUMNS, NotificationError, NotificationHub, format_event,
+                                 mark_read, unread_count)
+from backends import SqlServerBackend
+from rows import ResultSet, Row
+from sqlite_backend import SQLiteBackend
+from task_bulk import TaskBulkError, create_tasks
+from task_status import StatusChangeError, apply_status_changes
 from datetime import datetime, timedelta
+from functools import wraps
+from typing import Any, Dict, Optional
+import hashlib
+import hmac
 import json
+import os
+import secrets
+import threading
+import time
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    """
+    jsonify'ın compact sorgu sonuçlarını (ResultSet/Row) da serileştirmesini sağlar
+
+    ResultSet'ler satır başına dict oluşturulmadan ResultSet.to_json_objects()
+    ile yazılır: encode sırasında yerlerine tek kullanımlık bir işaret metni
+    konur, ardından işaret hazırlanan JSON parçasıyla değiştirilir.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Row):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        fallback = kwargs.pop('default', self.default)
+        ensure_ascii = kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        sort_keys = kwargs.setdefault('sort_keys', self.sort_keys)
+        marker = f'\x00{secrets.token_hex(8)}:'
+        fragments = []
+
+        def default(o):
+            if isinstance(o, ResultSet):
+                try:
+                    fragments.append(o.to_json_objects(fallback, ensure_ascii, sort_keys))
+                except ValueError:
+                    return o.to_dicts()  # skaler olmayan değerler: eski yol
+                return f'{marker}{len(fragments) - 1}'
+            return fallback(o)
+
+        text = super().dumps(obj, default=default, **kwargs)
+        for i, fragment in enumerate(fragments):
+            text = text.replace(json.dumps(f'{marker}{i}'), fragment, 1)
+        return text
+
+
+bp = Blueprint('pms', __name__)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# create_app() ayarları: varsayılanlar, üzerine aynı adlı PMS_* ortam değişkenleri,
+# onların üzerine create_app(config) sözlüğü
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'your-secret-key-change-this-in-production',
+    # 'sqlite': SQL Server olmadan yerel/CI performans testleri için PMS_SQLITE_PATH kullanılır
+    'PMS_DB_BACKEND': 'mssql',
+    'PMS_DB_SERVER': 'localhost\\SQLEXPRESS',  # Eğer SSMS'de sunucu adın farklıysa onu yaz
+    'PMS_DB_NAME': 'ProjectManagementDB2',
+    'PMS_SQLITE_PATH': ':memory:',
+    # Okuma replikaları: virgülle ayrılmış sunucu adları (sqlite ise dosya yolları); okumalar
+    # bunlara yönlenir, PMS_REPLICA_MAX_LAG saniyeden fazla geride kalan replika okuma almaz.
+    # Yazan oturumun okumaları PMS_STICKY_WINDOW saniye primary'de kalır (read-your-writes).
+    'PMS_REPLICAS': '',
+    'PMS_REPLICA_MAX_LAG': 5,
+    'PMS_REPLICA_CHECK_INTERVAL': 1,
+    'PMS_STICKY_WINDOW': 5,
+    'PMS_QUERY_CACHE_TTL': 60,
+    # Bu süreyi aşan sorgular slow-query loguna yazılır (0: kapalı)
+    'PMS_SLOW_QUERY_MS': 500,
+    # /metrics oturum açmış kullanıcıya veya bu token'la (Authorization: Bearer) gelen
+    # isteğe (örn: Prometheus) açıktır
+    'PMS_METRICS_TOKEN': None,
+    'PMS_NOTIFICATION_INTERVAL': 300,
+    'PMS_ARCHIVE_DIR': os.path.join(_APP_DIR, 'archive'),
+    'PMS_HISTORY_HOT_DAYS': 365,
+    'PMS_NOTIFICATION_HOT_DAYS': 90,
+    'PMS_CHANGELOG_HOT_DAYS': 7,
+    'PMS_RETENTION_INTERVAL': 3600,
+    'PMS_PROFILE_DIR': os.path.join(_APP_DIR, 'profiles'),
+    'PMS_PROFILE_SAMPLE': 0,
+    'PMS_PROFILE_USERS': '',
+    'PMS_PROFILE_TOKEN': None,
+    'PMS_ANALYTICS_INTERVAL': 5,
+    'PMS_SEARCH_INTERVAL': 2,
+    'PMS_NOTIFICATION_STREAM_INTERVAL': 2,
+    # SSE bağlantısı bir worker thread'i tutar; bu süre sonunda kapatılır, tarayıcı yeniden bağlanır
+    'PMS_NOTIFICATION_STREAM_MAX_AGE': 300,
+    # False ise zamanlanmış işler başlatılmaz (pre-fork sunucu onları fork'tan sonra tek worker'da başlatır)
+    'BACKGROUND_JOBS': True,
+}
+
+
+def _services() -> 'Services':
+    return current_app.extensions['pms']
+
+
+def _service(name: str) -> LocalProxy:
+    """Aktif uygulamanın (current_app) servisine işaret eden proxy"""
+    return LocalProxy(lambda: getattr(_services(), name))
+
+
+# Rotalar servislere bu proxy'ler üzerinden erişir; her uygulama örneğinin
+# kendi bağlantı havuzu ve önbellekleri vardır (bkz. Services, create_app)
+db = _service('db')
+query_cache = _service('query_cache')
+dashboard_stats = _service('dashboard_stats')
+retention_job = _service('retention_job')
+profiler = _service('profiler')
+data_versions = _service('data_versions')
+task_analytics = _service('task_analytics')
+change_feed = _service('change_feed')
+search_index = _service('search_index')
+notification_hub = _service('notification_hub')
+
+
+# db.fan_out ile aynı isteğin sorguları farklı thread'lerde bitebilir
+_request_metrics_lock = threading.Lock()
+
+
+def count_round_trip(query, elapsed, rows):
+    """Her DB round trip'ini aktif isteğin sayaçlarına ekle (Flask g)"""
+    if has_request_context():
+        with _request_metrics_lock:
+            g.db_round_trips = g.get('db_round_trips', 0) + 1
+            g.db_time = g.get('db_time', 0.0) + elapsed
+
+
+@bp.before_app_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.db_round_trips = 0
+    g.db_time = 0.0
+
+    # Kapalıyken oturum ve query string'e hiç dokunulmaz
+    profile = profiler.enabled and profiler.trigger(request.headers, request.args, session.get('user_id'))
+    if profile:
+        g.profile = profiler.start(*profile, method=request.method, path=request.full_path,
+                                   route=request.url_rule.rule if request.url_rule else None,
+                                   user_id=session.get('user_id'))
+
+
+@bp.after_app_request
+def finish_request_metrics(response):
+    elapsed = time.perf_counter() - g.get('request_started', time.perf_counter())
+    round_trips = g.get('db_round_trips', 0)
+    db.metrics.record_request(request.url_rule.rule if request.url_rule else 'unmatched',
+                              round_trips, elapsed)
+
+    # Tarayıcı geliştirici araçlarında DB süresi görünsün
+    response.headers['X-DB-Round-Trips'] = str(round_trips)
+    response.headers['Server-Timing'] = (
+        f'db;dur={g.get("db_time", 0.0) * 1000:.1f};desc="{round_trips} sorgu", '
+        f'total;dur={elapsed * 1000:.1f}'
+    )
+
+    if g.get('profile'):
+        summary = profiler.finish(g.pop('profile'), response.status_code, g.get('db_time', 0.0), round_trips)
+        if summary and 'file' in summary:
+            response.headers['X-Profile-Id'] = summary['file']
+            response.headers['Server-Timing'] += ''.join(
+                f', profile-{phase};dur={value:.1f}' for phase, value in summary.get('phases_ms', {}).items())
+    return response
+
+
+@bp.before_app_request
+def route_reads():
+    """Oturum yakın zamanda yazdıysa okumalar primary'den yapılır (read-your-writes)"""
+    # Replika yoksa oturum çerezine dokunulmaz
+    if db.replicas is not None:
+        db.pin_reads(session.get('db_write_at'))
+
+
+@bp.after_app_request
+def remember_write(response):
+    """Yazma zamanı oturumda saklanır: sonraki istek başka worker'a düşse de primary'den okur"""
+    written = db.last_write()
+    if written is not None:
+        session['db_write_at'] = written
+    return response
+
+
+@bp.teardown_app_request
+def finish_failed_profile(error=None):
+    """View hata fırlattığında after_request çalışmaz; profil yine de kaydedilir"""
+    if g.get('profile'):
+        profiler.finish(g.pop('profile'), 500, g.get('db_time', 0.0), g.get('db_round_trips', 0))
 
-app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this-in-production'
 
-# Veritabanı bağlantısı
-# app.py dosyasındaki ilgili kısım:
-db = DatabaseManager(
-    server='localhost\\SQLEXPRESS',  # Eğer SSMS'de sunucu adın farklıysa onu yaz
-    database='ProjectManagementDB2',
-    username=None,  # 'sa' yerine None yapıyoruz
-    password=None   # Şifre yerine None yapıyoruz
-)
+def on_data_changed(*tables):
+    """
+    Yazma işlemlerinden sonra etkilenen önbellekleri temizle, arama index'ini güncelle
+
+    tables: yazılan tablolar; dashboard yalnızca okuduğu bir tablo değiştiyse
+    boşaltılır (ör. yalnızca Notifications'a yazmak dashboard'u etkilemez)
+    """
+    dashboard_stats.invalidate_tables(tables)
+    search_index.sync()
+
+
+@bp.app_errorhandler(PaginationError)
+def handle_pagination_error(e):
+    return jsonify({'success': False, 'message': str(e)}), 400
+
+
+def paged_response(paginator: KeysetPaginator, list_key: str):
+    """Sayfalanmış liste için JSON cevabı (liste + cursor bilgisi)"""
+    # Satırlar dict'e çevrilmeden AppJSONProvider ile doğrudan JSON'a yazılır
+    page = paginator.fetch_page(db, request.args, compact=True)
+    page[list_key] = page.pop('items')
+    return jsonify(page)
+
+
+# ============================================
+# KOŞULLU GET (ETag / Last-Modified)
+# ============================================
+# Şablon veya kod değiştiğinde eski ETag'ler geçersiz olsun (tüm worker'larda aynı değer)
+BUILD_ID = hashlib.sha1(repr(sorted(
+    (name, os.path.getmtime(os.path.join(folder, name)))
+    for folder in (_APP_DIR, os.path.join(_APP_DIR, 'templates'))
+    for name in os.listdir(folder) if name.endswith(('.py', '.html'))
+)).encode('utf-8')).hexdigest()[:12]
+
+
+def request_data_versions(versions: DataVersions) -> Dict[str, Any]:
+    """DataVersions satırları; istek içinde bir kez okunur (ETag ve önbellek damgaları için)"""
+    if not has_request_context():
+        return versions.read()
+    if 'data_versions' not in g:
+        g.data_versions = versions.read()
+    return g.data_versions
+
+
+def conditional_get(*tables):
+    """
+    GET cevaplarına okunan tabloların sürümlerinden ETag/Last-Modified ekle
+
+    İstemcinin doğrulayıcısı güncelse view (ve sorguları) hiç çalışmadan 304
+    döner. ETag URL'e (query string dahil) ve oturumdaki kullanıcıya bağlıdır.
+
+    ETag ve view'daki önbellekli okumalar (cache=True) aynı sürüm anlık
+    görüntüsünü kullanır (request_data_versions): önbellekten dönen kayıt
+    ETag'in sürümleriyle damgalıdır, başka bir worker'ın yazdığı eski gövde
+    yeni ETag'le saklanmaz.
+    """
+    names = base_tables(tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            etag, last_modified = data_versions.validator(names, BUILD_ID, request.full_path,
+                                                          session.get('user_id'),
+                                                          versions=request_data_versions(data_versions))
+            if etag is None:
+                return view(*args, **kwargs)
+
+            # If-None-Match varsa If-Modified-Since yok sayılır (RFC 9110)
+            if request.if_none_match:
+                fresh = request.if_none_match.contains(etag)
+            else:
+                fresh = (last_modified is not None and request.if_modified_since is not None
+                         and last_modified.replace(microsecond=0) <= request.if_modified_since)
+
+            response = Response(status=304) if fresh else make_response(view(*args, **kwargs))
+            if response.status_code not in (200, 304):
+                return response
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Tarayıcı saklayabilir ama her kullanımda doğrulamalı; cevaplar kullanıcıya özel
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
 
 
 # ============================================
 # ANA SAYFA - LOGIN
 # ============================================
-@app.route('/')
+@bp.route('/')
 def index():
     if 'user_id' in session:
-        return redirect(url_for('dashboard'))
+        return redirect(url_for('pms.dashboard'))
     return render_template('login.html')
 
 
-@app.route('/login', methods=['POST'])
+@bp.route('/login', methods=['POST'])
 def login():
     email = request.form.get('email')
     password = request.form.get('password')
@@ -38,80 +325,101 @@ def login():
     if result:
         session['user_id'] = result[0]['EmployeeID']
         session['user_name'] = f"{result[0]['FirstName']} {result[0]['LastName']}"
-        return jsonify({'success': True, 'redirect': url_for('dashboard')})
+        return jsonify({'success': True, 'redirect': url_for('pms.dashboard')})
 
     return jsonify({'success': False, 'message': 'Geçersiz email'})
 
 
-@app.route('/logout')
+@bp.route('/logout')
 def logout():
     session.clear()
-    return redirect(url_for('index'))
+    return redirect(url_for('pms.index'))
 
 
 # ============================================
 # DASHBOARD
 # ============================================
-@app.route('/dashboard')
+@bp.route('/dashboard')
 def dashboard():
     if 'user_id' not in session:
-        return redirect(url_for('index'))
-
-    # İstatistikler
-    stats = {
-        'total_projects': db.execute_scalar("SELECT COUNT(*) FROM Projects"),
-        'active_tasks': db.execute_scalar("SELECT COUNT(*) FROM Tasks WHERE status != 'Tamamlandı'"),
-        'completed_tasks': db.execute_scalar("SELECT COUNT(*) FROM Tasks WHERE status = 'Tamamlandı'"),
-        'total_employees': db.execute_scalar("SELECT COUNT(*) FROM Employees")
-    }
+        return redirect(url_for('pms.index'))
 
-    # Yaklaşan deadline'lar
-    upcoming = db.execute_query("SELECT * FROM vw_UpcomingDeadlines ORDER BY DaysLeft")
-
-    # Departman görev dağılımı
-    dept_tasks = db.execute_query("SELECT * FROM vw_DepartmentTaskCount ORDER BY TotalTasks DESC")
+    # İstatistikler, yaklaşan deadline'lar ve departman dağılımı (önbellekten)
+    snapshot = dashboard_stats.get_snapshot()
 
     return render_template('dashboard.html',
                            user_name=session['user_name'],
-                           stats=stats,
-                           upcoming=upcoming,
-                           dept_tasks=dept_tasks)
+                           stats=snapshot['stats'],
+                           upcoming=snapshot['upcoming'],
+                           dept_tasks=snapshot['dept_tasks'])
+
+
+@bp.route('/api/dashboard/stats')
+def api_dashboard_stats():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    return jsonify(dashboard_stats.get_snapshot())
 
 
 # ============================================
 # PROJELER
 # ============================================
-@app.route('/projects')
+# Üye ve görev sayıları trigger'larla güncel tutulan ProjectStats'tan okunur (migration 003)
+PROJECT_PAGINATOR = KeysetPaginator(
+    source="Projects p LEFT JOIN ProjectStats ps ON ps.project_id = p.project_id",
+    columns="p.*, ISNULL(ps.member_count, 0) AS member_count, ISNULL(ps.task_count, 0) AS task_count",
+    key=('p.project_id', 'project_id'),
+    sort_columns={
+        'start_date': ('p.start_date', 'start_date'),
+        'end_date': ('p.end_date', 'end_date'),
+        'project_name': ('p.project_name', 'project_name'),
+        'status': ('p.status', 'status'),
+        'project_id': ('p.project_id', 'project_id')
+    },
+    default_sort='start_date',
+    default_order='desc',
+    filters={
+        'status': ('p.status', '=', str),
+        'start_from': ('p.start_date', '>=', parse_date),
+        'start_to': ('p.start_date', '<=', parse_date)
+    }
+)
+
+
+@bp.route('/projects')
+@conditional_get('Projects', 'ProjectStats')
 def projects():
     if 'user_id' not in session:
-        return redirect(url_for('index'))
-
-    projects = db.execute_query("""
-        SELECT p.*, 
-               COUNT(DISTINCT pm.employee_id) as member_count,
-               COUNT(DISTINCT t.task_id) as task_count
-        FROM Projects p
-        LEFT JOIN ProjectMembers pm ON p.project_id = pm.project_id
-        LEFT JOIN Tasks t ON p.project_id = t.project_id
-        GROUP BY p.project_id, p.project_name, p.description, p.start_date, p.end_date, p.status
-        ORDER BY p.start_date DESC
-    """)
+        return redirect(url_for('pms.index'))
+
+    # İlk sayfa sunucuda, devamı "Daha Fazla" ile API'den yüklenir; sonraki
+    # değişiklikler token'dan itibaren /api/changes ile alınır (token sayfadan önce okunur)
+    changes_token = change_feed.current_token()
+    page = PROJECT_PAGINATOR.fetch_page(db, request.args)
 
     return render_template('projects.html',
                            user_name=session['user_name'],
-                           projects=projects)
+                           projects=page['items'],
+                           next_cursor=page['next_cursor'],
+                           changes_token=changes_token)
 
 
-@app.route('/api/projects', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route('/api/projects', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@conditional_get('Projects', 'ProjectStats', 'vw_ProjectMembersDetails', 'Tasks')
 def api_projects():
     if request.method == 'GET':
         project_id = request.args.get('id')
         if project_id:
-            project = db.execute_query("SELECT * FROM Projects WHERE project_id = ?", (project_id,))
-            members = db.execute_query("SELECT * FROM vw_ProjectMembersDetails WHERE project_id = ?", (project_id,))
-            tasks = db.execute_query("EXEC sp_GetProjectTasks ?", (project_id,))
+            # Üç bağımsız sorgu paralel çalışır
+            project, members, tasks = db.fan_out(
+                lambda: db.execute_query("SELECT * FROM Projects WHERE project_id = ?", (project_id,)),
+                lambda: db.execute_query("SELECT * FROM vw_ProjectMembersDetails WHERE project_id = ?",
+                                         (project_id,)),
+                lambda: db.execute_query("EXEC sp_GetProjectTasks ?", (project_id,))
+            )
             return jsonify({'project': project[0] if project else None, 'members': members, 'tasks': tasks})
-        return jsonify({'projects': db.execute_query("SELECT * FROM Projects")})
+        return paged_response(PROJECT_PAGINATOR, 'projects')
 
     elif request.method == 'POST':
         data = request.json
@@ -126,6 +434,7 @@ def api_projects():
             data.get('end_date'),
             data.get('status', 'Aktif')
         ))
+        on_data_changed('Projects')
         return jsonify({'success': True, 'message': 'Proje başarıyla eklendi'})
 
     elif request.method == 'PUT':
@@ -143,39 +452,72 @@ def api_projects():
             data.get('status', 'Aktif'),
             data['project_id']
         ))
+        on_data_changed('Projects')
         return jsonify({'success': True, 'message': 'Proje güncellendi'})
 
     elif request.method == 'DELETE':
         project_id = request.args.get('id')
         db.execute_update("DELETE FROM Projects WHERE project_id = ?", (project_id,))
+        on_data_changed('Projects')
         return jsonify({'success': True, 'message': 'Proje silindi'})
 
 
 # ============================================
 # GÖREVLER
 # ============================================
-@app.route('/tasks')
+TASK_PAGINATOR = KeysetPaginator(
+    source="V_TaskDetails",
+    key=('task_id', 'task_id'),
+    sort_columns={
+        'due_date': ('due_date', 'due_date'),
+        'start_date': ('start_date', 'start_date'),
+        'priority': ('priority', 'priority'),
+        'status': ('status', 'status'),
+        'task_title': ('task_title', 'task_title'),
+        'task_id': ('task_id', 'task_id')
+    },
+    default_sort='due_date',
+    filters={
+        'status': ('status', '=', str),
+        'priority': ('priority', '=', str),
+        'project_id': ('project_id', '=', int),
+        'employee_id': ('EmployeeID', '=', int),
+        'due_from': ('due_date', '>=', parse_date),
+        'due_to': ('due_date', '<=', parse_date)
+    }
+)
+
+
+@bp.route('/tasks')
+@conditional_get('V_TaskDetails')
 def tasks():
     if 'user_id' not in session:
-        return redirect(url_for('index'))
+        return redirect(url_for('pms.index'))
 
-    # Tüm görevleri view'dan çek
-    all_tasks = db.execute_query("SELECT * FROM V_TaskDetails ORDER BY due_date")
+    # Görevlerin ilk sayfası (filtreler URL'den), devamı API'den yüklenir
+    changes_token = change_feed.current_token()
+    page = TASK_PAGINATOR.fetch_page(db, request.args)
 
     # Proje listesi (dropdown için)
-    projects = db.execute_query("SELECT project_id, project_name FROM Projects ORDER BY project_name")
+    projects = db.execute_query("SELECT project_id, project_name FROM Projects ORDER BY project_name",
+                                cache=True)
 
     # Çalışan listesi (dropdown için)
-    employees = db.execute_query("SELECT EmployeeID, FirstName, LastName FROM Employees ORDER BY FirstName")
+    employees = db.execute_query("SELECT EmployeeID, FirstName, LastName FROM Employees ORDER BY FirstName",
+                                 cache=True)
 
     return render_template('tasks.html',
                            user_name=session['user_name'],
-                           tasks=all_tasks,
+                           tasks=page['items'],
+                           next_cursor=page['next_cursor'],
+                           filters=request.args,
                            projects=projects,
-                           employees=employees)
+                           employees=employees,
+                           changes_token=changes_token)
 
 
-@app.route('/api/tasks', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route('/api/tasks', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@conditional_get('V_TaskDetails')
 def api_tasks():
     if request.method == 'GET':
         task_id = request.args.get('id')
@@ -183,12 +525,9 @@ def api_tasks():
             task = db.execute_query("SELECT * FROM V_TaskDetails WHERE task_id = ?", (task_id,))
             return jsonify({'task': task[0] if task else None})
 
-        project_id = request.args.get('project_id')
-        if project_id:
-            tasks = db.execute_query("EXEC sp_GetProjectTasks ?", (project_id,))
-            return jsonify({'tasks': tasks})
-
-        return jsonify({'tasks': db.execute_query("SELECT * FROM V_TaskDetails")})
+        # Filtreler (status, priority, project_id, employee_id, due_from, due_to),
+        # sıralama (sort, order) ve cursor ile sayfalı liste
+        return paged_response(TASK_PAGINATOR, 'tasks')
 
 
     # app.py içindeki api_tasks fonksiyonu POST metodu
@@ -225,6 +564,7 @@ def api_tasks():
             # 3. Prosedürü çalıştır
             db.execute_procedure('sp_AddTask', params)
 
+            on_data_changed('Tasks', 'TaskStatusHistory', 'Notifications')
             return jsonify({'success': True, 'message': 'Görev başarıyla eklendi!'})
 
         except Exception as e:
@@ -234,12 +574,14 @@ def api_tasks():
     elif request.method == 'PUT':
         data = request.json
         if 'status' in data and len(data) == 2:  # Sadece status güncellemesi
-            db.execute_procedure('sp_UpdateTaskStatus', (
-                data['task_id'],
-                data['status'],
-                session['user_id']
-            ))
-            return jsonify({'success': True, 'message': 'Görev durumu güncellendi'})
+            try:
+                result = apply_status_changes(db, [data], changed_by=session['user_id'])[0]
+            except StatusChangeError as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
+            if not result['applied']:
+                return jsonify({'success': False, 'message': result['message'], 'task': result})
+            on_data_changed('Tasks', 'TaskStatusHistory', 'Notifications')
+            return jsonify({'success': True, 'message': 'Görev durumu güncellendi', 'task': result})
         else:
             query = """
                 UPDATE Tasks 
@@ -256,43 +598,106 @@ def api_tasks():
                 data['employee_id'],
                 data['task_id']
             ))
+            on_data_changed('Tasks', 'TaskStatusHistory', 'Notifications')
             return jsonify({'success': True, 'message': 'Görev güncellendi'})
 
     elif request.method == 'DELETE':
         task_id = request.args.get('id')
         db.execute_update("DELETE FROM Tasks WHERE task_id = ?", (task_id,))
+        on_data_changed('Tasks', 'TaskStatusHistory', 'Notifications')
         return jsonify({'success': True, 'message': 'Görev silindi'})
 
 
+# Toplu isteklerde tek çağrıda işlenecek en fazla öğe
+BULK_LIMIT = 1000
+
+
+def bulk_items(key: str):
+    """İstek gövdesinden öğe listesini al (düz liste veya {key: [...]})"""
+    data = request.get_json(silent=True)
+    items = data.get(key) if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise TaskBulkError(f"Gövde boş olmayan bir liste veya {{'{key}': [...]}} olmalı")
+    if len(items) > BULK_LIMIT:
+        raise TaskBulkError(f"Tek istekte en fazla {BULK_LIMIT} öğe gönderilebilir")
+    if not all(isinstance(item, dict) for item in items):
+        raise TaskBulkError("Her öğe bir JSON nesnesi olmalı")
+    return items
+
+
+@bp.route('/api/tasks/bulk', methods=['POST', 'PUT'])
+def api_tasks_bulk():
+    """POST: görevleri toplu ekle, PUT: durum geçişlerini toplu uygula (öğe başına sonuç döner)"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    try:
+        if request.method == 'POST':
+            results = create_tasks(db, bulk_items('tasks'))
+            succeeded = sum(1 for result in results if result['created'])
+        else:
+            results = apply_status_changes(db, bulk_items('changes'), changed_by=session['user_id'])
+            succeeded = sum(1 for result in results if result['applied'])
+    except (TaskBulkError, StatusChangeError) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    if succeeded:
+        on_data_changed('Tasks', 'TaskStatusHistory', 'Notifications')
+    return jsonify({
+        'success': succeeded == len(results),
+        'message': f"{succeeded}/{len(results)} öğe işlendi",
+        'results': results,
+    })
+
+
 # ============================================
 # ÇALIŞANLAR
 # ============================================
-@app.route('/employees')
+# Proje ve görev sayıları EmployeeStats'tan okunur (migration 003)
+EMPLOYEE_PAGINATOR = KeysetPaginator(
+    source="""Employees e
+        LEFT JOIN Departments d ON e.DepartmentID = d.department_id
+        LEFT JOIN EmployeeStats es ON es.employee_id = e.EmployeeID""",
+    columns="""e.*, d.department_name,
+        ISNULL(es.project_count, 0) AS project_count, ISNULL(es.task_count, 0) AS task_count""",
+    key=('e.EmployeeID', 'EmployeeID'),
+    sort_columns={
+        'FirstName': ('e.FirstName', 'FirstName'),
+        'LastName': ('e.LastName', 'LastName'),
+        'Email': ('e.Email', 'Email'),
+        'HireDate': ('e.HireDate', 'HireDate'),
+        'EmployeeID': ('e.EmployeeID', 'EmployeeID')
+    },
+    default_sort='FirstName',
+    filters={
+        'department_id': ('e.DepartmentID', '=', int)
+    }
+)
+
+
+@bp.route('/employees')
+@conditional_get('Employees', 'Departments', 'EmployeeStats')
 def employees():
     if 'user_id' not in session:
-        return redirect(url_for('index'))
+        return redirect(url_for('pms.index'))
 
-    employees = db.execute_query("""
-        SELECT e.*, d.department_name,
-               COUNT(DISTINCT pm.project_id) as project_count,
-               COUNT(DISTINCT t.task_id) as task_count
-        FROM Employees e
-        LEFT JOIN Departments d ON e.DepartmentID = d.department_id
-        LEFT JOIN ProjectMembers pm ON e.EmployeeID = pm.employee_id
-        LEFT JOIN Tasks t ON e.EmployeeID = t.employee_id
-        GROUP BY e.EmployeeID, e.FirstName, e.LastName, e.Email, e.DepartmentID, e.HireDate, d.department_name
-        ORDER BY e.FirstName
-    """)
+    # İlk sayfa sunucuda, devamı "Daha Fazla" ile API'den yüklenir; sonraki
+    # değişiklikler token'dan itibaren /api/changes ile alınır (token sayfadan önce okunur)
+    changes_token = change_feed.current_token()
+    page = EMPLOYEE_PAGINATOR.fetch_page(db, request.args)
 
-    departments = db.execute_query("SELECT * FROM Departments ORDER BY department_name")
+    departments = db.execute_query("SELECT * FROM Departments ORDER BY department_name", cache=True)
 
     return render_template('employees.html',
                            user_name=session['user_name'],
-                           employees=employees,
-                           departments=departments)
+                           employees=page['items'],
+                           next_cursor=page['next_cursor'],
+                           departments=departments,
+                           changes_token=changes_token)
 
 
-@app.route('/api/employees', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@bp.route('/api/employees', methods=['GET', 'POST', 'PUT', 'DELETE'])
+@conditional_get('Employees', 'Departments', 'EmployeeStats', 'Tasks', 'Projects')
 def api_employees():
     if request.method == 'GET':
         employee_id = request.args.get('id')
@@ -300,7 +705,7 @@ def api_employees():
             employee = db.execute_query("SELECT * FROM Employees WHERE EmployeeID = ?", (employee_id,))
             tasks = db.execute_query("EXEC sp_GetEmployeeTaskSummary ?", (employee_id,))
             return jsonify({'employee': employee[0] if employee else None, 'tasks': tasks})
-        return jsonify({'employees': db.execute_query("SELECT * FROM Employees")})
+        return paged_response(EMPLOYEE_PAGINATOR, 'employees')
 
     elif request.method == 'POST':
         data = request.json
@@ -315,6 +720,7 @@ def api_employees():
             data['DepartmentID'],
             data.get('HireDate', datetime.now().strftime('%Y-%m-%d'))
         ))
+        on_data_changed('Employees')
         return jsonify({'success': True, 'message': 'Çalışan başarıyla eklendi'})
 
     elif request.method == 'PUT':
@@ -331,42 +737,49 @@ def api_employees():
             data['DepartmentID'],
             data['EmployeeID']
         ))
+        on_data_changed('Employees')
         return jsonify({'success': True, 'message': 'Çalışan güncellendi'})
 
     elif request.method == 'DELETE':
         employee_id = request.args.get('id')
         db.execute_update("DELETE FROM Employees WHERE EmployeeID = ?", (employee_id,))
+        on_data_changed('Employees')
         return jsonify({'success': True, 'message': 'Çalışan silindi'})
 
 
 # ============================================
 # RAPORLAR
 # ============================================
-@app.route('/reports')
+@bp.route('/reports')
+@conditional_get('V_CompletedTasks', 'TaskStatusHistory', 'Notifications')
 def reports():
     if 'user_id' not in session:
-        return redirect(url_for('index'))
-
-    # Tamamlanan görevler
-    completed = db.execute_query("SELECT * FROM V_CompletedTasks ORDER BY due_date DESC")
-
-    # Görev durum geçmişi
-    history = db.execute_query("""
-        SELECT tsh.*, t.task_title, e.FirstName + ' ' + e.LastName as changed_by_name
-        FROM TaskStatusHistory tsh
-        INNER JOIN Tasks t ON tsh.task_id = t.task_id
-        INNER JOIN Employees e ON tsh.changed_by = e.EmployeeID
-        ORDER BY tsh.changed_at DESC
-    """)
-
-    # Bildirimler
-    notifications = db.execute_query("""
-        SELECT n.*, t.task_title, e.FirstName + ' ' + e.LastName as user_name
-        FROM Notifications n
-        INNER JOIN Tasks t ON n.task_id = t.task_id
-        INNER JOIN Employees e ON n.user_id = e.EmployeeID
-        ORDER BY n.created_at DESC
-    """)
+        return redirect(url_for('pms.index'))
+
+    # Büyük listeler satır başına dict yerine compact ResultSet olarak okunur,
+    # birbirinden bağımsız üç sorgu paralel çalışır
+    completed, history, notifications = db.fan_out(
+        # Tamamlanan görevler
+        lambda: db.execute_query("SELECT * FROM V_CompletedTasks ORDER BY due_date DESC", compact=True),
+
+        # Görev durum geçmişi
+        lambda: db.execute_query("""
+            SELECT tsh.*, t.task_title, e.FirstName + ' ' + e.LastName as changed_by_name
+            FROM TaskStatusHistory tsh
+            INNER JOIN Tasks t ON tsh.task_id = t.task_id
+            INNER JOIN Employees e ON tsh.changed_by = e.EmployeeID
+            ORDER BY tsh.changed_at DESC
+        """, compact=True),
+
+        # Bildirimler
+        lambda: db.execute_query("""
+            SELECT n.*, t.task_title, e.FirstName + ' ' + e.LastName as user_name
+            FROM Notifications n
+            INNER JOIN Tasks t ON n.task_id = t.task_id
+            INNER JOIN Employees e ON n.user_id = e.EmployeeID
+            ORDER BY n.created_at DESC
+        """, compact=True)
+    )
 
     return render_template('reports.html',
                            user_name=session['user_name'],
@@ -375,8 +788,432 @@ def reports():
                            notifications=notifications)
 
 
+# ============================================
+# ANALİTİK
+# ============================================
+ANALYTICS_REPORTS = {
+    'cycle-time': lambda args: task_analytics.cycle_times(args.get('project_id', type=int),
+                                                          min(args.get('limit', 1000, type=int), 5000)),
+    'flow': lambda args: task_analytics.flow(args.get('project_id', type=int)),
+    'throughput': lambda args: task_analytics.throughput(args.get('period', 'week')),
+    'on-time': lambda args: task_analytics.on_time(),
+}
+
+
+@bp.route('/api/analytics/<report>')
+def api_analytics(report):
+    """Grafikler için görev analitiği: cycle-time, flow (?project_id=), throughput (?period=), on-time"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    if report not in ANALYTICS_REPORTS:
+        return jsonify({'success': False, 'message': f"Bilinmeyen rapor: {report}"}), 404
+    if report == 'flow' and request.args.get('project_id', type=int) is None:
+        return jsonify({'success': False, 'message': "project_id zorunlu"}), 400
+    from analytics import AnalyticsError  # pandas ilk analitik isteğinde yüklenir
+    try:
+        return jsonify(ANALYTICS_REPORTS[report](request.args))
+    except AnalyticsError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+
+# ============================================
+# DIŞA AKTARMA (STREAMING)
+# ============================================
+EXPORT_QUERIES = {
+    'tasks': "SELECT * FROM V_TaskDetails ORDER BY task_id",
+    'history': "SELECT * FROM TaskStatusHistory ORDER BY history_id",
+    'notifications': "SELECT * FROM Notifications ORDER BY notification_id",
+}
+
+# Saklama işinin arşivlediği veri kümeleri: ?since=&until=&archive=1 desteklenir
+ARCHIVED_EXPORTS = {
+    'history': 'TaskStatusHistory',
+    'notifications': 'Notifications',
+}
+
+
+@bp.route('/api/export/<dataset>')
+@conditional_get('V_TaskDetails', 'TaskStatusHistory', 'Notifications')
+def api_export(dataset):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    fmt = request.args.get('format', 'ndjson')
+    if dataset not in EXPORT_QUERIES:
+        return jsonify({'success': False, 'message': f"Bilinmeyen veri kümesi: {dataset}"}), 404
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': f"Desteklenmeyen format: {fmt}"}), 400
+
+    # Satırlar fetchmany ile okunup yazıldıkça gönderilir, bellek sabit kalır
+    if dataset in ARCHIVED_EXPORTS:
+        try:
+            since, until = (datetime.strptime(request.args[name], '%Y-%m-%d') if request.args.get(name) else None
+                            for name in ('since', 'until'))
+        except ValueError:
+            return jsonify({'success': False, 'message': "since/until YYYY-MM-DD formatında olmalı"}), 400
+        rows = retention_job.iter_rows(ARCHIVED_EXPORTS[dataset], since, until,
+                                       include_archive=request.args.get('archive') == '1')
+    else:
+        rows = db.iter_query(EXPORT_QUERIES[dataset])
+    _, mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(
+        iter_export(rows, fmt),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={dataset}.{extension}'}
+    )
+
+
+# ============================================
+# DEĞİŞİKLİK AKIŞI
+# ============================================
+@bp.route('/api/changes')
+def api_changes():
+    """?since=<token>[&tables=tasks,projects][&limit=n]: token'dan sonra değişen satırlar"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    tables = request.args.get('tables')
+    try:
+        feed = change_feed.changes_since(request.args.get('since'),
+                                         tables.split(',') if tables else None,
+                                         request.args.get('limit', type=int))
+    except ChangeFeedError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify(feed)
+
+
+# ============================================
+# ARAMA
+# ============================================
+@bp.route('/api/search')
+def api_search():
+    """?q=<metin>[&types=tasks,projects][&limit=n]: tür başına skora göre sıralı satırlar"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    types = request.args.get('types')
+    try:
+        found = search_index.search(request.args.get('q'), types.split(',') if types else None,
+                                    request.args.get('limit', type=int))
+    except SearchError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    # Satırlar liste API'leriyle aynı sorgudan okunur (aynı render fonksiyonu kullanılabilir)
+    names = list(found['results'])
+    rows = db.fan_out(*[
+        (lambda name=name: search_index.fetch_rows(name, [hit['id'] for hit in found['results'][name]]))
+        for name in names])
+    results = {}
+    for name, items in zip(names, rows):
+        scores = {hit['id']: hit['score'] for hit in found['results'][name]}
+        key = search_index.sources[name].paginator.key[1]
+        results[name] = [dict(item, _score=scores[item[key]]) for item in items]
+    return jsonify({'results': results, 'terms': found['terms'], 'truncated': found['truncated'],
+                    'elapsed_ms': found['elapsed_ms']})
+
+
+# ============================================
+# BİLDİRİMLER (SSE)
+# ============================================
+@bp.route('/api/notifications/stream')
+def api_notifications_stream():
+    """Okunmamış sayaç ve yeni bildirimler (text/event-stream)"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    user_id = session['user_id']
+    # Önce abone ol, sonra sayacı oku: aradaki bildirimler kaçmaz (en kötü iki kez sayılır)
+    subscription = notification_hub.subscribe(user_id)
+    try:
+        initial = [format_event('unread', {'count': unread_count(db, user_id)})]
+
+        # Yeniden bağlanan tarayıcı kopukken gelen okunmamışları da alır
+        last_event_id = request.headers.get('Last-Event-ID', type=int)
+        if last_event_id is not None:
+            missed = db.execute_query(
+                f"SELECT TOP (50) {NOTIFICATION_COLUMNS} FROM Notifications n "
+                "WHERE n.user_id = ? AND n.is_read = 0 AND n.notification_id > ? ORDER BY n.notification_id",
+                (user_id, last_event_id))
+            initial += [format_event('notification', row, row['notification_id']) for row in missed]
+    except Exception:
+        notification_hub.unsubscribe(subscription)
+        raise
+
+    return Response(notification_hub.events(subscription, initial),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@bp.route('/api/notifications/unread-count')
+def api_notifications_unread_count():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    return jsonify({'count': unread_count(db, session['user_id'])})
+
+
+@bp.route('/api/notifications/read', methods=['POST'])
+def api_notifications_read():
+    """{"ids": [...]}, {"up_to": id} veya boş gövde (hepsi): oturumdaki kullanıcının bildirimleri"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    data = request.get_json(silent=True) or {}
+    user_id = session['user_id']
+    try:
+        if isinstance(data.get('ids'), list) and len(data['ids']) > BULK_LIMIT:
+            raise NotificationError(f"Tek istekte en fazla {BULK_LIMIT} bildirim işaretlenebilir")
+        updated = mark_read(db, user_id, data.get('ids'), data.get('up_to'))
+    except NotificationError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    count = unread_count(db, user_id)
+    notification_hub.publish(user_id, 'unread', {'count': count})  # diğer sekmeler de güncellensin
+    return jsonify({'success': True, 'updated': updated, 'count': count})
+
+
+# ============================================
+# METRİKLER
+# ============================================
+def metrics_authorized() -> bool:
+    """Oturum açmış kullanıcı veya PMS_METRICS_TOKEN ile gelen istek (Authorization: Bearer)"""
+    if 'user_id' in session:
+        return True
+    token = current_app.config['PMS_METRICS_TOKEN']
+    scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+    return (bool(token) and scheme.lower() == 'bearer'
+            and hmac.compare_digest(value.strip().encode('utf-8'), str(token).encode('utf-8')))
+
+
+@bp.route('/metrics')
+def metrics():
+    # Sorgu metinleri, havuz/replika ayrıntıları ve route süreleri anonim istemcilere açılmaz
+    if not metrics_authorized():
+        return jsonify({'success': False, 'message': 'Oturum açılmamış'}), 401
+
+    # Varsayılan Prometheus text formatı, ?format=json ile JSON özet
+    if request.args.get('format') == 'json':
+        snapshot = db.metrics.snapshot()
+        snapshot['pool'] = db.pool_stats()
+        snapshot['replicas'] = db.replica_stats()
+        snapshot['cache'] = query_cache.stats()
+        snapshot['notification_stream'] = notification_hub.stats()
+        # Analitik henüz kullanılmadıysa pandas yalnızca metrik için yüklenmez
+        snapshot['analytics'] = task_analytics.stats() if _services().analytics_loaded else None
+        snapshot['search'] = search_index.stats()
+        snapshot['profiler'] = profiler.stats()
+        snapshot['retention'] = {'archive': retention_job.stats(), 'last_run': retention_job.last_result}
+        return jsonify(snapshot)
+
+    pool = db.pool_stats()
+    gauges = {f'db_pool_{key}': value for key, value in pool.items()}
+    gauges.update({f'db_cache_{key}': value for key, value in query_cache.stats().items()})
+    gauges.update({f'notification_stream_{key}': value for key, value in notification_hub.stats().items()})
+    replicas = db.replica_stats()
+    if replicas is not None:
+        gauges['db_replica_primary_reads'] = replicas['primary_reads']
+        for name, info in replicas['replicas'].items():
+            prefix = f"db_{name.replace('-', '_')}"
+            gauges[f'{prefix}_healthy'] = int(info['healthy'])
+            gauges[f'{prefix}_reads'] = info['reads']
+            if info['lag'] is not None:
+                gauges[f'{prefix}_lag_seconds'] = round(info['lag'], 3)
+    return Response(db.metrics.to_prometheus(gauges), mimetype='text/plain; version=0.0.4')
+
+
+# ============================================
+# UYGULAMA FABRİKASI
+# ============================================
+class Services:
+    """
+    Bir uygulama örneğinin veritabanı bağlantısı ve ona bağlı servisler
+
+    Kurulum sırasında thread başlatılmaz (bkz. start_background); pre-fork
+    sunucuda master process'te kurulan nesneler worker'lara kopyalanır,
+    bağlantı havuzu her worker'da after_fork() ile yeniden kurulur.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.app = None
+
+        # Dropdown ve sözlük tabloları gibi yazmalar arasında değişmeyen okumalar için
+        # (execute_query(..., cache=True)); yazma metotları ilgili kayıtları siler,
+        # diğer process'lerin yazmaları DataVersions damgalarıyla yakalanır (aşağıda)
+        self.query_cache = QueryCache(max_entries=256, ttl=float(config['PMS_QUERY_CACHE_TTL']))
+        slow_query_ms = float(config['PMS_SLOW_QUERY_MS'] or 0)
+        metrics = QueryMetrics(slow_query_threshold=slow_query_ms / 1000 if slow_query_ms > 0 else None)
+
+        replicas = [name.strip() for name in str(config['PMS_REPLICAS'] or '').split(',') if name.strip()]
+        routing = {
+            'replica_max_lag': float(config['PMS_REPLICA_MAX_LAG']),
+            'replica_check_interval': float(config['PMS_REPLICA_CHECK_INTERVAL']),
+            'sticky_window': float(config['PMS_STICKY_WINDOW']),
+        }
+        if config['PMS_DB_BACKEND'] == 'sqlite':
+            # SQL Server olmadan yerel/CI performans testleri için
+            self.db = DatabaseManager(backend=SQLiteBackend(config['PMS_SQLITE_PATH']),
+                                      query_cache=self.query_cache,
+                                      metrics=metrics,
+                                      replicas=[SQLiteBackend(path, initialize=False) for path in replicas],
+                                      **routing)
+            # Yerel şema her açılışta güncel tutulur (SQL Server'da: python migrations.py)
+            migrate(self.db)
+        else:
+            self.db = DatabaseManager(
+                server=config['PMS_DB_SERVER'],
+                database=config['PMS_DB_NAME'],
+                username=None,  # 'sa' yerine None yapıyoruz
+                password=None,  # Şifre yerine None yapıyoruz
+                query_cache=self.query_cache,
+                metrics=metrics,
+                replicas=[SqlServerBackend(server, config['PMS_DB_NAME']) for server in replicas],
+                **routing
+            )
+        self.db.metrics.add_listener(count_round_trip)
+
+        # Dashboard sayaçları tüm kullanıcılar için ortak, kısa süreli önbellekte tutulur
+        self.dashboard_stats = DashboardStatsService(self.db, ttl=30)
+
+        # Deadline/gecikme bildirimleri yazma yolunda değil, arka planda toplu üretilir
+        # (PMS_NOTIFICATION_INTERVAL=0 ile kapatılır)
+        self.notification_scanner = NotificationScanner(self.db)
+        self.notification_interval = float(config['PMS_NOTIFICATION_INTERVAL'])
+
+        # Geçmiş/bildirim tablolarının sıcak penceresi dışındaki satırlar saatlik
+        # işte arşiv dosyalarına taşınır (PMS_RETENTION_INTERVAL=0 ile kapatılır)
+        self.retention_job = RetentionJob(
+            self.db,
+            config['PMS_ARCHIVE_DIR'],
+            default_policies(float(config['PMS_HISTORY_HOT_DAYS']),
+                             float(config['PMS_NOTIFICATION_HOT_DAYS']),
+                             float(config['PMS_CHANGELOG_HOT_DAYS'])))
+        self.retention_interval = float(config['PMS_RETENTION_INTERVAL'])
+
+        # İstek profili: PMS_PROFILE_USERS'taki kullanıcılar veya PMS_PROFILE_TOKEN ile
+        # X-Profile: sample|cprofile (ya da ?_profile=) isteyebilir; PMS_PROFILE_SAMPLE=N
+        # her N. isteği profiller. Hiçbiri tanımlı değilse kapalıdır.
+        self.profiler = RequestProfiler(
+            config['PMS_PROFILE_DIR'],
+            sample_every=int(config['PMS_PROFILE_SAMPLE']),
+            users=[int(user_id) for user_id in str(config['PMS_PROFILE_USERS']).split(',') if user_id.strip()],
+            token=config['PMS_PROFILE_TOKEN'] or None)
+
+        self.data_versions = DataVersions(self.db)
+        self.query_cache.versions = lambda tables: self.data_versions.stamp(
+            tables, request_data_versions(self.data_versions))
+
+        # Satırlar liste API'leriyle aynı sorgudan okunur (aynı render fonksiyonu kullanılabilir)
+        self.change_feed = ChangeFeed(self.db, {
+            'projects': ('Projects', PROJECT_PAGINATOR),
+            'tasks': ('Tasks', TASK_PAGINATOR),
+            'employees': ('Employees', EMPLOYEE_PAGINATOR),
+        })
+
+        # Index ilk aramada yüklenir, sonra yalnızca değişen satırlar ChangeLog'dan uygulanır
+        self.search_index = SearchIndex(self.db, {
+            'tasks': SearchSource(
+                'Tasks',
+                "SELECT task_id, task_title, task_description, project_name, EmployeeName FROM V_TaskDetails",
+                'task_id',
+                {'task_title': 3.0, 'task_description': 1.0, 'project_name': 0.5, 'EmployeeName': 0.5},
+                TASK_PAGINATOR,
+                depends={'projects': 'project_id', 'employees': 'EmployeeID'}),
+            'projects': SearchSource(
+                'Projects',
+                "SELECT project_id, project_name, description FROM Projects",
+                'project_id',
+                {'project_name': 3.0, 'description': 1.0},
+                PROJECT_PAGINATOR),
+            'employees': SearchSource(
+                'Employees',
+                "SELECT EmployeeID, FirstName, LastName, Email FROM Employees",
+                'EmployeeID',
+                {'FirstName': 3.0, 'LastName': 3.0, 'Email': 1.0},
+                EMPLOYEE_PAGINATOR),
+        }, min_interval=float(config['PMS_SEARCH_INTERVAL']))
+
+        # Tüm bağlantılar tek poller'ı paylaşır: bağlı kullanıcı sayısı DB yükünü artırmaz
+        self.notification_hub = NotificationHub(self.db, interval=float(config['PMS_NOTIFICATION_STREAM_INTERVAL']),
+                                                max_age=float(config['PMS_NOTIFICATION_STREAM_MAX_AGE']))
+
+        # Analitik pandas gerektirir; pandas açılışta değil ilk analitik isteğinde yüklenir
+        self.analytics_interval = float(config['PMS_ANALYTICS_INTERVAL'])
+        self._task_analytics = None
+        self._analytics_lock = threading.Lock()
+
+    @property
+    def analytics_loaded(self) -> bool:
+        return self._task_analytics is not None
+
+    @property
+    def task_analytics(self):
+        """Görev analitiği (ilk kullanımda oluşturulur)"""
+        if self._task_analytics is None:
+            with self._analytics_lock:
+                if self._task_analytics is None:
+                    from analytics import TaskAnalytics
+                    # Çerçeveler process içinde tutulur, en fazla min_interval saniyede bir
+                    # yeni geçmiş satırlarıyla güncellenir
+                    self._task_analytics = TaskAnalytics(self.db, min_interval=self.analytics_interval)
+        return self._task_analytics
+
+    def start_background(self):
+        """Zamanlanmış işleri başlat (aralığı 0 olanlar kapalıdır)"""
+        if self.notification_interval > 0:
+            self.notification_scanner.start(self.notification_interval)
+        if self.retention_interval > 0:
+            self.retention_job.start(self.retention_interval)
+
+    def after_fork(self):
+        """fork() sonrası worker'da çağrılır: bağlantılar bu process için yeniden açılır"""
+        self.db.after_fork()
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Arka plan thread'lerini durdur ve bağlantıları kapat"""
+        self.notification_scanner.stop(timeout)
+        self.retention_job.stop(timeout)
+        self.notification_hub.stop(timeout)
+        self.db.close()
+
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Uygulamayı ve servislerini kur
+
+    Ayarlar DEFAULT_CONFIG'ten başlar; aynı adlı PMS_* ortam değişkenleri ve
+    config sözlüğü sırayla üzerine yazılır. Servisler app.extensions['pms']
+    altında tutulur.
+
+    Args:
+        config: Ayarlar (örn: {'PMS_DB_BACKEND': 'sqlite', 'PMS_SQLITE_PATH': 'bench.db'})
+
+    Returns:
+        Flask uygulaması
+    """
+    app = Flask(__name__)
+    app.json = AppJSONProvider(app)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.update({key: value for key, value in os.environ.items()
+                       if key.startswith('PMS_') and key in DEFAULT_CONFIG})
+    app.config.update(config or {})
+
+    services = Services(app.config)
+    services.app = app
+    app.extensions['pms'] = services
+    app.register_blueprint(bp)
+
+    if services.profiler.enabled:
+        before_render_template.connect(services.profiler.template_started, app)
+        template_rendered.connect(services.profiler.template_finished, app)
+    if app.config['BACKGROUND_JOBS']:
+        services.start_background()
+    return app
+
+
 # ============================================
 # ÇALIŞTIR
 # ============================================
+# Geliştirme sunucusu; üretimde gunicorn ile (bkz. gunicorn.conf.py): gunicorn -w 4
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
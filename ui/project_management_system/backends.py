@@ -0,0 +1,80 @@
+import sqlite3
+from typing import Any, Optional
+
+try:
+    import pyodbc
+except ImportError:  # SQLite backend'i ile çalışırken pyodbc gerekmez
+    pyodbc = None
+
+
+# DatabaseManager'ın yakaladığı sürücü hataları (kurulu olan sürücülere göre)
+DB_ERRORS = (sqlite3.Error,) + ((pyodbc.Error,) if pyodbc else ())
+
+
+class Backend:
+    """
+    Veritabanı backend'i için ortak arayüz
+
+    Backend yalnızca yeni bir DB-API bağlantısı açmayı bilir; havuz,
+    ölçüm ve sorgu yardımcıları DatabaseManager'da kalır.
+    """
+
+    name = 'base'
+
+    def connect(self) -> Any:
+        """Yeni bir DB-API bağlantısı aç"""
+        raise NotImplementedError
+
+    def close(self):
+        """Backend'in tuttuğu kaynakları bırak"""
+
+
+class SqlServerBackend(Backend):
+    """pyodbc ve ODBC Driver 17 üzerinden SQL Server bağlantısı"""
+
+    name = 'mssql'
+
+    def __init__(self, server: str, database: str, username: Optional[str] = None,
+                 password: Optional[str] = None, driver: str = 'ODBC Driver 17 for SQL Server'):
+        """
+        Args:
+            server: SQL Server adresi (örn: 'localhost' veya '192.168.1.10')
+            database: Veritabanı adı
+            username: Kullanıcı adı (None ise Windows Authentication)
+            password: Şifre
+            driver: ODBC sürücü adı
+        """
+        self.server = server
+        self.database = database
+        self.username = username
+        self.password = password
+        self.driver = driver
+
+    def connection_string(self) -> str:
+        if self.username and self.password:
+            # SQL Server Authentication
+            return (
+                f"DRIVER={{{self.driver}}};"
+                f"SERVER={self.server};"
+                f"DATABASE={self.database};"
+                f"UID={self.username};"
+                f"PWD={self.password}"
+            )
+
+        # Windows Authentication
+        return (
+            f"DRIVER={{{self.driver}}};"
+            f"SERVER={self.server};"
+            f"DATABASE={self.database};"
+            f"Trusted_Connection=yes;"
+        )
+
+    def connect(self) -> Any:
+        if pyodbc is None:
+            raise RuntimeError("SQL Server backend'i için pyodbc kurulu olmalı")
+
+        try:
+            return pyodbc.connect(self.connection_string())
+        except pyodbc.Error as e:
+            print(f"Bağlantı hatası: {e}")
+            raise
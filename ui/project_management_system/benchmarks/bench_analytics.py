@@ -0,0 +1,101 @@
+"""
+Görev analitiği benchmark'ı
+
+Varsayılan 500.000 görevle (~1M TaskStatusHistory satırı) bir SQLite
+veritabanı üretir ve TaskAnalytics için şunları ölçer:
+
+    ilk yükleme      tüm geçmişin toplu okunup çerçevelerin kurulması
+    raporlar         her raporun ilk (hesaplanan) ve ikinci (önbellekten, refresh
+                     kontrolünün iki küçük sorgusu dahil) çağrısı
+    artımlı          --changes durum geçişi + yeni görev sonrası refresh()
+    tam yeniden      aynı durum için load() (artımlı güncellemenin alternatifi)
+
+Artımlı sonucun tam yüklemeyle aynı raporları verdiği de doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_analytics.py --tasks 500000 --changes 1000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import TaskAnalytics  # noqa: E402
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+from task_bulk import create_tasks  # noqa: E402
+from task_status import apply_status_changes  # noqa: E402
+
+from datagen import DataGenerator  # noqa: E402
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def reports(analytics: TaskAnalytics, project_id: int):
+    return (analytics.cycle_times(), analytics.cycle_times(project_id), analytics.flow(project_id),
+            analytics.throughput('week'), analytics.on_time())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=500000)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--changes', type=int, default=1000, help="Artımlı ölçüm için durum geçişi sayısı")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-analytics-') as workdir:
+        path = os.path.join(workdir, 'analytics.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        migrate(db)
+        print(f"{args.tasks} görev üretiliyor...")
+        DataGenerator(db, 20, args.employees, args.projects, args.tasks, seed=args.seed, verbose=False).run()
+
+        analytics = TaskAnalytics(db, min_interval=0, settle=0)
+        result, elapsed = timed(analytics.load)
+        print(f"\nilk yükleme: {result['history_rows']} geçmiş satırı, {elapsed:.0f} ms, "
+              f"{analytics.stats()['memory_bytes'] / 2 ** 20:.1f} MB")
+
+        project_id = 1
+        print(f"\n  {'rapor':<26}{'ilk ms':>10}{'önbellek ms':>14}")
+        for label, report in (('cycle-time', lambda: analytics.cycle_times()),
+                              (f'cycle-time (proje {project_id})', lambda: analytics.cycle_times(project_id)),
+                              (f'flow (proje {project_id})', lambda: analytics.flow(project_id)),
+                              ('throughput (hafta)', lambda: analytics.throughput('week')),
+                              ('on-time', lambda: analytics.on_time())):
+            _, cold = timed(report)
+            _, warm = timed(report)
+            print(f"  {label:<26}{cold:>10.1f}{warm:>14.3f}")
+
+        rnd = random.Random(args.seed)
+        task_ids = rnd.sample(range(1, args.tasks + 1), args.changes)
+        apply_status_changes(db, [{'task_id': task_id, 'status': rnd.choice(('Devam Ediyor', 'Tamamlandı'))}
+                                  for task_id in task_ids], changed_by=1)
+        create_tasks(db, [{'project_id': rnd.randint(1, args.projects), 'employee_id': rnd.randint(1, args.employees),
+                           'task_title': f"Analitik {i}"} for i in range(args.changes // 10)])
+
+        result, incremental = timed(analytics.refresh)
+        _, recompute = timed(lambda: reports(analytics, project_id))
+        fresh = TaskAnalytics(db, min_interval=0, settle=0)
+        _, full = timed(fresh.load)
+        if reports(analytics, project_id) != reports(fresh, project_id):
+            raise RuntimeError("Artımlı güncelleme tam yüklemeyle aynı sonucu vermedi")
+
+        print(f"\nartımlı refresh: {result['rows']} yeni satır, {result['tasks']} görev, {incremental:.1f} ms "
+              f"(+ raporların yeniden hesabı {recompute:.0f} ms)")
+        print(f"tam yeniden yükleme: {full:.0f} ms")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Toplu görev aktarımı benchmark'ı
+
+Aynı görev listesini üç yoldan aktarır ve saniyedeki görev sayısını, görev
+başına DB round trip'i ve HTTP isteği sayısını karşılaştırır:
+
+    tekil         her görev için POST /api/tasks (sp_AddTask)
+    toplu         --batch boyutunda POST /api/tasks/bulk (sp_AddTasks)
+    toplu durum   aynı görevlere PUT /api/tasks/bulk ile durum geçişi
+
+Kullanım:
+    python benchmarks/bench_bulk.py --scale small --tasks 2000 --batch 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import load_app, make_client  # noqa: E402
+from datagen import PRIORITIES, SCALES, DataGenerator  # noqa: E402
+
+
+def make_tasks(count: int, projects: int, employees: int, prefix: str, seed: int) -> List[Dict]:
+    rnd = random.Random(seed)
+    return [{
+        'project_id': rnd.randint(1, projects),
+        'employee_id': rnd.randint(1, employees),
+        'task_title': f"{prefix} {i}",
+        'task_description': f"Aktarılan görev #{i}",
+        'priority': rnd.choice(PRIORITIES),
+        'start_date': '2026-01-05',
+        'due_date': '2026-02-20',
+    } for i in range(count)]
+
+
+def measure(label: str, count: int, send: Callable[[], List]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    responses = send()
+    elapsed = time.perf_counter() - started
+
+    for response in responses:
+        if response.status_code != 200:
+            raise RuntimeError(f"{label}: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}")
+    trips = sum(int(response.headers.get('X-DB-Round-Trips', 0)) for response in responses)
+
+    result = {
+        'items': count,
+        'http_requests': len(responses),
+        'round_trips_per_item': trips / count,
+        'items_per_sec': count / elapsed if elapsed else 0.0,
+        'elapsed': elapsed,
+    }
+    print(f"  {label:<18}{result['http_requests']:>8}{result['round_trips_per_item']:>9.3f}"
+          f"{result['elapsed']:>9.2f}{result['items_per_sec']:>12.0f}")
+    return dict(result, responses=responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--tasks', type=int, default=2000, help="Her yol için aktarılan görev sayısı")
+    parser.add_argument('--batch', type=int, default=500, help="Toplu istek başına görev sayısı (en fazla 1000)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    _, employees, projects, _ = SCALES[args.scale]
+    with tempfile.TemporaryDirectory(prefix='pms-bulk-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        db.close()
+
+        module = load_app(path)
+        client = make_client(module)
+
+        print(f"\n[{args.scale}] {args.tasks} görev, toplu istek boyutu {args.batch}")
+        print(f"  {'yol':<18}{'istek':>8}{'sorgu':>9}{'sn':>9}{'görev/sn':>12}")
+
+        single = make_tasks(args.tasks, projects, employees, 'Tekil', args.seed)
+        measure('tekil', len(single), lambda: [client.post('/api/tasks', json=task) for task in single])
+
+        bulk = make_tasks(args.tasks, projects, employees, 'Toplu', args.seed)
+        responses = measure('toplu', len(bulk), lambda: [
+            client.post('/api/tasks/bulk', json={'tasks': bulk[i:i + args.batch]})
+            for i in range(0, len(bulk), args.batch)])['responses']
+
+        task_ids = [result['task_id'] for response in responses
+                    for result in response.get_json()['results'] if result['created']]
+        changes = [{'task_id': task_id, 'status': 'Devam Ediyor'} for task_id in task_ids]
+        measure('toplu durum', len(changes), lambda: [
+            client.put('/api/tasks/bulk', json={'changes': changes[i:i + args.batch]})
+            for i in range(0, len(changes), args.batch)])
+
+        module.db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Koşullu GET benchmark'ı
+
+Liste sayfalarını ve API'leri önce doğrulayıcısız, sonra ilk cevabın
+ETag'iyle (If-None-Match) çağırır; istek başına gecikme, DB round trip ve
+gövde boyutunu karşılaştırır. Veri ölçüm boyunca değişmediği için ikinci
+turdaki tüm cevapların 304 olması beklenir.
+
+Kullanım:
+    python benchmarks/bench_conditional.py --scale small --requests 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import ROUTES, load_app, make_client  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+# Dashboard önbellekli snapshot'tan gelir ve doğrulayıcı taşımaz
+CONDITIONAL_ROUTES = [(label, url) for label, url in ROUTES if 'dashboard' not in label]
+
+
+def measure(client, url: str, requests: int, headers=None):
+    trips = size = 0
+    statuses = set()
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url, headers=headers or {})
+        body = response.get_data()
+        trips += int(response.headers.get('X-DB-Round-Trips', 0))
+        size += len(body)
+        statuses.add(response.status_code)
+    elapsed = time.perf_counter() - started
+    return elapsed / requests * 1000, trips / requests, size / requests, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--requests', type=int, default=50, help="Rota ve tur başına istek sayısı")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-conditional-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        db.close()
+
+        module = load_app(path)
+        client = make_client(module)
+
+        print(f"\n[{args.scale}] rota başına {args.requests} istek (tam / If-None-Match)")
+        print(f"  {'rota':<22}{'ms':>9}{'ms 304':>9}{'sorgu':>7}{'sorgu 304':>11}{'bayt':>11}{'bayt 304':>10}")
+        for label, url in CONDITIONAL_ROUTES:
+            full_ms, full_trips, full_size, _ = measure(client, url, args.requests)
+            etag = client.get(url).headers.get('ETag')
+            cond_ms, cond_trips, cond_size, statuses = measure(client, url, args.requests,
+                                                               {'If-None-Match': etag})
+            if statuses != {304}:
+                raise RuntimeError(f"{label}: beklenen 304, gelen {sorted(statuses)}")
+            print(f"  {label:<22}{full_ms:>9.2f}{cond_ms:>9.2f}{full_trips:>7.1f}{cond_trips:>11.1f}"
+                  f"{full_size:>11.0f}{cond_size:>10.0f}")
+
+        module.db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+İstek profili maliyeti benchmark'ı
+
+Aynı rotaları profil kapalıyken, açık ama tetiklenmemişken (yetkili
+kullanıcı tanımlı, başlık yok), 1/N örneklemeyle ve her istekte zorlanmış
+sample / cprofile modlarıyla çağırıp ortalama gecikmeyi karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_profiling.py --scale small --requests 100
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import load_app, make_client  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+ROUTES = ('/tasks', '/api/tasks', '/reports', '/api/dashboard/stats')
+
+# (etiket, ortam değişkenleri, istek başlıkları)
+MODES = (
+    ('kapalı', {}, {}),
+    ('açık, tetiklenmedi', {'PMS_PROFILE_USERS': '1'}, {}),
+    ('1/20 örnekleme', {'PMS_PROFILE_SAMPLE': '20'}, {}),
+    ('her istek sample', {'PMS_PROFILE_USERS': '1'}, {'X-Profile': 'sample'}),
+    ('her istek cprofile', {'PMS_PROFILE_USERS': '1'}, {'X-Profile': 'cprofile'}),
+)
+
+
+def measure(client, url: str, requests: int, headers) -> float:
+    client.get(url, headers=headers).get_data()
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(url, headers=headers).get_data()
+    return (time.perf_counter() - started) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--requests', type=int, default=100, help="Rota ve mod başına istek sayısı")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-profiling-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        db.close()
+
+        profiles = os.path.join(workdir, 'profiles')
+        results = {}
+        for label, env, headers in MODES:
+            for name in ('PMS_PROFILE_USERS', 'PMS_PROFILE_SAMPLE'):
+                os.environ.pop(name, None)
+            os.environ.update(env, PMS_PROFILE_DIR=profiles, PMS_RETENTION_INTERVAL='0')
+            module = load_app(path)
+            client = make_client(module)
+            results[label] = [measure(client, url, args.requests, headers) for url in ROUTES]
+            print(f"  {label}: {module.profiler.stats()['captured']} profil yazıldı")
+            shutil.rmtree(profiles, ignore_errors=True)
+
+        print(f"\n[{args.scale}] rota başına {args.requests} istek, ortalama ms")
+        print(f"  {'mod':<22}" + ''.join(f"{url:>22}" for url in ROUTES))
+        for label, timings in results.items():
+            print(f"  {label:<22}" + ''.join(f"{value:>22.2f}" for value in timings))
+        module.db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Okuma replikası yönlendirme benchmark'ı
+
+Primary SQLite veritabanını üretir ve --replicas kadar kopyasını çıkarır.
+Replikasyon, primary'nin her --delay saniyede bir SQLite backup API'si ile
+replika dosyalarına kopyalanmasıyla taklit edilir; --stall ile son replika
+ilk kopyadan sonra hiç güncellenmez. Uygulama PMS_REPLICAS ile kurulur ve:
+
+    dağılım           okuma rotalarındaki sorguların primary/replika dağılımı
+    read-your-writes  yazan oturum ardından yazdığını görür, yazmayan oturum
+                      replikadan okur (replikasyon gecikmesi kadar eski olabilir)
+    devre dışı        güncellenmeyen replika gecikmesi --max-lag'i aşınca okuma almaz
+
+Kullanım:
+    python benchmarks/bench_replicas.py --scale small --replicas 2 --delay 2 --stall
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import ROUTES, load_app, make_client  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+
+def copy_database(source: str, targets):
+    """Primary'yi replika dosyalarına kopyala (tutarlı anlık görüntü)"""
+    src = sqlite3.connect(source)
+    try:
+        for target in targets:
+            dst = sqlite3.connect(target, timeout=30)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+    finally:
+        src.close()
+
+
+class Replicator(threading.Thread):
+    """Primary'yi her delay saniyede bir replikalara kopyalayan arka plan işi"""
+
+    def __init__(self, source: str, targets, delay: float):
+        super().__init__(name='replicator', daemon=True)
+        self.source, self.targets, self.delay = source, targets, delay
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(self.delay):
+            copy_database(self.source, self.targets)
+
+
+def read_counts(services):
+    stats = services.db.replica_stats()
+    return stats['primary_reads'], {name: info['reads'] for name, info in stats['replicas'].items()}
+
+
+def project_name(client) -> str:
+    return client.get('/api/projects?id=1').get_json()['project']['project_name']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--replicas', type=int, default=2)
+    parser.add_argument('--delay', type=float, default=2.0, help="Replikasyon aralığı (saniye)")
+    parser.add_argument('--stall', action='store_true', help="Son replika güncellenmesin")
+    parser.add_argument('--max-lag', type=float, default=3.0)
+    parser.add_argument('--sticky', type=float, default=2.0, help="Read-your-writes penceresi (saniye)")
+    parser.add_argument('--requests', type=int, default=10, help="Dağılım ölçümünde rota başına istek")
+    parser.add_argument('--writes', type=int, default=5, help="Read-your-writes denemesi")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-replicas-') as workdir:
+        path = os.path.join(workdir, 'primary.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        db.close()
+
+        replicas = [os.path.join(workdir, f'replica{index}.db') for index in range(1, args.replicas + 1)]
+        copy_database(path, replicas)
+        replicator = Replicator(path, replicas[:-1] if args.stall else replicas, args.delay)
+        replicator.start()
+
+        os.environ.update(PMS_REPLICAS=','.join(replicas), PMS_REPLICA_MAX_LAG=str(args.max_lag),
+                          PMS_REPLICA_CHECK_INTERVAL='0.2', PMS_STICKY_WINDOW=str(args.sticky),
+                          PMS_RETENTION_INTERVAL='0', PMS_ARCHIVE_DIR=os.path.join(workdir, 'archive'))
+        services = load_app(path)
+        reader = make_client(services)
+
+        # Dağılım: yalnızca okuyan oturum
+        primary_before, replica_before = read_counts(services)
+        for _, url in ROUTES:
+            for _ in range(args.requests):
+                reader.get(url).get_data()
+        primary_after, replica_after = read_counts(services)
+        total = (primary_after - primary_before) + sum(replica_after[name] - replica_before[name]
+                                                       for name in replica_after)
+        print(f"\n[{args.scale}] {len(ROUTES)} rota x {args.requests} istek, {total} yönlendirilen okuma")
+        print(f"  {'endpoint':<12}{'okuma':>8}{'oran':>8}")
+        print(f"  {'primary':<12}{primary_after - primary_before:>8}"
+              f"{(primary_after - primary_before) / max(total, 1):>8.0%}")
+        for name in replica_after:
+            reads = replica_after[name] - replica_before[name]
+            print(f"  {name:<12}{reads:>8}{reads / max(total, 1):>8.0%}")
+
+        # Read-your-writes: yazan oturum yazdığını hemen görür
+        writer = make_client(services)
+        with services.db.primary():
+            project = services.db.execute_query("SELECT * FROM Projects WHERE project_id = 1")[0]
+        own_fresh = other_stale = 0
+        for attempt in range(args.writes):
+            name = f"Replika testi {attempt} {time.time():.3f}"
+            response = writer.put('/api/projects', json={
+                'project_id': 1, 'project_name': name, 'description': project['description'],
+                'start_date': project['start_date'].isoformat(),
+                'end_date': project['end_date'].isoformat() if project['end_date'] else None,
+                'status': project['status']})
+            if not response.get_json()['success']:
+                raise RuntimeError(response.get_json())
+            own_fresh += project_name(writer) == name
+            other_stale += project_name(reader) != name
+        print(f"\n  read-your-writes: yazan oturum {own_fresh}/{args.writes} yazısını gördü, "
+              f"diğer oturum {other_stale}/{args.writes} kez replikadan eski veri okudu")
+        if own_fresh != args.writes:
+            raise RuntimeError("Yazan oturum kendi yazısını görmedi")
+
+        # Pencere dolunca yazan oturum da replikaya döner; eski replika gecikmeden çıkarılır
+        time.sleep(max(args.sticky, args.delay, args.max_lag) + 1)
+        primary_before, _ = read_counts(services)
+        writer.get('/api/projects?id=1')
+        primary_after, _ = read_counts(services)
+        endpoint = 'primary' if primary_after > primary_before else 'replika'
+        print(f"  pencereden sonra yazan oturumun okuması: {endpoint}")
+
+        stats = services.db.replica_stats()
+        print(f"\n  {'replika':<12}{'sağlıklı':>10}{'gecikme sn':>12}{'okuma':>8}{'çıkarılma':>11}  hata")
+        for name, info in stats['replicas'].items():
+            lag = f"{info['lag']:.1f}" if info['lag'] is not None else '-'
+            print(f"  {name:<12}{'evet' if info['healthy'] else 'hayır':>10}{lag:>12}{info['reads']:>8}"
+                  f"{info['ejections']:>11}  {info['error'] or ''}")
+
+        replicator.stop.set()
+        replicator.join()
+        services.close()
+
+
+if __name__ == '__main__':
+    main()
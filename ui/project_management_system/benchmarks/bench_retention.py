@@ -0,0 +1,92 @@
+"""
+Saklama/arşivleme benchmark'ı
+
+Üretilen veritabanında /reports gecikmesini ve sıcak tablo boyutlarını
+ölçer, saklama işini --hot-days penceresiyle çalıştırır ve aynı ölçümü
+tekrarlar. Arşiv dahil dışa aktarmanın arşivlemeden önceki satır sayısını
+verdiği de doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_retention.py --scale small --hot-days 90
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from retention import RetentionJob, default_policies  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import load_app, make_client  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+TABLES = ('TaskStatusHistory', 'Notifications')
+
+
+def measure(client, url: str, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(url).get_data()
+    return (time.perf_counter() - started) / requests * 1000
+
+
+def hot_rows(db: DatabaseManager):
+    return {table: db.execute_scalar(f"SELECT COUNT(*) FROM {table}") for table in TABLES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--hot-days', type=float, default=90)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-retention-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+
+        os.environ['PMS_RETENTION_INTERVAL'] = '0'
+        module = load_app(path)
+        client = make_client(module)
+        export = {table: sum(1 for _ in module.retention_job.iter_rows(table)) for table in TABLES}
+
+        before_rows, before_ms = hot_rows(db), measure(client, '/reports', args.requests)
+
+        job = RetentionJob(db, os.path.join(workdir, 'archive'),
+                           default_policies(args.hot_days, args.hot_days), batch_size=args.batch_size,
+                           max_batches=10 ** 6)
+        started = time.perf_counter()
+        result = job.run_once()
+        elapsed = time.perf_counter() - started
+
+        after_rows, after_ms = hot_rows(db), measure(client, '/reports', args.requests)
+        for table in TABLES:
+            archived = sum(1 for _ in job.iter_rows(table, include_archive=True))
+            if archived != export[table]:
+                raise RuntimeError(f"{table}: arşiv dahil {archived} satır, beklenen {export[table]}")
+
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(os.path.join(workdir, 'archive')) for name in names)
+        batches = sum(info.get('batches', 0) for info in result['tables'].values())
+        print(f"\n[{args.scale}] sıcak pencere {args.hot_days:g} gün")
+        print(f"  {'tablo':<20}{'önce':>10}{'sonra':>10}")
+        for table in TABLES:
+            print(f"  {table:<20}{before_rows[table]:>10}{after_rows[table]:>10}")
+        print(f"\n  saklama işi: {batches} batch, {elapsed * 1000:.0f} ms, arşiv {size / 1024:.0f} KB")
+        print(f"  /reports: {before_ms:.1f} ms -> {after_ms:.1f} ms")
+
+        module.db.close()
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
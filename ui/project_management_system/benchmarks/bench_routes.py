@@ -0,0 +1,218 @@
+"""
+Uçtan uca rota yük testi
+
+Her ölçek için geçici bir SQLite veritabanı oluşturur, datagen ile doldurur,
+uygulamayı PMS_DB_BACKEND=sqlite ile yükler ve sayfaları/API'leri Flask
+test client'ı üzerinden çağırır. Rota başına p50/p95/p99 gecikme,
+saniyedeki istek (throughput) ve X-DB-Round-Trips başlığından okunan
+istek başına DB round trip sayısı raporlanır.
+
+--output ile sonuçlar JSON'a yazılır; --baseline ile önceki bir JSON'a göre
+p95 gerilemesi --max-regression oranını aşarsa çıkış kodu 1 olur (CI için).
+
+Kullanım:
+    python benchmarks/bench_routes.py --scales tiny,small --requests 50
+    python benchmarks/bench_routes.py --scales medium --concurrency 4 --output medium.json
+    python benchmarks/bench_routes.py --scales medium --baseline medium.json --max-regression 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+# (etiket, URL) çiftleri; yalnızca okuma yapan rotalar, veri ölçüm boyunca değişmez
+ROUTES = [
+    ('dashboard', '/dashboard'),
+    ('api_dashboard_stats', '/api/dashboard/stats'),
+    ('projects', '/projects'),
+    ('api_projects', '/api/projects'),
+    ('api_project_detail', '/api/projects?id=1'),
+    ('tasks', '/tasks'),
+    ('tasks_filtered', '/tasks?status=Atandı&priority=Yüksek'),
+    ('api_tasks', '/api/tasks'),
+    ('api_tasks_project', '/api/tasks?project_id=1'),
+    ('employees', '/employees'),
+    ('api_employees', '/api/employees'),
+    ('api_employee_detail', '/api/employees?id=1'),
+    ('reports', '/reports'),
+    # Streaming cevapta sorgu gövde üretilirken çalışır, başlıktaki round trip 0 görünür
+    ('export_tasks', '/api/export/tasks?format=ndjson'),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Sıralı listede en yakın sıra (nearest-rank) yüzdeliği"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+_services = None
+
+
+def load_app(sqlite_path: str):
+    """
+    Uygulamayı verilen SQLite dosyasıyla kur (önceki kurulum kapatılır)
+
+    Returns:
+        app.Services (app, db, profiler, ... öznitelikleri)
+    """
+    global _services
+    from app import create_app
+
+    if _services is not None:
+        _services.close()
+    os.environ['PMS_DB_BACKEND'] = 'sqlite'
+    os.environ['PMS_SQLITE_PATH'] = sqlite_path
+    os.environ['PMS_NOTIFICATION_INTERVAL'] = '0'  # arka plan taraması ölçümü bozmasın
+    _services = create_app().extensions['pms']
+    return _services
+
+
+def make_client(module):
+    """Oturum açmış bir test client'ı döndür (ilk çalışan olarak)"""
+    client = module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['user_name'] = 'Yük Testi'
+    return client
+
+
+def run_route(clients, url: str, requests: int, warmup: int) -> Dict[str, float]:
+    """Bir rotayı eşzamanlı client'larla çağırıp gecikme dağılımını ölç"""
+    for _ in range(warmup):
+        clients[0].get(url).get_data()
+
+    def worker(client, count):
+        timings, trips = [], []
+        for _ in range(count):
+            started = time.perf_counter()
+            response = client.get(url)
+            response.get_data()  # streaming cevaplar da sonuna kadar okunur
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} -> HTTP {response.status_code}")
+            trips.append(int(response.headers.get('X-DB-Round-Trips', 0)))
+        return timings, trips
+
+    per_client = [requests // len(clients) + (1 if i < requests % len(clients) else 0)
+                  for i in range(len(clients))]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        results = list(executor.map(worker, clients, per_client))
+    wall = time.perf_counter() - started
+
+    timings = sorted(t for result in results for t in result[0])
+    trips = [t for result in results for t in result[1]]
+    return {
+        'requests': len(timings),
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'throughput_rps': len(timings) / wall if wall else 0.0,
+        'round_trips': statistics.mean(trips) if trips else 0.0,
+    }
+
+
+def bench_scale(scale: str, args, workdir: str) -> Dict[str, Dict[str, float]]:
+    departments, employees, projects, tasks = SCALES[scale]
+    path = os.path.join(workdir, f'{scale}.db')
+
+    print(f"\n[{scale}] veri üretiliyor ({employees} çalışan, {projects} proje, {tasks} görev)")
+    db = DatabaseManager(backend=SQLiteBackend(path))
+    DataGenerator(db, departments, employees, projects, tasks, seed=args.seed).run()
+    migrate(db)
+    db.close()
+
+    module = load_app(path)
+    clients = [make_client(module) for _ in range(args.concurrency)]
+
+    print(f"[{scale}] {len(ROUTES)} rota, rota başına {args.requests} istek, eşzamanlılık {args.concurrency}")
+    print(f"  {'rota':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'istek/sn':>10}{'sorgu':>7}")
+    results = {}
+    for label, url in ROUTES:
+        if args.routes and label not in args.routes:
+            continue
+        stats = run_route(clients, url, args.requests, args.warmup)
+        results[label] = stats
+        print(f"  {label:<22}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+              f"{stats['throughput_rps']:>10.1f}{stats['round_trips']:>7.1f}")
+
+    module.db.close()
+    return results
+
+
+def compare(results, baseline, max_regression: float) -> List[str]:
+    """Baseline'a göre p95'i izin verilen orandan fazla kötüleşen rotaları listele"""
+    failures = []
+    for scale, routes in results.items():
+        for label, stats in routes.items():
+            old = baseline.get(scale, {}).get(label)
+            if not old or not old['p95_ms']:
+                continue
+            change = stats['p95_ms'] / old['p95_ms'] - 1
+            if change > max_regression:
+                failures.append(f"{scale}/{label}: p95 {old['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms "
+                                f"(+{change:.0%})")
+            if stats['round_trips'] > old['round_trips']:
+                failures.append(f"{scale}/{label}: round trip {old['round_trips']:.1f} -> "
+                                f"{stats['round_trips']:.1f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='tiny,small', help="Virgülle ayrılmış ölçekler: " + ','.join(SCALES))
+    parser.add_argument('--requests', type=int, default=50, help="Rota başına ölçülen istek sayısı")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--routes', type=lambda s: s.split(','), help="Yalnızca bu rota etiketleri")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    scales = args.scales.split(',')
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Bilinmeyen ölçek: {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='pms-bench-') as workdir:
+        for scale in scales:
+            results[scale] = bench_scale(scale, args, workdir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSonuçlar yazıldı: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        if failures:
+            print("\nGerileme tespit edildi:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nBaseline'a göre gerileme yok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Satır temsili mikro-benchmark'ı: dict(zip(...)) ile ResultSet karşılaştırması
+
+Sürücünün fetchall() çıktısını sqlite3 ile üretir, ardından iki modda
+dönüşüm süresini, bellek tepe noktasını (tracemalloc), şablon benzeri
+row['col'] erişimini ve JSON serileştirme süresini ölçer. JSON, API'lerin
+jsonify ile kullandığı AppJSONProvider'dan geçer (dict listesi veya
+ResultSet.to_json_objects); sütunlu to_json() karşılaştırma için ayrıca ölçülür.
+
+Kullanım:
+    python benchmarks/bench_rows.py --rows 200000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from app import AppJSONProvider  # noqa: E402
+from rows import ResultSet  # noqa: E402
+
+
+def make_cursor(row_count: int):
+    """TaskStatusHistory benzeri sütunlarla dolu bir sqlite cursor'ı döndür"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("""
+        CREATE TABLE history (
+            history_id INTEGER PRIMARY KEY, task_id INTEGER, old_status TEXT,
+            new_status TEXT, changed_at TEXT, changed_by INTEGER,
+            task_title TEXT, changed_by_name TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ((i, i % 5000, 'Atandı', 'Devam Ediyor', '2024-01-01 10:00:00', i % 300,
+          f'Görev {i % 5000}', f'Çalışan {i % 300}') for i in range(row_count))
+    )
+    cursor = conn.execute("SELECT * FROM history")
+    return conn, cursor
+
+
+def fetch(row_count: int):
+    conn, cursor = make_cursor(row_count)
+    columns = [column[0] for column in cursor.description]
+    rows = cursor.fetchall()
+    conn.close()
+    return columns, rows
+
+
+def as_dicts(columns, rows):
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def as_compact(columns, rows):
+    return ResultSet(columns, rows)
+
+
+def measure(label, build, columns, rows, serialize):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(columns, rows)
+    build_time = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Şablonlardaki {{ h.task_title }} erişimine benzer okuma
+    started = time.perf_counter()
+    for row in result:
+        row['task_title']
+        row['new_status']
+        row['changed_at']
+    access_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    payload = serialize(result)
+    json_time = time.perf_counter() - started
+
+    print(f"{label:<10} build={build_time * 1000:8.1f} ms  peak={peak / 1024 / 1024:7.1f} MB  "
+          f"access={access_time * 1000:8.1f} ms  json={json_time * 1000:8.1f} ms  "
+          f"size={len(payload) / 1024 / 1024:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    columns, rows = fetch(args.rows)
+    print(f"{args.rows} satır, {len(columns)} sütun\n")
+
+    # jsonify'ın (debug kapalıyken) yaptığı çağrı
+    provider = AppJSONProvider(Flask(__name__))
+    jsonify = lambda result: provider.dumps(result, separators=(',', ':'))  # noqa: E731
+
+    measure('dict', as_dicts, columns, rows, jsonify)
+    measure('compact', as_compact, columns, rows, jsonify)
+    measure('sütunlu', as_compact, columns, rows, lambda result: result.to_json())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Arama index'i benchmark'ı
+
+Varsayılan 1.000.000 görevle bir SQLite veritabanı üretir ve SearchIndex
+için şunları ölçer:
+
+    yükleme      tüm görev/proje/çalışanların okunup index'lenmesi (süre, bellek)
+    sorgular     tipik sorguların p50/p99 süresi (yalnızca index, satır okuma hariç)
+    senkron      --changes görev güncellemesi + proje adı değişikliği sonrası sync()
+
+Senkrondan sonra index'in baştan yüklenen bir index'le aynı sonuçları
+verdiği de doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_search.py --tasks 1000000 --requests 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from pagination import KeysetPaginator  # noqa: E402
+from search_index import SearchIndex, SearchSource  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from datagen import DataGenerator  # noqa: E402
+
+QUERIES = ('görev 123456', 'GÖREV 9999', 'sentetik', 'gorev', 'ayşe yılmaz', 'proje 17', 'şim', 'ozdemir gorev 5')
+
+
+def rss_mb() -> float:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def make_index(db: DatabaseManager) -> SearchIndex:
+    """app.py'deki kaynakların aynısı (hydration için sahte paginator yeterli)"""
+    paginator = KeysetPaginator(source='Tasks', key=('task_id', 'task_id'),
+                                sort_columns={'task_id': ('task_id', 'task_id')}, default_sort='task_id')
+    return SearchIndex(db, {
+        'tasks': SearchSource(
+            'Tasks', "SELECT task_id, task_title, task_description, project_name, EmployeeName FROM V_TaskDetails",
+            'task_id', {'task_title': 3.0, 'task_description': 1.0, 'project_name': 0.5, 'EmployeeName': 0.5},
+            paginator, depends={'projects': 'project_id', 'employees': 'EmployeeID'}),
+        'projects': SearchSource(
+            'Projects', "SELECT project_id, project_name, description FROM Projects",
+            'project_id', {'project_name': 3.0, 'description': 1.0}, paginator),
+        'employees': SearchSource(
+            'Employees', "SELECT EmployeeID, FirstName, LastName, Email FROM Employees",
+            'EmployeeID', {'FirstName': 3.0, 'LastName': 3.0, 'Email': 1.0}, paginator),
+    }, min_interval=3600, settle=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=200, help="Sorgu başına tekrar")
+    parser.add_argument('--changes', type=int, default=1000, help="Senkron ölçümü için görev güncellemesi")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-search-') as workdir:
+        path = os.path.join(workdir, 'search.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        migrate(db)
+        print(f"{args.tasks} görev üretiliyor...")
+        DataGenerator(db, 20, args.employees, args.projects, args.tasks, seed=args.seed, verbose=False).run()
+
+        index = make_index(db)
+        before = rss_mb()
+        started = time.perf_counter()
+        index.load()
+        print(f"\nyükleme: {index.stats()['documents']}, {time.perf_counter() - started:.1f} sn, "
+              f"+{rss_mb() - before:.0f} MB RSS")
+
+        print(f"\n  {'sorgu':<22}{'sonuç':>7}{'p50 ms':>9}{'p99 ms':>9}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                result = index.search(query)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            hits = sum(len(items) for items in result['results'].values())
+            print(f"  {query:<22}{hits:>7}{timings[len(timings) // 2]:>9.3f}"
+                  f"{timings[int(len(timings) * 0.99) - 1]:>9.3f}")
+
+        rnd = random.Random(args.seed)
+        for task_id in rnd.sample(range(1, args.tasks + 1), args.changes):
+            db.execute_update("UPDATE Tasks SET task_title = ? WHERE task_id = ?",
+                              (f"Yeniden adlandırılan {task_id}", task_id))
+        db.execute_update("UPDATE Projects SET project_name = ? WHERE project_id = 1", ("Çağrı Merkezi",))
+        started = time.perf_counter()
+        result = index.sync()
+        print(f"\nsenkron: {result['documents']} belge, {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        fresh = make_index(db)
+        fresh.load()
+        for query in QUERIES + ('yeniden adlandirilan', 'cagri merkezi'):
+            if index.search(query)['results'] != fresh.search(query)['results']:
+                raise RuntimeError(f"Senkron sonrası sonuç farklı: {query}")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
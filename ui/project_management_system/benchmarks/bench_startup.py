@@ -0,0 +1,178 @@
+"""
+Açılış süresi ve worker belleği benchmark'ı
+
+İki ölçüm yapar:
+
+    import     her biri yeni bir Python process'inde: modül import süresi ve
+               sonrasındaki RSS (pandas'ın kendi maliyeti karşılaştırma için)
+    worker     gunicorn (gunicorn.conf.py) ile --workers kadar worker başlatır, rotaları ısıtır
+               ve process başına RSS, PSS (paylaşılan sayfalar process'lere
+               bölünmüş) ve USS (yalnızca o process'e ait) değerlerini okur
+
+RSS/PSS /proc'tan okunduğu için yalnızca Linux'ta çalışır.
+
+Kullanım:
+    python benchmarks/bench_startup.py --scale small --workers 4
+"""
+import argparse
+import http.client
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import ROUTES  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+# (etiket, import sonrası çalışacak kod)
+IMPORTS = (
+    ('database', 'import database'),
+    ('app', 'import app'),
+    ('app + create_app()', 'import app; app.create_app()'),
+    ('pandas (karşılaştırma)', 'import pandas'),
+)
+
+PROBE = """
+import re, sys, time
+sys.path.insert(0, {app_dir!r})
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+with open('/proc/self/status') as status:
+    rss = int(re.search(r'VmRSS:\\s+(\\d+)', status.read()).group(1))
+print(elapsed, rss, 'pandas' in sys.modules)
+"""
+
+
+def measure_import(code: str, env, repeat: int):
+    """Yeni process'lerde import süresi (medyan, ms) ve RSS (MB)"""
+    timings, rss = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                                 PROBE.format(app_dir=APP_DIR, code=code)],
+                                env=env, capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[-3]) * 1000)
+        rss.append(int(output[-2]) / 1024)
+    return statistics.median(timings), statistics.median(rss), output[-1] == 'True'
+
+
+def memory(pid: int):
+    """Process'in RSS, PSS ve USS değerleri (MB)"""
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        values = dict(re.findall(r'^(\w+):\s+(\d+) kB', rollup.read(), re.M))
+    uss = int(values['Private_Clean']) + int(values['Private_Dirty'])
+    return int(values['Rss']) / 1024, int(values['Pss']) / 1024, uss / 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(port: int, method: str, url: str, body=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request(method, urllib.parse.quote(url, safe='/?=&'), body, headers or {})
+        response = conn.getresponse()
+        response.read()
+        return response
+    finally:
+        conn.close()
+
+
+def children(pid: int):
+    with open(f'/proc/{pid}/task/{pid}/children') as handle:
+        return [int(child) for child in handle.read().split()]
+
+
+def accepting(port: int) -> bool:
+    try:
+        socket.create_connection(('127.0.0.1', port), timeout=1).close()
+        return True
+    except OSError:
+        return False
+
+
+def measure_workers(path: str, email: str, workers: int, requests: int, env):
+    """gunicorn'u başlat, rotaları ısıt, process başına bellek oku"""
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-W', 'ignore', '-m', 'gunicorn',
+                               '-c', os.path.join(APP_DIR, 'gunicorn.conf.py'), '--chdir', APP_DIR,
+                               '-b', f'127.0.0.1:{port}', '-w', str(workers)],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        started = time.perf_counter()
+        while len(children(server.pid)) < workers or not accepting(port):
+            if server.poll() is not None or time.perf_counter() - started > 120:
+                raise RuntimeError("gunicorn başlatılamadı")
+            time.sleep(0.05)
+        ready = time.perf_counter() - started
+
+        login = request(port, 'POST', '/login', urllib.parse.urlencode({'email': email}),
+                        {'Content-Type': 'application/x-www-form-urlencoded'})
+        cookie = {'Cookie': login.getheader('Set-Cookie').split(';')[0]}
+        # Bağlantı başına yeni TCP bağlantısı: istekler worker'lara dağılır
+        for _ in range(requests):
+            for _, url in ROUTES:
+                response = request(port, 'GET', url, headers=cookie)
+                if response.status != 200:
+                    raise RuntimeError(f"{url} -> HTTP {response.status}")
+
+        return ready, memory(server.pid), [memory(pid) for pid in children(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5, help="Import ölçümü tekrarı")
+    parser.add_argument('--requests', type=int, default=5, help="Worker ölçümünden önce rota başına istek")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-startup-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        email = db.execute_scalar("SELECT Email FROM Employees WHERE EmployeeID = 1")
+        db.close()
+
+        env = dict(os.environ, PMS_DB_BACKEND='sqlite', PMS_SQLITE_PATH=path, PMS_NOTIFICATION_INTERVAL='0',
+                   PMS_RETENTION_INTERVAL='0', PMS_ARCHIVE_DIR=os.path.join(workdir, 'archive'))
+
+        print(f"\n[{args.scale}] import ({args.repeat} tekrar, medyan)")
+        print(f"  {'modül':<26}{'ms':>9}{'RSS MB':>9}  pandas yüklü")
+        for label, code in IMPORTS:
+            elapsed, rss, pandas_loaded = measure_import(code, env, args.repeat)
+            print(f"  {label:<26}{elapsed:>9.0f}{rss:>9.1f}  {'evet' if pandas_loaded else 'hayır'}")
+
+        ready, master, workers = measure_workers(path, email, args.workers, args.requests, env)
+        print(f"\n  gunicorn -w {args.workers}: {ready:.2f} sn'de hazır, "
+              f"rota başına {args.requests} istek sonrası (MB)")
+        print(f"  {'process':<12}{'RSS':>9}{'PSS':>9}{'USS':>9}")
+        print(f"  {'master':<12}" + ''.join(f"{value:>9.1f}" for value in master))
+        for index, values in enumerate(workers):
+            print(f"  {f'worker {index}':<12}" + ''.join(f"{value:>9.1f}" for value in values))
+        total = master[1] + sum(values[1] for values in workers)
+        print(f"  {'toplam PSS':<12}{total:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
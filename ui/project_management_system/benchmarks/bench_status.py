@@ -0,0 +1,135 @@
+"""
+Görev durum geçişi yazma benchmark'ı
+
+Aynı sentetik veritabanında durum geçişlerini iki yoldan uygular ve geçiş
+başına yazılan geçmiş ve bildirim satırlarını, DB round
+trip sayısını ve süreyi karşılaştırır:
+
+    önce   migration 005 geri alınmış şema: trg_TaskStatusHistory ve
+           trg_TaskCompleted aktif, eski sp_UpdateTaskStatus akışı (durum
+           okuma, UPDATE, elle geçmiş kaydı, sonuç SELECT'i)
+    sonra  güncel şema: sp_UpdateTaskStatus (tek geçiş) ve
+           sp_ApplyTaskStatusChanges ile --batch boyutunda toplu geçişler
+
+Kullanım:
+    python benchmarks/bench_status.py --scale small --changes 2000 --batch 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate, rollback  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+from task_status import apply_status_changes  # noqa: E402
+
+from datagen import SCALES, DataGenerator, TASK_FLOW  # noqa: E402
+
+COUNTED_TABLES = ('TaskStatusHistory', 'Notifications')
+
+
+def legacy_update(db: DatabaseManager, task_id: int, new_status: str, changed_by: int):
+    """Migration 005 öncesi sp_UpdateTaskStatus'un ifadeleri (T-SQL sürümüyle aynı sıra, her biri bir round trip)"""
+    conn = db.pool.acquire()
+    cursor = conn.cursor()
+
+    def run(sql, params):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else []
+        db._record(sql, started, len(rows), 0, False, params)
+        return rows
+
+    try:
+        old_status = run("SELECT status FROM Tasks WHERE task_id = ?", (task_id,))[0][0]
+        run("UPDATE Tasks SET status = ? WHERE task_id = ?", (new_status, task_id))
+        run("INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by) VALUES (?, ?, ?, ?)",
+            (task_id, old_status, new_status, changed_by))
+        run("SELECT ? AS TaskID, ? AS OldStatus, ? AS NewStatus", (task_id, old_status, new_status))
+        conn.commit()
+    finally:
+        cursor.close()
+        db.pool.release(conn)
+
+
+def make_changes(db: DatabaseManager, count: int, seed: int) -> List[Tuple[int, str]]:
+    """Tamamlanmamış görevlerden rastgele, birbirinden farklı geçişler seç"""
+    rows = db.execute_query("SELECT task_id, status FROM Tasks WHERE status <> 'Tamamlandı'")
+    picked = random.Random(seed).sample(rows, min(count, len(rows)))
+    return [(row['task_id'], TASK_FLOW[TASK_FLOW.index(row['status']) + 1]) for row in picked]
+
+
+def measure(db: DatabaseManager, label: str, changes: List[Tuple[int, str]],
+            apply: Callable[[List[Tuple[int, str]]], None], trips: List[str]) -> Dict[str, float]:
+    before = {table: db.execute_scalar(f"SELECT COUNT(*) FROM {table}") for table in COUNTED_TABLES}
+    trips.clear()
+
+    started = time.perf_counter()
+    apply(changes)
+    elapsed = time.perf_counter() - started
+
+    round_trips = len(trips)
+    after = {table: db.execute_scalar(f"SELECT COUNT(*) FROM {table}") for table in COUNTED_TABLES}
+    completed = sum(1 for _, status in changes if status == 'Tamamlandı')
+
+    n = len(changes)
+    result = {
+        'changes': n,
+        'history_per_change': (after['TaskStatusHistory'] - before['TaskStatusHistory']) / n,
+        'notifications_per_completion': (after['Notifications'] - before['Notifications']) / max(1, completed),
+        'round_trips_per_change': round_trips / n,
+        'ms_per_change': elapsed * 1000 / n,
+        'changes_per_sec': n / elapsed if elapsed else 0.0,
+    }
+    print(f"  {label:<22}{result['history_per_change']:>9.2f}{result['notifications_per_completion']:>10.2f}"
+          f"{result['round_trips_per_change']:>9.2f}{result['ms_per_change']:>9.3f}{result['changes_per_sec']:>11.0f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--changes', type=int, default=2000, help="Her yol için uygulanan geçiş sayısı")
+    parser.add_argument('--batch', type=int, default=200, help="Toplu çağrı başına geçiş sayısı")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-status-') as workdir:
+        db = DatabaseManager(backend=SQLiteBackend(os.path.join(workdir, f'{args.scale}.db')))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+
+        # measure() her geçiş yolunun round trip'lerini bu listeden sayar
+        trips: List[str] = []
+        db.metrics.add_listener(lambda query, elapsed, rows: trips.append(query))
+
+        print(f"[{args.scale}] {args.changes} geçiş, toplu çağrı boyutu {args.batch}")
+        print(f"  {'yol':<22}{'geçmiş':>9}{'bildirim':>10}{'sorgu':>9}{'ms':>9}{'geçiş/sn':>11}")
+
+        rollback(db, 4)
+        changes = make_changes(db, args.changes, args.seed)
+        measure(db, 'önce (trigger)', changes,
+                lambda items: [legacy_update(db, task_id, status, 1) for task_id, status in items], trips)
+
+        migrate(db)
+        changes = make_changes(db, args.changes, args.seed + 1)
+        measure(db, 'sonra (tekil)', changes,
+                lambda items: [db.execute_procedure('sp_UpdateTaskStatus', (task_id, status, 1))
+                               for task_id, status in items], trips)
+
+        changes = make_changes(db, args.changes, args.seed + 2)
+        measure(db, f'sonra (toplu x{args.batch})', changes,
+                lambda items: [apply_status_changes(
+                    db, [{'task_id': task_id, 'status': status} for task_id, status in items[i:i + args.batch]],
+                    changed_by=1) for i in range(0, len(items), args.batch)], trips)
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
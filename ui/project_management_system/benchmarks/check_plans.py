@@ -0,0 +1,187 @@
+"""
+Sorgu planı regresyon kontrolü
+
+Verilen ölçekte sentetik veriyle bir SQLite veritabanı kurar, migration'ları
+uygular ve bench_routes.ROUTES'taki her rotayı bir kez çağırır. Rotanın
+çalıştırdığı her SELECT (view'lar ve Python prosedürlerinin içindekiler dahil)
+trace ile yakalanıp "<rota>#<sıra>" adıyla EXPLAIN QUERY PLAN ve süre ölçümünden
+geçirilir.
+
+Sıcak tablolardan birinde (HOT_TABLES) index kullanmayan tam tarama (SCAN)
+varsa ve ALLOWED_SCANS'ta izin verilmemişse çıkış kodu 1 olur. --baseline ile
+önceki bir çıktıya göre süre gerilemeleri de kontrol edilir.
+
+Kullanım:
+    python benchmarks/check_plans.py --scale small
+    python benchmarks/check_plans.py --scale medium --output plans.json
+    python benchmarks/check_plans.py --scale medium --baseline plans.json --max-slowdown 2
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from migrations import migrate  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+from bench_routes import ROUTES, load_app, make_client  # noqa: E402
+from datagen import SCALES, DataGenerator  # noqa: E402
+
+# Tam taraması ölçekle büyüyen tablolar
+HOT_TABLES = {'Tasks', 'ProjectMembers', 'TaskStatusHistory', 'Notifications'}
+
+# Bilerek tüm tabloyu okuyan rotalar: rota etiketi -> taranmasına izin verilen tablolar
+ALLOWED_SCANS = {
+    'reports': {'Notifications', 'TaskStatusHistory', 'Tasks'},
+    'export_tasks': {'Tasks'},
+}
+
+_SCAN = re.compile(r"^SCAN (\w+)$")
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIAS = {'WHERE', 'INNER', 'LEFT', 'RIGHT', 'JOIN', 'ON', 'ORDER', 'GROUP', 'LIMIT', 'CROSS', 'UNION'}
+
+
+def capture(module, client) -> Dict[str, str]:
+    """Her rotanın çalıştırdığı SELECT ifadelerini '<rota>#<sıra>' adıyla topla"""
+    statements: List[str] = []
+    module.db.backend.set_trace(statements.append)
+
+    queries = {}
+    for label, url in ROUTES:
+        # Önbellekli rotalar (dashboard, dropdown'lar) da her seferinde sorgu çalıştırsın
+        module.dashboard_stats.invalidate()
+        module.query_cache.clear()
+        statements.clear()
+        response = client.get(url)
+        response.get_data()
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} -> HTTP {response.status_code}")
+
+        selects = [s.strip() for s in statements if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+        for i, sql in enumerate(selects, 1):
+            queries[f"{label}#{i}"] = sql
+
+    module.db.backend.set_trace(None)
+    return queries
+
+
+def alias_map(conn: sqlite3.Connection, sql: str) -> Dict[str, str]:
+    """Plan satırlarındaki takma adları (t, pm, ...) tablo adlarına çevir"""
+    views = ' '.join(row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'view'"))
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql + ' ' + views):
+        aliases[table] = table
+        if alias and alias.upper() not in _NOT_ALIAS:
+            aliases.setdefault(alias, table)
+    return aliases
+
+
+def analyze(conn: sqlite3.Connection, name: str, sql: str, repeat: int) -> Dict:
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    aliases = alias_map(conn, sql)
+
+    scans = []
+    for line in plan:
+        match = _SCAN.match(line)
+        if match:
+            table = aliases.get(match.group(1), match.group(1))
+            if table in HOT_TABLES:
+                scans.append(table)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql).fetchall()
+        timings.append(time.perf_counter() - started)
+
+    allowed = ALLOWED_SCANS.get(name.split('#')[0], set())
+    return {
+        'sql': sql,
+        'plan': plan,
+        'full_scans': scans,
+        'violations': [table for table in scans if table not in allowed],
+        'median_ms': statistics.median(timings) * 1000,
+    }
+
+
+def compare(results, baseline, max_slowdown: float, min_ms: float) -> List[str]:
+    """Baseline'a göre yeni tam taramaları ve süresi max_slowdown katını aşan sorguları listele"""
+    failures = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        new_scans = set(result['full_scans']) - set(old['full_scans'])
+        if new_scans:
+            failures.append(f"{name}: yeni tam tarama {', '.join(sorted(new_scans))}")
+        if result['median_ms'] > max(min_ms, old['median_ms'] * max_slowdown):
+            failures.append(f"{name}: {old['median_ms']:.2f} -> {result['median_ms']:.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--repeat', type=int, default=5, help="Sorgu başına süre ölçümü sayısı")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help="Tüm planları yazdır")
+    parser.add_argument('--output', help="Planların ve sürelerin yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', help="Karşılaştırılacak önceki JSON çıktısı")
+    parser.add_argument('--max-slowdown', type=float, default=2.0)
+    parser.add_argument('--min-ms', type=float, default=5.0, help="Bu sürenin altındaki gerilemeler yok sayılır")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pms-plans-') as workdir:
+        path = os.path.join(workdir, f'{args.scale}.db')
+        db = DatabaseManager(backend=SQLiteBackend(path))
+        DataGenerator(db, *SCALES[args.scale], seed=args.seed, verbose=False).run()
+        migrate(db)
+        db.close()
+
+        module = load_app(path)
+        queries = capture(module, make_client(module))
+        module.db.close()
+
+        conn = sqlite3.connect(path)
+        results = {name: analyze(conn, name, sql, args.repeat) for name, sql in queries.items()}
+        conn.close()
+
+    failures = []
+    print(f"{'sorgu':<26}{'ms':>9}  plan")
+    for name, result in results.items():
+        mark = '✗' if result['violations'] else ' '
+        print(f"{mark} {name:<24}{result['median_ms']:>9.2f}  {result['plan'][0] if result['plan'] else ''}")
+        if args.verbose:
+            for line in result['plan'][1:]:
+                print(f"{'':>37}{line}")
+        for table in result['violations']:
+            failures.append(f"{name}: {table} tablosunda tam tarama")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar yazıldı: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures.extend(compare(results, json.load(f), args.max_slowdown, args.min_ms))
+
+    if failures:
+        print("\nPlan gerilemesi:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\n{len(results)} sorgu kontrol edildi, tam tarama yok ({args.scale})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Ölçeklenebilir sentetik veri üreteci
+
+create_tables.sql'deki yedi tabloyu (Departments, Employees, Projects,
+ProjectMembers, Tasks, TaskStatusHistory, Notifications) FK ve CHECK
+kısıtlarına uyan verilerle doldurur. Satırlar generator'larla üretilip
+DatabaseManager.bulk_load ile parça parça yazılır; bellek kullanımı
+satır sayısından bağımsızdır.
+
+Boş bir veritabanı varsayılır (IDENTITY/INTEGER PRIMARY KEY değerleri 1'den
+başlar ve FK'ler bu sıraya göre üretilir).
+
+Kullanım:
+    python benchmarks/datagen.py --sqlite bench.db --scale medium
+    python benchmarks/datagen.py --sqlite bench.db --employees 100000 --projects 10000 --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager  # noqa: E402
+from sqlite_backend import SQLiteBackend  # noqa: E402
+
+
+# Hazır ölçekler: (departman, çalışan, proje, görev)
+SCALES = {
+    'tiny': (5, 50, 20, 500),
+    'small': (10, 1000, 200, 10000),
+    'medium': (20, 10000, 2000, 100000),
+    'large': (50, 100000, 10000, 1000000),
+}
+
+PRIORITIES = ('Düşük', 'Orta', 'Yüksek')
+PROJECT_STATUSES = ('Aktif', 'Devam Ediyor', 'Planlandı', 'Tamamlandı')
+TASK_FLOW = ('Atandı', 'Devam Ediyor', 'Tamamlandı')
+ROLES = ('Ekip Üyesi', 'Geliştirici', 'Analist', 'Test Uzmanı', 'Proje Yöneticisi')
+FIRST_NAMES = ('Ahmet', 'Ayşe', 'Mehmet', 'Fatma', 'Mustafa', 'Zeynep', 'Emre', 'Elif', 'Can', 'Şule',
+               'Burak', 'Gökçe', 'İsmail', 'Özge', 'Ümit', 'Çağla', 'Hakan', 'Derya', 'Onur', 'Seda')
+LAST_NAMES = ('Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Öztürk', 'Aydın', 'Özdemir',
+              'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Koç', 'Kurt', 'Özkan', 'Şimşek')
+DEPARTMENT_NAMES = ('Yazılım', 'İnsan Kaynakları', 'Muhasebe', 'Pazarlama', 'Satış', 'Destek',
+                    'Ar-Ge', 'Kalite', 'Operasyon', 'Hukuk')
+
+
+class DataGenerator:
+    """Tohum (seed) ile tekrarlanabilir sentetik veri üreteci"""
+
+    def __init__(self, db: DatabaseManager, departments: int, employees: int, projects: int,
+                 tasks: int, members_per_project: int = 5, seed: int = 42,
+                 chunk_size: int = 10000, today: Optional[date] = None, verbose: bool = True):
+        if employees < members_per_project:
+            members_per_project = max(1, employees)
+
+        self.db = db
+        self.departments = departments
+        self.employees = employees
+        self.projects = projects
+        self.tasks = tasks
+        self.members_per_project = members_per_project
+        self.random = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.today = today or date.today()
+        self.verbose = verbose
+
+        # project_id -> üye employee_id listesi (görevler üyelere atanır)
+        self._members: Dict[int, List[int]] = {}
+        self._project_start: Dict[int, date] = {}
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """Tüm tabloları FK sırasına göre doldur, tablo başına metrikleri döndür"""
+        if self.db.execute_scalar("SELECT COUNT(*) FROM Tasks"):
+            raise RuntimeError("Veri üreteci boş bir veritabanı bekler")
+
+        results = {}
+        results['Departments'] = self._load('Departments', ['department_name'], self._departments())
+        results['Employees'] = self._load(
+            'Employees', ['FirstName', 'LastName', 'Email', 'DepartmentID', 'HireDate'], self._employees())
+        results['Projects'] = self._load(
+            'Projects', ['project_name', 'description', 'start_date', 'end_date', 'status'], self._projects())
+        results['ProjectMembers'] = self._load(
+            'ProjectMembers', ['project_id', 'employee_id', 'role', 'assigned_role', 'assigned_date'],
+            self._project_members())
+
+        # Görev, geçmiş ve bildirim satırları aynı geçişte üretilir
+        history: List[Tuple] = []
+        notifications: List[Tuple] = []
+        results['Tasks'] = self._load(
+            'Tasks', ['project_id', 'employee_id', 'task_title', 'task_description', 'priority', 'status',
+                      'start_date', 'due_date', 'assigned_role', 'assigned_date'],
+            self._tasks(history, notifications))
+        results['TaskStatusHistory'] = self._load(
+            'TaskStatusHistory', ['task_id', 'old_status', 'new_status', 'changed_at', 'changed_by'],
+            iter(history))
+        history.clear()
+        results['Notifications'] = self._load(
+            'Notifications', ['task_id', 'user_id', 'message', 'notification_type', 'is_read', 'created_at'],
+            iter(notifications))
+        return results
+
+    def _load(self, table: str, columns: List[str], rows: Iterator[Tuple]) -> Dict[str, float]:
+        stats = self.db.bulk_load(table, columns, rows, chunk_size=self.chunk_size)
+        if self.verbose:
+            print(f"  {table:<18} {stats['rows']:>10} satır  {stats['elapsed']:7.2f} sn  "
+                  f"{stats['rows_per_sec']:>10.0f} satır/sn")
+        return {'rows': stats['rows'], 'elapsed': stats['elapsed']}
+
+    def _departments(self) -> Iterator[Tuple]:
+        for i in range(self.departments):
+            name = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+            yield (name if i < len(DEPARTMENT_NAMES) else f"{name} {i // len(DEPARTMENT_NAMES) + 1}",)
+
+    def _employees(self) -> Iterator[Tuple]:
+        rnd = self.random
+        for i in range(1, self.employees + 1):
+            first = rnd.choice(FIRST_NAMES)
+            last = rnd.choice(LAST_NAMES)
+            hire = self.today - timedelta(days=rnd.randint(30, 3650))
+            # Email UNIQUE: sıra numarası eklenir
+            yield (first, last, f"calisan{i}@example.com", rnd.randint(1, self.departments), hire)
+
+    def _projects(self) -> Iterator[Tuple]:
+        rnd = self.random
+        for project_id in range(1, self.projects + 1):
+            start = self.today - timedelta(days=rnd.randint(0, 730))
+            end = start + timedelta(days=rnd.randint(30, 365)) if rnd.random() < 0.8 else None
+            self._project_start[project_id] = start
+            yield (f"Proje {project_id}", f"Sentetik proje #{project_id}", start, end,
+                   rnd.choice(PROJECT_STATUSES))
+
+    def _project_members(self) -> Iterator[Tuple]:
+        rnd = self.random
+        for project_id in range(1, self.projects + 1):
+            members = rnd.sample(range(1, self.employees + 1), self.members_per_project)
+            self._members[project_id] = members
+            start = self._project_start[project_id]
+            for employee_id in members:
+                role = rnd.choice(ROLES)
+                yield (project_id, employee_id, role, role, start)
+
+    def _tasks(self, history: List[Tuple], notifications: List[Tuple]) -> Iterator[Tuple]:
+        rnd = self.random
+        for task_id in range(1, self.tasks + 1):
+            project_id = rnd.randint(1, self.projects)
+            employee_id = rnd.choice(self._members[project_id])
+            start = self._project_start[project_id] + timedelta(days=rnd.randint(0, 60))
+            due = start + timedelta(days=rnd.randint(1, 90))
+            steps = rnd.choices((1, 2, 3), weights=(3, 4, 3))[0]
+            status = TASK_FLOW[steps - 1]
+
+            # Durum geçmişi: Atandı -> ... -> son durum, zaman sırasıyla
+            changed_at = datetime.combine(start, datetime.min.time()) + timedelta(hours=9)
+            old_status = None
+            for new_status in TASK_FLOW[:steps]:
+                history.append((task_id, old_status, new_status, changed_at, employee_id))
+                old_status = new_status
+                changed_at += timedelta(days=rnd.randint(1, 10), hours=rnd.randint(0, 8))
+
+            if status == 'Tamamlandı':
+                notifications.append((task_id, employee_id, f"Görev tamamlandı: Görev {task_id}",
+                                      'Görev Tamamlandı', rnd.random() < 0.7, changed_at))
+            elif due < self.today:
+                notifications.append((task_id, employee_id, f"Görev gecikti: Görev {task_id}",
+                                      'Gecikme', rnd.random() < 0.3,
+                                      datetime.combine(due, datetime.min.time()) + timedelta(days=1)))
+
+            yield (project_id, employee_id, f"Görev {task_id}", f"Sentetik görev #{task_id}",
+                   rnd.choice(PRIORITIES), status, start, due, rnd.choice(ROLES), start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sqlite', required=True, help="SQLite veritabanı dosyası")
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--departments', type=int)
+    parser.add_argument('--employees', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    departments, employees, projects, tasks = SCALES[args.scale]
+    db = DatabaseManager(backend=SQLiteBackend(args.sqlite))
+
+    started = time.perf_counter()
+    DataGenerator(
+        db,
+        departments=args.departments or departments,
+        employees=args.employees or employees,
+        projects=args.projects or projects,
+        tasks=args.tasks or tasks,
+        seed=args.seed,
+        chunk_size=args.chunk_size
+    ).run()
+    print(f"Toplam: {time.perf_counter() - started:.1f} sn")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
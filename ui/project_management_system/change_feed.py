@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pagination import KeysetPaginator
+
+
+class ChangeFeedError(ValueError):
+    """Geçersiz since/tables/limit parametresi verildiğinde fırlatılır"""
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class ChangeFeed:
+    """
+    ChangeLog tablosundan (migration 007) artımlı değişiklik akışı
+
+    İstemci son aldığı token'ı (change_id) gönderir; o noktadan sonra
+    eklenen/güncellenen satırların güncel hali ve silinen satırların id'leri
+    döner. Aynı satırdaki birden fazla değişiklik tek kayda indirgenir. Satırlar
+    liste API'leriyle aynı sorgudan (paginator'ın source/columns'u) okunur,
+    böylece istemci aynı render fonksiyonuyla tablosunu yamayabilir.
+
+    IDENTITY değerleri commit sırasından önce dağıtıldığından, henüz commit
+    edilmemiş bir transaction'ın bıraktığı boşluktan sonraki değişiklikler
+    settle süresi dolana kadar gönderilmez; aksi halde o değişiklik token'ın
+    gerisinde kalıp kaybolurdu.
+    """
+
+    def __init__(self, db, sources: Dict[str, Tuple[str, KeysetPaginator]],
+                 default_limit: int = 1000, max_limit: int = 5000, settle: float = 5.0):
+        """
+        Args:
+            db: DatabaseManager örneği
+            sources: API adı -> (ChangeLog.table_name, satırları okuyan paginator)
+            default_limit: Bir çağrıda okunacak en fazla günlük satırı
+            max_limit: limit parametresinin üst sınırı
+            settle: Boşluk sonrası değişikliklerin bekletileceği süre (saniye)
+        """
+        self.db = db
+        self.sources = sources
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.settle = timedelta(seconds=settle)
+
+    def current_token(self) -> str:
+        """Sayfa ilk yüklenirken istemciye verilen başlangıç token'ı"""
+        return str(self.db.execute_scalar("SELECT ISNULL(MAX(change_id), 0) FROM ChangeLog"))
+
+    def changes_since(self, since: Optional[str], tables: Optional[Iterable[str]] = None,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        since token'ından sonraki değişiklikler
+
+        Returns:
+            changes (API adı -> upserted satırlar ve deleted id'ler), next token,
+            has_more; günlük since'ten sonrasını artık tutmuyorsa reset=True
+        """
+        names = list(tables) if tables else list(self.sources)
+        unknown = [name for name in names if name not in self.sources]
+        if unknown:
+            raise ChangeFeedError(f"Bilinmeyen tablo: {', '.join(unknown)}")
+
+        limit = min(limit or self.default_limit, self.max_limit)
+        if limit < 1:
+            raise ChangeFeedError("limit pozitif olmalı")
+
+        if since is None or since == '':
+            return {'changes': {}, 'next': self.current_token(), 'has_more': False, 'reset': False}
+        try:
+            since_id = int(since)
+        except ValueError:
+            raise ChangeFeedError("Geçersiz since token'ı")
+
+        # Tablo filtresi Python'da uygulanır: boşluk tespiti ardışık change_id'lere dayanır
+        log, oldest = self.db.fan_out(
+            lambda: self.db.execute_query(
+                f"SELECT TOP ({limit + 1}) change_id, table_name, row_id, operation, changed_at "
+                f"FROM ChangeLog WHERE change_id > ? ORDER BY change_id", (since_id,), compact=True),
+            lambda: self.db.execute_scalar("SELECT MIN(change_id) FROM ChangeLog")
+        )
+
+        # Günlük budanmışsa aradaki değişiklikler bilinemez, istemci listeyi baştan yüklemeli
+        if oldest is not None and since_id < oldest - 1:
+            return {'changes': {}, 'next': self.current_token(), 'has_more': False, 'reset': True}
+
+        has_more = len(log) > limit
+        entries = self._settled(list(log)[:limit], since_id)
+        if len(entries) < min(len(log), limit):
+            has_more = False  # kalanlar settle süresi sonunda aynı token'la tekrar istenir
+
+        # Satır başına son işlem: silindiyse deleted, aksi halde güncel hali okunur
+        latest: Dict[Tuple[str, int], str] = {}
+        for entry in entries:
+            latest[(entry['table_name'], entry['row_id'])] = entry['operation']
+
+        changes = {}
+        fetches = []
+        for name in names:
+            table = self.sources[name][0]
+            deleted = [row_id for (t, row_id), op in latest.items() if t == table and op == 'D']
+            upserted = [row_id for (t, row_id), op in latest.items() if t == table and op != 'D']
+            changes[name] = {'upserted': [], 'deleted': deleted}
+            if upserted:
+                fetches.append((name, upserted))
+
+        results = self.db.fan_out(*[
+            (lambda name=name, ids=ids: self._fetch_rows(name, ids)) for name, ids in fetches])
+        for (name, _), rows in zip(fetches, results):
+            changes[name]['upserted'] = rows
+
+        return {
+            'changes': changes,
+            'next': str(entries[-1]['change_id']) if entries else str(since_id),
+            'has_more': has_more,
+            'reset': False,
+        }
+
+    def _settled(self, entries: List, since_id: int) -> List:
+        """Commit edilmemiş olabilecek bir boşluğa kadar olan kayıtları döndür"""
+        horizon = datetime.now() - self.settle
+        expected = since_id + 1
+        for i, entry in enumerate(entries):
+            if entry['change_id'] != expected and _as_datetime(entry['changed_at']) > horizon:
+                return entries[:i]
+            expected = entry['change_id'] + 1
+        return entries
+
+    def _fetch_rows(self, name: str, ids: List[int]) -> List[Dict[str, Any]]:
+        paginator = self.sources[name][1]
+        key_expr = paginator.key[0]
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(self.db.execute_query(
+                f"SELECT {paginator.columns} FROM {paginator.source} "
+                f"WHERE {key_expr} IN ({', '.join('?' for _ in chunk)})", tuple(chunk)))
+        return rows
@@ -0,0 +1,297 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PoolTimeoutError(Exception):
+    """Havuzdaki tüm bağlantılar kullanımdayken bekleme süresi aşıldığında fırlatılır"""
+
+
+class _PooledConnection:
+    """Havuzdaki bir bağlantı ve yaş/kullanım bilgileri"""
+
+    __slots__ = ('raw', 'created_at', 'last_used_at')
+
+    def __init__(self, raw: Any):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+    """
+    Thread-safe veritabanı bağlantı havuzu
+
+    Bağlantılar her sorguda açılıp kapatılmak yerine havuzda tutulur ve
+    tekrar kullanılır. Böylece TCP/TLS/login el sıkışmaları yalnızca yeni
+    bağlantı açıldığında ödenir.
+    """
+
+    def __init__(self, creator: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 timeout: float = 30.0, recycle: Optional[float] = 1800,
+                 idle_timeout: Optional[float] = 600, health_check_interval: float = 5.0,
+                 health_check_query: str = "SELECT 1"):
+        """
+        Havuzu oluştur (bağlantılar ilk kullanımda açılır)
+
+        Args:
+            creator: Yeni bir DB-API bağlantısı döndüren fonksiyon
+            min_size: İlk kullanımda açılan ve boşta tutulan en az bağlantı sayısı
+            max_size: Aynı anda açık olabilecek en fazla bağlantı sayısı
+            timeout: Havuz doluyken bağlantı için beklenecek süre (saniye)
+            recycle: Bu yaştan (saniye) büyük bağlantılar kapatılıp yenilenir (None ise kapalı)
+            idle_timeout: min_size üstündeki bağlantılar bu kadar boşta kalırsa kapatılır
+            health_check_interval: Bu süreden uzun boşta kalan bağlantı verilmeden önce test edilir
+            health_check_query: Sağlık kontrolü için çalıştırılan sorgu
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Geçersiz havuz boyutu: 0 <= min_size <= max_size ve max_size >= 1 olmalı")
+
+        self._creator = creator
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_query = health_check_query
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._warmed_up = False
+        self._closed = False
+
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'closed': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Bağlantı alma / bırakma
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Havuzdan bağlantı al
+
+        Args:
+            timeout: Bekleme süresi (None ise havuzun varsayılanı)
+
+        Returns:
+            DB-API bağlantısı
+
+        Raises:
+            PoolTimeoutError: Süre içinde boş bağlantı bulunamazsa
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+
+        if not self._warmed_up:
+            self._warm_up()
+
+        while True:
+            pooled = None
+            with self._available:
+                if self._closed:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı")
+
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"{timeout} saniye içinde boş bağlantı bulunamadı "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._available.wait(remaining)
+
+                if self._idle:
+                    # En son kullanılan bağlantıyı al (LIFO) - sıcak kalır
+                    pooled = self._idle.pop()
+                else:
+                    # Yeni bağlantı için yer ayır, bağlantıyı kilit dışında aç
+                    self._size += 1
+
+            if pooled is None:
+                pooled = self._open_reserved()
+            elif not self._is_usable(pooled):
+                self._discard(pooled)
+                continue
+
+            with self._lock:
+                self._in_use[id(pooled.raw)] = pooled
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += time.monotonic() - started
+            return pooled.raw
+
+    def release(self, conn: Any, discard: bool = False):
+        """
+        Bağlantıyı havuza geri bırak
+
+        Args:
+            conn: acquire() ile alınan bağlantı
+            discard: True ise bağlantı havuza dönmez, kapatılır
+        """
+        with self._lock:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            return
+
+        if not discard:
+            try:
+                # Açık kalan transaction'ı temizle
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._closed or self._is_expired(pooled):
+            if not discard and not self._closed:
+                with self._lock:
+                    self._stats['recycled'] += 1
+            self._discard(pooled)
+            return
+
+        pooled.last_used_at = time.monotonic()
+        with self._available:
+            self._idle.append(pooled)
+            self._trim_idle()
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        with bloğu süresince havuzdan bağlantı kullan
+
+        Örnek:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapat, kullanımdakileri bırakıldıklarında kapat"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Havuz istatistiklerini döndür
+
+        Returns:
+            Boyut, boşta/kullanımda bağlantı sayıları ve sayaçlar
+        """
+        with self._lock:
+            result = dict(self._stats)
+            result.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        return result
+
+    # ------------------------------------------------------------------
+    # Yardımcılar
+    # ------------------------------------------------------------------
+    def _warm_up(self):
+        """İlk kullanımda min_size kadar bağlantı aç"""
+        with self._lock:
+            if self._warmed_up:
+                return
+            self._warmed_up = True
+
+        for _ in range(self.min_size):
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            pooled = self._open_reserved()
+            with self._available:
+                self._idle.append(pooled)
+                self._available.notify()
+
+    def _open_reserved(self) -> _PooledConnection:
+        """Yeri önceden ayrılmış (size sayılmış) yeni bağlantı aç"""
+        try:
+            raw = self._creator()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._stats['created'] += 1
+        return _PooledConnection(raw)
+
+    def _discard(self, pooled: _PooledConnection):
+        """Bağlantıyı kapat ve havuzdan düş"""
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+        with self._available:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._available.notify()
+
+    def _is_expired(self, pooled: _PooledConnection) -> bool:
+        return self.recycle is not None and time.monotonic() - pooled.created_at > self.recycle
+
+    def _is_usable(self, pooled: _PooledConnection) -> bool:
+        """Yaş ve sağlık kontrolü (kısa süre önce kullanılan bağlantı test edilmez)"""
+        if self._is_expired(pooled):
+            with self._lock:
+                self._stats['recycled'] += 1
+            return False
+
+        if time.monotonic() - pooled.last_used_at < self.health_check_interval:
+            return True
+
+        try:
+            cursor = pooled.raw.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def _trim_idle(self):
+        """min_size üstündeki uzun süre boşta kalmış bağlantıları kapat (kilit tutulurken çağrılır)"""
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        expired = [p for p in self._idle if now - p.last_used_at > self.idle_timeout]
+        for pooled in expired:
+            if self._size <= self.min_size:
+                break
+            self._idle.remove(pooled)
+            try:
+                pooled.raw.close()
+            except Exception:
+                pass
+            self._size -= 1
+            self._stats['closed'] += 1
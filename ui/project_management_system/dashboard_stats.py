@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# Sayaçlar ve dashboard listeleri tek batch içinde, tek round trip ile alınır
+DASHBOARD_BATCH_QUERY = """
+    SET NOCOUNT ON;
+
+    SELECT
+        (SELECT COUNT(*) FROM Projects) AS total_projects,
+        (SELECT COUNT(*) FROM Tasks WHERE status != 'Tamamlandı') AS active_tasks,
+        (SELECT COUNT(*) FROM Tasks WHERE status = 'Tamamlandı') AS completed_tasks,
+        (SELECT COUNT(*) FROM Employees) AS total_employees;
+
+    SELECT * FROM vw_UpcomingDeadlines ORDER BY DaysLeft;
+
+    SELECT * FROM vw_DepartmentTaskCount ORDER BY TotalTasks DESC;
+"""
+
+# Batch'in (view'lar dahil) okuduğu tablolar: yalnızca bunlara yazılınca önbellek boşaltılır
+DASHBOARD_TABLES = frozenset({'Projects', 'Tasks', 'Employees', 'Departments'})
+
+
+class DashboardStatsService:
+    """
+    Dashboard istatistikleri için önbellekli servis
+
+    Tüm kullanıcılar aynı veriyi gördüğü için sonuç kısa bir süre (TTL)
+    process içinde tutulur. DASHBOARD_TABLES'taki tablolara yazma
+    yapıldığında invalidate_tables() ile önbellek boşaltılır.
+    """
+
+    def __init__(self, db, ttl: float = 30.0):
+        """
+        Servisi oluştur
+
+        Args:
+            db: DatabaseManager örneği
+            ttl: Önbellekteki verinin geçerlilik süresi (saniye)
+        """
+        self.db = db
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Geçerli dashboard verisini döndür (gerekirse veritabanından yenile)
+
+        Returns:
+            stats, upcoming, dept_tasks ve generated_at alanlarını içeren dictionary
+        """
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() < self._expires_at:
+                return self._snapshot
+
+        # Aynı anda süresi dolan isteklerin hepsi sorgu atmasın, biri yenilesin
+        with self._refresh_lock:
+            with self._lock:
+                if self._snapshot is not None and time.monotonic() < self._expires_at:
+                    return self._snapshot
+                generation = self._generation
+
+            snapshot = self._load()
+
+            with self._lock:
+                # Yükleme sırasında invalidate() çağrıldıysa eski veriyi önbelleğe yazma
+                if generation == self._generation:
+                    self._snapshot = snapshot
+                    self._expires_at = time.monotonic() + self.ttl
+            return snapshot
+
+    def invalidate(self):
+        """Önbelleği boşalt (bir sonraki istek veritabanından okur)"""
+        with self._lock:
+            self._snapshot = None
+            self._expires_at = 0.0
+            self._generation += 1
+
+    def invalidate_tables(self, tables) -> bool:
+        """
+        Yazılan tablolardan biri dashboard'da okunuyorsa önbelleği boşalt
+
+        Returns:
+            Önbellek boşaltıldıysa True
+        """
+        if DASHBOARD_TABLES.isdisjoint(tables):
+            return False
+        self.invalidate()
+        return True
+
+    def _load(self) -> Dict[str, Any]:
+        """Sayaçları ve listeleri tek batch sorgu ile oku"""
+        counters, upcoming, dept_tasks = self.db.execute_batch(DASHBOARD_BATCH_QUERY)
+        stats = counters[0] if counters else {
+            'total_projects': 0,
+            'active_tasks': 0,
+            'completed_tasks': 0,
+            'total_employees': 0
+        }
+
+        return {
+            'stats': stats,
+            'upcoming': upcoming,
+            'dept_tasks': dept_tasks,
+            'generated_at': datetime.now()
+        }
@@ -0,0 +1,107 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from migrations import DATA_VERSION_TABLES
+from query_cache import DEPENDENCIES
+
+# View'lar ve özet tablolar query_cache.DEPENDENCIES ile sürümü tutulan tablolara çözülür
+_VERSIONED = {table.lower(): table for table in DATA_VERSION_TABLES}
+
+
+def base_tables(names: Iterable[str]) -> Tuple[str, ...]:
+    """Tablo/view adlarını sürümü tutulan tablolara çöz"""
+    tables = set()
+    for name in names:
+        name = name.lower()
+        for table in (name,) + DEPENDENCIES.get(name, ()):
+            if table in _VERSIONED:
+                tables.add(_VERSIONED[table])
+            elif table not in DEPENDENCIES:
+                raise ValueError(f"Sürümü tutulmayan tablo: {name}")
+    return tuple(sorted(tables))
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+class DataVersions:
+    """
+    DataVersions tablosundan (migration 008) koşullu GET doğrulayıcıları
+
+    Her tabloya yapılan yazma, trigger ile o tablonun sürüm sayacını artırır.
+    Bir cevabın ETag'i okuduğu tabloların sürümlerinden ve cevabı belirleyen
+    diğer değerlerden (URL, kullanıcı, uygulama sürümü) üretilir; payload'ı
+    hash'lemek için sorguyu çalıştırmak gerekmez, tek küçük sorgu yeterlidir.
+
+    Sürümler sorgudan önce okunmalıdır: arada yapılan bir yazma cevabı eski
+    ETag ile yeni veri olarak işaretler, bir sonraki istek yine 200 alır.
+    """
+
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager örneği
+        """
+        self.db = db
+
+    def read(self) -> Dict[str, Any]:
+        """Tablo adı -> DataVersions satırı (version, updated_at)"""
+        rows = self.db.execute_query("SELECT table_name, version, updated_at FROM DataVersions")
+        return {row['table_name']: row for row in rows}
+
+    def stamp(self, names: Iterable[str], versions: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, ...]]:
+        """
+        Okunan tablo/view'ların sürümleri (QueryCache kayıt damgası)
+
+        Args:
+            names: Sorgunun okuduğu tablo ve view adları
+            versions: read() sonucu (None ise okunur)
+
+        Returns:
+            Sürüm tuple'ı; sürümü tutulmayan bir tablo varsa None
+        """
+        try:
+            tables = base_tables(names)
+        except ValueError:
+            return None
+        versions = self.read() if versions is None else versions
+        if any(table not in versions for table in tables):
+            return None
+        return tuple(versions[table]['version'] for table in tables)
+
+    def validator(self, tables: Tuple[str, ...], *parts: Any,
+                  versions: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[datetime]]:
+        """
+        (ETag, Last-Modified) ikilisi
+
+        Args:
+            tables: base_tables() ile çözülmüş tablo adları
+            parts: ETag'e katılan diğer değerler
+            versions: read() sonucu (None ise okunur)
+
+        Returns:
+            Tırnaksız ETag ve UTC Last-Modified; tablolardan birinin sürümü yoksa
+            ikisi de None, son yazma bir saniyeden yeniyse Last-Modified None
+            döner (saniye hassasiyetinde güvenilir değildir)
+        """
+        versions = self.read() if versions is None else versions
+
+        key = [str(part) for part in parts]
+        last_modified = None
+        for table in tables:
+            row = versions.get(table)
+            if row is None:
+                return None, None  # sürümü bilinmeyen veri doğrulanamaz
+            key.append(f"{table}:{row['version']}")
+            updated_at = _as_datetime(row['updated_at'])
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+
+        etag = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:24]
+        if last_modified is not None and datetime.now(timezone.utc) - last_modified < timedelta(seconds=1):
+            last_modified = None
+        return etag, last_modified
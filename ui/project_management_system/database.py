@@ -1,12 +1,39 @@
-import pyodbc
-import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+import contextvars
+import csv
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Callable, Iterator, Union, Iterable, Sequence
+
+from backends import DB_ERRORS, Backend, SqlServerBackend
+from connection_pool import ConnectionPool
+from query_cache import PROCEDURE_WRITES, QueryCache, tables_in
+from query_metrics import QueryMetrics, estimate_bytes
+from replicas import Replica, ReplicaSet
+from rows import ResultSet
+
+if TYPE_CHECKING:
+    # pandas yalnızca DataFrame metotlarında import edilir (açılış süresi ve worker belleği)
+    import pandas as pd
 
 
 class DatabaseManager:
-    """SQL Server veritabanı yönetim sınıfı"""
-
-    def __init__(self, server: str, database: str, username: str = None, password: str = None):
+    """SQL Server (veya SQLite gibi takılabilir backend) veritabanı yönetim sınıfı"""
+
+    def __init__(self, server: str = None, database: str = None, username: str = None, password: str = None,
+                 pool_min_size: int = 1, pool_max_size: int = 10, pool_timeout: float = 30.0,
+                 pool_recycle: Optional[float] = 1800,
+                 connection_factory: Optional[Callable[[], Any]] = None,
+                 metrics: Optional[QueryMetrics] = None,
+                 backend: Optional[Backend] = None,
+                 fan_out_workers: int = 4,
+                 query_cache: Optional[QueryCache] = None,
+                 replicas: Optional[Sequence[Backend]] = None,
+                 replica_max_lag: float = 5.0,
+                 replica_check_interval: float = 1.0,
+                 sticky_window: float = 5.0):
         """
         Veritabanı bağlantısını başlat
 
@@ -15,59 +42,353 @@ class DatabaseManager:
             database: Veritabanı adı
             username: Kullanıcı adı (None ise Windows Authentication)
             password: Şifre
+            pool_min_size: Havuzda hazır tutulacak en az bağlantı sayısı
+            pool_max_size: Havuzdaki en fazla bağlantı sayısı
+            pool_timeout: Havuz doluyken bağlantı bekleme süresi (saniye)
+            pool_recycle: Bağlantıların yenileneceği yaş (saniye, None ise yenilenmez)
+            connection_factory: pyodbc yerine kullanılacak bağlantı fonksiyonu
+                (örn: test için sqlite3 tabanlı sahte sürücü)
+            metrics: Sorgu ölçümlerinin toplanacağı QueryMetrics (None ise yenisi oluşturulur)
+            backend: Bağlantıları açacak backend (None ise server/database ile SQL Server,
+                örn: SQLiteBackend('bench.db') ile yerel SQLite)
+            fan_out_workers: fan_out() için ortak thread havuzunun boyutu
+            query_cache: execute_query(cache=True) sonuçlarının tutulacağı önbellek
+                (None ise önbellek kapalı, cache=True yok sayılır)
+            replicas: Okuma endpoint'leri; verilirse execute_query, execute_scalar,
+                iter_query ve get_dataframe sağlıklı bir replikaya yönlenir,
+                yazmalar ve execute_batch primary'de kalır
+            replica_max_lag: Bu kadar saniyeden fazla geride kalan replika okuma almaz
+            replica_check_interval: Replika sağlık kontrolleri arasındaki süre (saniye)
+            sticky_window: Yazmadan sonra okumaların primary'de kalacağı süre (saniye,
+                read-your-writes; bkz. pin_reads/last_write)
         """
         self.server = server
         self.database = database
         self.username = username
         self.password = password
-        self.connection = None
+        self.connection_factory = connection_factory
+        self.backend = backend or SqlServerBackend(server, database, username, password)
+        self._local = threading.local()
+
+        # Her round trip'in süresi, satır ve bayt sayısı burada toplanır
+        self.metrics = metrics or QueryMetrics()
+
+        # Her sorguda bağlan/kopar yerine bağlantılar havuzdan kullanılır
+        self._pool_options = {
+            'min_size': pool_min_size,
+            'max_size': pool_max_size,
+            'timeout': pool_timeout,
+            'recycle': pool_recycle
+        }
+        self.pool = ConnectionPool(self._create_connection, **self._pool_options)
+
+        # Bağımsız sorguları aynı istek içinde paralel çalıştırmak için (fan_out)
+        self.fan_out_workers = fan_out_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # Sık tekrarlanan okuma sorguları için opsiyonel sonuç önbelleği;
+        # yazma metotları etkiledikleri tabloların kayıtlarını siler
+        self.cache = query_cache
+
+        # Okuma replikaları (None ise tüm sorgular primary'de). Yönlendirme durumu
+        # contextvars'ta tutulur: istek ve fan_out çağrıları kendi bağlamını taşır.
+        self.replicas = None
+        if replicas:
+            self.replicas = ReplicaSet(
+                self.pool,
+                [Replica(f'replica-{index}', backend.connect, self._pool_options)
+                 for index, backend in enumerate(replicas, 1)],
+                max_lag=replica_max_lag,
+                check_interval=replica_check_interval)
+        self._replica_backends = list(replicas or ())
+        self.sticky_window = sticky_window
+        self._pinned_replica = contextvars.ContextVar('pinned_replica', default=None)
+        self._primary_until = contextvars.ContextVar('primary_until', default=0.0)
+        self._force_primary = contextvars.ContextVar('force_primary', default=False)
+        self._last_write = contextvars.ContextVar('last_write', default=None)
+
+    @property
+    def connection(self):
+        """connect() ile bu thread'e verilmiş bağlantı (yoksa None)"""
+        return getattr(self._local, 'connection', None)
+
+    def _create_connection(self):
+        """Havuz için yeni fiziksel bağlantı aç"""
+        if self.connection_factory:
+            return self.connection_factory()
+        return self.backend.connect()
 
     def connect(self):
-        """Veritabanına bağlan"""
-        try:
-            if self.username and self.password:
-                # SQL Server Authentication
-                connection_string = (
-                    f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"UID={self.username};"
-                    f"PWD={self.password}"
-                )
-            else:
-                # Windows Authentication
-                connection_string = (
-                    f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"Trusted_Connection=yes;"
-                )
-
-            self.connection = pyodbc.connect(connection_string)
-            return self.connection
-        except pyodbc.Error as e:
-            print(f"Bağlantı hatası: {e}")
-            raise
+        """Havuzdan bağlantı al (disconnect() ile geri bırakılmalı)"""
+        if self.connection is None:
+            self._local.connection = self.pool.acquire()
+        return self.connection
 
     def disconnect(self):
-        """Veritabanı bağlantısını kapat"""
+        """Bağlantıyı havuza geri bırak"""
         if self.connection:
-            self.connection.close()
-            self.connection = None
+            self.pool.release(self.connection)
+            self._local.connection = None
+
+    def close(self):
+        """Havuzdaki tüm bağlantıları kapat"""
+        self.disconnect()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+        self.backend.close()
+        if self.replicas is not None:
+            self.replicas.close()
+            for backend in self._replica_backends:
+                backend.close()
+
+    def after_fork(self):
+        """
+        fork() ile oluşan child process'te havuzu ve fan_out thread'lerini yeniden kur
+
+        Parent'tan kopyalanan bağlantılar kapatılmaz (kapatmak parent'ın
+        bağlantısını da bozabilir), yalnızca bırakılır; child kendi
+        bağlantılarını ilk sorguda açar. Thread'ler fork'ta kopyalanmadığı
+        için executor da yeniden oluşturulur.
+        """
+        self._inherited = (self.pool, self._local)
+        self._local = threading.local()
+        self.pool = ConnectionPool(self._create_connection, **self._pool_options)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        if self.replicas is not None:
+            self.replicas.primary = self.pool
+            self.replicas.after_fork()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Bağlantı havuzu istatistiklerini döndür
+
+        Returns:
+            Boyut, boşta/kullanımda bağlantı ve sayaç bilgileri
+        """
+        return self.pool.stats()
+
+    def replica_stats(self) -> Optional[Dict[str, Any]]:
+        """Replika sağlık/gecikme/okuma bilgileri (replika yoksa None)"""
+        return self.replicas.stats() if self.replicas is not None else None
+
+    # ------------------------------------------------------------------
+    # Okuma yönlendirme (primary / replikalar)
+    # ------------------------------------------------------------------
+    def pin_reads(self, last_write: Optional[float] = None):
+        """
+        Yeni bir istek için yönlendirme durumunu sıfırla
+
+        Args:
+            last_write: Bu oturumun son yazma zamanı (time.time(), örn. oturum
+                çerezinden); sticky_window dolana kadar okumalar primary'ye gider
+        """
+        self._pinned_replica.set(None)
+        self._last_write.set(None)
+        self._primary_until.set(last_write + self.sticky_window if last_write else 0.0)
+
+    def last_write(self) -> Optional[float]:
+        """Bu bağlamda (istekte) yapılan son yazmanın zamanı (time.time(), yazma yoksa None)"""
+        return self._last_write.get()
+
+    @contextmanager
+    def primary(self):
+        """
+        Blok içindeki okumaları primary'den yap
+
+        Okuduğuna göre yazan işler (migration, saklama, bildirim taraması)
+        ve paylaşılan önbelleklere yazılan sonuçlar replikadaki eski veriyi
+        görmemelidir.
+        """
+        token = self._force_primary.set(True)
+        try:
+            yield
+        finally:
+            self._force_primary.reset(token)
+
+    def _note_write(self):
+        """Yazmadan sonra bu bağlamın okumaları sticky_window boyunca primary'ye gider"""
+        if self.replicas is not None:
+            now = time.time()
+            self._last_write.set(now)
+            self._primary_until.set(now + self.sticky_window)
+            self.replicas.note_write()
+
+    def _select_replica(self) -> Optional[Replica]:
+        """Bu bağlamın okuma replikası (primary kullanılacaksa None)"""
+        if self.replicas is None or self._force_primary.get() or time.time() < self._primary_until.get():
+            return None
+
+        # Bir istekteki okumalar aynı replikadan yapılır (replikalar farklı gecikebilir)
+        replica = self._pinned_replica.get()
+        if replica is None or not replica.healthy:
+            replica = self.replicas.choose()
+            self._pinned_replica.set(replica)
+        return replica
+
+    def _read_pool(self) -> Tuple[ConnectionPool, Optional[Replica]]:
+        """Okumanın yapılacağı havuz ve replika (primary ise None)"""
+        replica = self._select_replica()
+        if replica is None:
+            if self.replicas is not None:
+                self.replicas.primary_reads += 1
+            return self.pool, None
+        replica.reads += 1
+        return replica.pool, replica
+
+    def _replica_failed(self, replica: Replica, error: Exception):
+        """Primary'de başarılı olan okuma replikada hata vermişti: replikayı çıkar"""
+        self.replicas.eject(replica, f"{type(error).__name__}: {error}")
+        self._pinned_replica.set(None)
+
+    def _route_read(self, run: Callable[[ConnectionPool], Any]) -> Any:
+        """
+        run(pool) okumasını replikada çalıştır; replika hata verirse primary'de tekrarla
 
-    def execute_query(self, query: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
+        Primary'de de hata alınırsa sorgu hatalıdır, replika devre dışı bırakılmaz.
+        """
+        pool, replica = self._read_pool()
+        if replica is None:
+            return run(pool)
+        try:
+            return run(pool)
+        except Exception as e:
+            result = run(self.pool)
+            self._replica_failed(replica, e)
+            return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.fan_out_workers,
+                                                    thread_name_prefix='db-fan-out')
+            return self._executor
+
+    def fan_out(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Birbirinden bağımsız sorguları paralel çalıştır
+
+        Her çağrı havuzdan kendi bağlantısını alır; toplam süre sorguların
+        toplamı yerine en yavaş sorguya yaklaşır. Çağrılar çağıranın
+        contextvars bağlamında çalışır (Flask g / request erişilebilir).
+        Sınırlı thread havuzu tüm istekler arasında paylaşılır.
+
+        Args:
+            calls: Argümansız çağrılabilirler
+                (örn: lambda: db.execute_query("SELECT ...", (1,)))
+
+        Returns:
+            Sonuçlar, çağrılarla aynı sırada
+
+        Örnek:
+            project, members = db.fan_out(
+                lambda: db.execute_query("SELECT * FROM Projects WHERE project_id = ?", (pid,)),
+                lambda: db.execute_query("SELECT * FROM vw_ProjectMembersDetails WHERE project_id = ?", (pid,))
+            )
+        """
+        # Tek çağrıda ya da fan_out içinden yapılan iç içe çağrıda
+        # (havuz kilitlenmesini önlemek için) sırayla çalıştır
+        if len(calls) < 2 or getattr(self._local, 'in_fan_out', False):
+            return [call() for call in calls]
+
+        def run(call):
+            self._local.in_fan_out = True
+            try:
+                return call()
+            finally:
+                self._local.in_fan_out = False
+
+        # Çağrılar aynı replikayı okusun: seçim bağlam kopyalanmadan önce yapılır
+        self._select_replica()
+
+        executor = self._get_executor()
+        futures = [executor.submit(contextvars.copy_context().run, run, call) for call in calls]
+
+        # Hata olsa da tüm çağrıların bitmesi beklenir, ilk hata yükseltilir
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
+    def _record(self, query: str, started: float, rows: int = 0, nbytes: int = 0,
+                failed: bool = False, params: Optional[Tuple] = None):
+        """Bir round trip'in ölçümünü metrics'e bildir"""
+        self.metrics.record(query, time.perf_counter() - started, rows, nbytes, failed, params)
+
+    def _estimate_bytes(self, rows) -> int:
+        """Bayt takibi açıksa sonuç boyutunu tahmin et"""
+        return estimate_bytes(rows) if self.metrics.track_bytes else 0
+
+    def invalidate_cache(self, *tables: str):
+        """
+        Verilen tabloları okuyan önbellek kayıtlarını sil
+
+        Yazma metotları bunu kendisi çağırır; DatabaseManager dışından
+        (örn. ham bağlantı ile) yapılan yazmalardan sonra elle çağrılabilir.
+        Tablo verilmezse tüm önbellek boşaltılır.
+        """
+        if self.cache is None:
+            return
+        if tables:
+            self.cache.invalidate(*tables)
+        else:
+            self.cache.clear()
+
+    def execute_query(self, query: str, params: Optional[Tuple] = None,
+                      compact: bool = False, cache: bool = False,
+                      tables: Optional[Iterable[str]] = None) -> Union[List[Dict[str, Any]], ResultSet]:
         """
         SELECT sorgusu çalıştır ve sonuçları dictionary listesi olarak döndür
 
         Args:
             query: SQL sorgusu
             params: Sorgu parametreleri (opsiyonel)
+            compact: True ise satır başına dict yerine ResultSet döndürülür
+                (sütun adları ortak, satırlar tuple; row['col'] erişimi desteklenir)
+            cache: True ise sonuç query_cache'ten okunur / oraya yazılır
+            tables: Sorgunun bağlı olduğu tablolar (None ise SQL metninden çıkarılır)
 
         Returns:
-            Sonuç satırlarını içeren dictionary listesi
+            Sonuç satırlarını içeren dictionary listesi (compact ise ResultSet)
         """
-        conn = self.connect()
+        if cache and self.cache is not None:
+            return self._cached_query(query, params, compact, tables)
+        return self._route_read(lambda pool: self._run_query(pool, query, params, compact))
+
+    def _cached_query(self, query: str, params: Optional[Tuple], compact: bool,
+                      tables: Optional[Iterable[str]]):
+        tags = frozenset(table.lower() for table in tables) if tables is not None else tables_in(query)
+        if not tags:
+            # Bağımlılığı bilinmeyen sorgu (örn. EXEC) geçersiz kılınamaz, önbelleğe alınmaz
+            return self._route_read(lambda pool: self._run_query(pool, query, params, compact))
+
+        stamp = self.cache.stamp(tags)
+        if stamp is None:
+            # Sürümü tutulmayan tablo okuyan sorgu başka process'lerin yazmalarıyla doğrulanamaz
+            return self._route_read(lambda pool: self._run_query(pool, query, params, compact))
+
+        key = (query, tuple(params) if params else None, compact)
+        found, value = self.cache.get(key, stamp)
+        if not found:
+            # Önbellek tüm oturumlarla paylaşılır: geride kalan replikanın verisi
+            # bir yazmadan sonra TTL boyunca dağıtılmasın diye primary'den okunur
+            token = self.cache.begin(tags)
+            value = self._run_query(self.pool, query, params, compact)
+            self.cache.put(key, value, tags, token, stamp)
+
+        # Çağıranın değiştirebileceği dict'ler önbellekteki kayıtla paylaşılmaz
+        return value if compact else [dict(row) for row in value]
+
+    def _run_query(self, pool: ConnectionPool, query: str, params: Optional[Tuple], compact: bool):
+        conn = pool.acquire()
         cursor = conn.cursor()
+        started = time.perf_counter()
+        rows = []
+        failed = True
 
         try:
             if params:
@@ -77,20 +398,95 @@ class DatabaseManager:
 
             # Sütun isimlerini al
             columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+            failed = False
+
+            if compact:
+                return ResultSet(columns, rows)
 
             # Sonuçları dictionary'ye çevir
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
                 results.append(dict(zip(columns, row)))
 
             return results
 
-        except pyodbc.Error as e:
+        except DB_ERRORS as e:
             print(f"Sorgu hatası: {e}")
             raise
         finally:
             cursor.close()
-            self.disconnect()
+            pool.release(conn)
+            self._record(query, started, len(rows), self._estimate_bytes(rows), failed, params)
+
+    def iter_query(self, query: str, params: Optional[Tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        SELECT sorgusunu satır satır dolaşan generator (fetchmany ile)
+
+        Tüm sonucu belleğe almak yerine satırları batch_size'lık parçalar
+        halinde okur; bellek kullanımı sonuç boyutundan bağımsız kalır.
+        Bağlantı generator tükenene veya kapatılana kadar havuza dönmez.
+
+        Args:
+            query: SQL sorgusu
+            params: Sorgu parametreleri (opsiyonel)
+            batch_size: Her fetchmany çağrısında okunacak satır sayısı
+
+        Yields:
+            Her satır için bir dictionary
+        """
+        pool, replica = self._read_pool()
+        rows = self._iter_query(pool, query, params, batch_size)
+        if replica is None:
+            yield from rows
+            return
+
+        # Replika sorguyu çalıştıramazsa (ilk satırdan önce) primary'de tekrarlanır
+        try:
+            first = next(rows, None)
+        except Exception as e:
+            rows = self._iter_query(self.pool, query, params, batch_size)
+            first = next(rows, None)
+            self._replica_failed(replica, e)
+        if first is not None:
+            yield first
+            yield from rows
+
+    def _iter_query(self, pool: ConnectionPool, query: str, params: Optional[Tuple],
+                    batch_size: int) -> Iterator[Dict[str, Any]]:
+        conn = pool.acquire()
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        row_count = nbytes = 0
+        failed = True
+
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            columns = [column[0] for column in cursor.description]
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                nbytes += self._estimate_bytes(rows)
+                for row in rows:
+                    yield dict(zip(columns, row))
+
+            failed = False
+
+        except DB_ERRORS as e:
+            print(f"Sorgu hatası: {e}")
+            raise
+        finally:
+            cursor.close()
+            pool.release(conn)
+            self._record(query, started, row_count, nbytes, failed, params)
 
     def execute_scalar(self, query: str, params: Optional[Tuple] = None) -> Any:
         """
@@ -103,8 +499,13 @@ class DatabaseManager:
         Returns:
             Tek bir değer
         """
-        conn = self.connect()
+        return self._route_read(lambda pool: self._run_scalar(pool, query, params))
+
+    def _run_scalar(self, pool: ConnectionPool, query: str, params: Optional[Tuple]) -> Any:
+        conn = pool.acquire()
         cursor = conn.cursor()
+        started = time.perf_counter()
+        failed = True
 
         try:
             if params:
@@ -113,14 +514,62 @@ class DatabaseManager:
                 cursor.execute(query)
 
             result = cursor.fetchone()
+            failed = False
             return result[0] if result else None
 
-        except pyodbc.Error as e:
+        except DB_ERRORS as e:
             print(f"Sorgu hatası: {e}")
             raise
         finally:
             cursor.close()
-            self.disconnect()
+            pool.release(conn)
+            self._record(query, started, 0 if failed else 1, 0, failed, params)
+
+    def execute_batch(self, query: str, params: Optional[Tuple] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla SELECT içeren batch'i tek round trip ile çalıştır
+
+        Args:
+            query: Birden fazla sonuç kümesi döndüren SQL batch'i
+            params: Sorgu parametreleri (opsiyonel)
+
+        Returns:
+            Her sonuç kümesi için bir dictionary listesi
+        """
+        conn = self.pool.acquire()
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        row_count = nbytes = 0
+        failed = True
+
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            result_sets = []
+            while True:
+                # Satır döndürmeyen ifadeler (SET NOCOUNT vb.) atlanır
+                if cursor.description:
+                    columns = [column[0] for column in cursor.description]
+                    rows = cursor.fetchall()
+                    row_count += len(rows)
+                    nbytes += self._estimate_bytes(rows)
+                    result_sets.append([dict(zip(columns, row)) for row in rows])
+                if not cursor.nextset():
+                    break
+
+            failed = False
+            return result_sets
+
+        except DB_ERRORS as e:
+            print(f"Sorgu hatası: {e}")
+            raise
+        finally:
+            cursor.close()
+            self.pool.release(conn)
+            self._record(query, started, row_count, nbytes, failed, params)
 
     def execute_update(self, query: str, params: Optional[Tuple] = None) -> int:
         """
@@ -133,8 +582,11 @@ class DatabaseManager:
         Returns:
             Etkilenen satır sayısı
         """
-        conn = self.connect()
+        conn = self.pool.acquire()
         cursor = conn.cursor()
+        started = time.perf_counter()
+        affected = 0
+        failed = True
 
         try:
             if params:
@@ -142,46 +594,75 @@ class DatabaseManager:
             else:
                 cursor.execute(query)
 
+            # Etkilenen satır ilk ifadenin sayısıdır; batch'teki sonraki ifadeler de
+            # aynı transaction'da çalıştırılır (SQLite backend'i onları nextset'te çalıştırır)
+            affected = cursor.rowcount
+            while cursor.nextset():
+                pass
+
             conn.commit()
-            return cursor.rowcount
+            failed = False
+            self._note_write()
+            self.invalidate_cache(*tables_in(query))
+            return affected
 
-        except pyodbc.Error as e:
+        except DB_ERRORS as e:
             conn.rollback()
             print(f"Güncelleme hatası: {e}")
             raise
         finally:
             cursor.close()
-            self.disconnect()
-
-    def execute_procedure(self, proc_name: str, params: Optional[Tuple] = None):
-        conn = self.connect()
+            self.pool.release(conn)
+            self._record(query, started, affected, 0, failed, params)
+
+    def _invalidate_procedure(self, proc_name: str):
+        """Prosedürün yazdığı tabloların önbellek kayıtlarını sil (bilinmeyen prosedürde hepsini)"""
+        tables = PROCEDURE_WRITES.get(proc_name.lower())
+        if tables is None:
+            self.invalidate_cache()
+        elif tables:
+            self.invalidate_cache(*tables)
+
+    def execute_procedure(self, proc_name: str, params: Optional[Tuple] = None, compact: bool = False):
+        conn = self.pool.acquire()
         cursor = conn.cursor()
+        started = time.perf_counter()
+        query = f"EXEC {proc_name}"
+        rows = []
+        failed = True
         try:
             if params:
                 placeholders = ', '.join(['?' for _ in params])
                 query = f"EXEC {proc_name} {placeholders}"
                 cursor.execute(query, params)
             else:
-                cursor.execute(f"EXEC {proc_name}")
+                cursor.execute(query)
 
             results = []
             if cursor.description:  # SELECT dönen SP'ler için
                 columns = [column[0] for column in cursor.description]
                 rows = cursor.fetchall()
-                results = [dict(zip(columns, row)) for row in rows]
+                if compact:
+                    results = ResultSet(columns, rows)
+                else:
+                    results = [dict(zip(columns, row)) for row in rows]
 
             conn.commit()  # ✅ FETCH'TEN SONRA
+            failed = False
+            self._note_write()
+            self._invalidate_procedure(proc_name)
 
             return results
 
-        except pyodbc.Error as e:
+        except DB_ERRORS as e:
             conn.rollback()
             print(f"Prosedür hatası: {e}")
             raise
 
         finally:
             cursor.close()
-            self.disconnect()
+            self.pool.release(conn)
+            self._record(query, started, len(rows), self._estimate_bytes(rows), failed, params)
 
     # def execute_procedure(self, proc_name: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
     #     """
@@ -217,7 +698,7 @@ class DatabaseManager:
     #             conn.commit()
     #             return []
     #
-    #     except pyodbc.Error as e:
+    #     except DB_ERRORS as e:
     #         conn.rollback()
     #         print(f"Prosedür hatası: {e}")
     #         raise
@@ -244,7 +725,7 @@ class DatabaseManager:
     #             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
     #             return results
     #         return []
-    #     except pyodbc.Error as e:
+    #     except DB_ERRORS as e:
     #         conn.rollback()  # Hata varsa geri al
     #         print(f"Prosedür hatası: {e}")
     #         raise
@@ -256,7 +737,7 @@ class DatabaseManager:
 
 
 
-    def get_dataframe(self, query: str, params: Optional[Tuple] = None) -> pd.DataFrame:
+    def get_dataframe(self, query: str, params: Optional[Tuple] = None) -> 'pd.DataFrame':
         """
         Sorgu sonucunu pandas DataFrame olarak döndür
 
@@ -267,7 +748,15 @@ class DatabaseManager:
         Returns:
             Pandas DataFrame
         """
-        conn = self.connect()
+        return self._route_read(lambda pool: self._run_dataframe(pool, query, params))
+
+    def _run_dataframe(self, pool: ConnectionPool, query: str, params: Optional[Tuple]) -> 'pd.DataFrame':
+        import pandas as pd
+
+        conn = pool.acquire()
+        started = time.perf_counter()
+        row_count = nbytes = 0
+        failed = True
 
         try:
             if params:
@@ -275,54 +764,193 @@ class DatabaseManager:
             else:
                 df = pd.read_sql(query, conn)
 
+            row_count = len(df)
+            if self.metrics.track_bytes:
+                nbytes = int(df.memory_usage(deep=False).sum())
+            failed = False
             return df
 
         except Exception as e:
             print(f"DataFrame oluşturma hatası: {e}")
             raise
         finally:
-            self.disconnect()
+            pool.release(conn)
+            self._record(query, started, row_count, nbytes, failed, params)
 
-    def bulk_insert(self, table_name: str, data: List[Dict[str, Any]]) -> int:
+    def bulk_insert(self, table_name: str, data: Iterable[Dict[str, Any]],
+                    chunk_size: Optional[int] = None, fast_executemany: bool = True) -> int:
         """
         Toplu veri ekleme (daha hızlı)
 
         Args:
             table_name: Tablo adı
-            data: Eklenecek veriler (dictionary listesi)
+            data: Eklenecek veriler (dictionary listesi veya iterator)
+            chunk_size: Verilirse her bu kadar satırda bir commit yapılır
+                (None ise tüm veri tek transaction'da eklenir)
+            fast_executemany: pyodbc'nin parametre dizisini tek seferde gönderen modu
 
         Returns:
             Eklenen satır sayısı
         """
-        if not data:
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
             return 0
 
-        conn = self.connect()
-        cursor = conn.cursor()
+        # İlk satırdan sütun isimlerini al
+        columns = list(first.keys())
+        values = (tuple(row[col] for col in columns) for row in itertools.chain([first], rows))
 
-        try:
-            # İlk satırdan sütun isimlerini al
-            columns = list(data[0].keys())
-            placeholders = ', '.join(['?' for _ in columns])
-            column_names = ', '.join(columns)
+        result = self.bulk_load(table_name, columns, values, chunk_size=chunk_size,
+                                fast_executemany=fast_executemany)
+        return result['rows']
 
-            query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
+    def bulk_load(self, table_name: str, columns: List[str], rows: Iterable[Sequence[Any]],
+                  chunk_size: Optional[int] = 5000, fast_executemany: bool = True,
+                  on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Büyük veri aktarımları için parça parça toplu yükleme
 
-            # Verileri tuple listesine çevir
-            values = [tuple(row[col] for col in columns) for row in data]
+        Satırlar iterator'dan chunk_size'lık parçalar halinde okunur, her parça
+        fast_executemany ile tek round trip'te gönderilir ve ayrı commit edilir.
+        Böylece ne parametre dizisi ne de transaction tüm veri kadar büyür.
+        Hata durumunda yalnızca o anki parça geri alınır.
 
-            cursor.executemany(query, values)
-            conn.commit()
+        Args:
+            table_name: Tablo adı
+            columns: Sütun isimleri
+            rows: Sütun sırasına uygun değer tuple'ları üreten iterable
+            chunk_size: Parça başına satır sayısı (None ise tek parça, tek commit)
+            fast_executemany: pyodbc'nin parametre dizisini tek seferde gönderen modu
+            on_chunk: Her parça commit edildikten sonra parça metrikleriyle çağrılır
+
+        Returns:
+            Toplam satır, parça sayısı, süre, saniyede satır ve parça metrikleri
+        """
+        placeholders = ', '.join(['?' for _ in columns])
+        column_names = ', '.join(columns)
+        query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
+
+        stats = {'rows': 0, 'chunks': 0, 'elapsed': 0.0, 'rows_per_sec': 0.0, 'chunk_stats': []}
+        rows = iter(rows)
 
-            return cursor.rowcount
+        conn = self.pool.acquire()
+        cursor = conn.cursor()
 
-        except pyodbc.Error as e:
+        try:
+            # sqlite3 gibi stand-in sürücülerde bu özellik yok
+            if fast_executemany and hasattr(cursor, 'fast_executemany'):
+                cursor.fast_executemany = True
+
+            started = time.perf_counter()
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size)) if chunk_size else list(rows)
+                if not chunk:
+                    break
+
+                chunk_started = time.perf_counter()
+                try:
+                    cursor.executemany(query, chunk)
+                    conn.commit()
+                    self._note_write()
+                except DB_ERRORS:
+                    self._record(query, chunk_started, 0, 0, True)
+                    raise
+                chunk_elapsed = time.perf_counter() - chunk_started
+                self._record(query, chunk_started, len(chunk))
+
+                stats['rows'] += len(chunk)
+                stats['chunks'] += 1
+                chunk_stat = {
+                    'chunk': stats['chunks'],
+                    'rows': len(chunk),
+                    'elapsed': chunk_elapsed,
+                    'rows_per_sec': len(chunk) / chunk_elapsed if chunk_elapsed else 0.0
+                }
+                stats['chunk_stats'].append(chunk_stat)
+                if on_chunk:
+                    on_chunk(chunk_stat)
+
+                if not chunk_size:
+                    break
+
+            stats['elapsed'] = time.perf_counter() - started
+            if stats['elapsed']:
+                stats['rows_per_sec'] = stats['rows'] / stats['elapsed']
+            return stats
+
+        except DB_ERRORS as e:
             conn.rollback()
-            print(f"Toplu ekleme hatası: {e}")
+            print(f"Toplu ekleme hatası ({stats['rows']} satır commit edildi): {e}")
             raise
         finally:
             cursor.close()
-            self.disconnect()
+            self.pool.release(conn)
+            # Hata olsa da önceki parçalar commit edilmiş olabilir
+            self.invalidate_cache(*tables_in(f"INSERT INTO {table_name}"))
+
+    def bulk_load_csv(self, table_name: str, path: str, columns: Optional[List[str]] = None,
+                      chunk_size: Optional[int] = 5000, fast_executemany: bool = True,
+                      on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      encoding: str = 'utf-8', delimiter: str = ',') -> Dict[str, Any]:
+        """
+        Başlık satırlı CSV dosyasını dosyayı belleğe almadan tabloya yükle
+
+        Args:
+            table_name: Tablo adı
+            path: CSV dosya yolu
+            columns: Yüklenecek sütunlar (None ise CSV başlığındaki tüm sütunlar)
+            chunk_size: Parça başına satır sayısı
+            fast_executemany: pyodbc'nin parametre dizisini tek seferde gönderen modu
+            on_chunk: Her parça sonrası çağrılacak fonksiyon
+            encoding: Dosya kodlaması
+            delimiter: Alan ayracı
+
+        Returns:
+            bulk_load() ile aynı metrikler
+        """
+        with open(path, newline='', encoding=encoding) as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return {'rows': 0, 'chunks': 0, 'elapsed': 0.0, 'rows_per_sec': 0.0, 'chunk_stats': []}
+
+            columns = columns or header
+            positions = [header.index(col) for col in columns]
+            # Boş alanlar NULL olarak eklenir
+            rows = (tuple(record[i] if record[i] != '' else None for i in positions) for record in reader)
+
+            return self.bulk_load(table_name, columns, rows, chunk_size=chunk_size,
+                                  fast_executemany=fast_executemany, on_chunk=on_chunk)
+
+    def bulk_load_dataframe(self, table_name: str, df: 'pd.DataFrame',
+                            chunk_size: Optional[int] = 5000, fast_executemany: bool = True,
+                            on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        DataFrame'i tabloya parça parça yükle (sütun adları tablo sütunlarıyla aynı olmalı)
+
+        Args:
+            table_name: Tablo adı
+            df: Yüklenecek DataFrame
+            chunk_size: Parça başına satır sayısı
+            fast_executemany: pyodbc'nin parametre dizisini tek seferde gönderen modu
+            on_chunk: Her parça sonrası çağrılacak fonksiyon
+
+        Returns:
+            bulk_load() ile aynı metrikler
+        """
+        step = chunk_size or max(len(df), 1)
+
+        def iter_rows():
+            for start in range(0, len(df), step):
+                # NaN/NaT değerleri NULL olarak gönderilir
+                part = df.iloc[start:start + step].astype(object)
+                part = part.where(part.notna(), None)
+                yield from part.itertuples(index=False, name=None)
+
+        return self.bulk_load(table_name, [str(col) for col in df.columns], iter_rows(),
+                              chunk_size=chunk_size, fast_executemany=fast_executemany,
+                              on_chunk=on_chunk)
 
     def test_connection(self) -> bool:
         """
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator
+
+
+# Her yield'da gönderilecek satır sayısı (çok küçük parçalar yerine tamponlanır)
+CHUNK_ROWS = 500
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps'ın tanımadığı DB tiplerini dönüştür"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """
+    Satırları NDJSON (her satırda bir JSON nesnesi) parçaları olarak üret
+
+    Args:
+        rows: Dictionary satırları üreten iterable (örn: db.iter_query)
+        chunk_rows: Bir parçada birleştirilecek satır sayısı
+
+    Yields:
+        Birden fazla satır içeren metin parçaları
+    """
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, default=json_default, ensure_ascii=False))
+        if len(buffer) >= chunk_rows:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """
+    Satırları başlık satırıyla birlikte CSV parçaları olarak üret
+
+    Args:
+        rows: Dictionary satırları üreten iterable (örn: db.iter_query)
+        chunk_rows: Bir parçada birleştirilecek satır sayısı
+
+    Yields:
+        Birden fazla satır içeren metin parçaları
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # İlk satır başlığı belirler
+    writer.writerow(first.keys())
+    writer.writerow(first.values())
+    pending = 1
+
+    for row in rows:
+        writer.writerow(row.values())
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    if pending:
+        yield buffer.getvalue()
+
+
+# Desteklenen formatlar: ad -> (üretici, mimetype, dosya uzantısı)
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (iter_csv, 'text/csv', 'csv'),
+}
+
+
+def iter_export(rows: Iterable[Dict[str, Any]], fmt: str) -> Iterator[str]:
+    """
+    Satırları istenen formatta akıt, bitince (veya istemci koparsa) kaynağı kapat
+
+    Args:
+        rows: Dictionary satırları üreten iterable (örn: db.iter_query)
+        fmt: EXPORT_FORMATS içindeki format adı
+
+    Yields:
+        Metin parçaları
+    """
+    encoder = EXPORT_FORMATS[fmt][0]
+    try:
+        yield from encoder(rows)
+    finally:
+        # iter_query generator'ı kapatılınca bağlantı havuza döner
+        close = getattr(rows, 'close', None)
+        if close:
+            close()
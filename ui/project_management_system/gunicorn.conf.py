@@ -0,0 +1,110 @@
+"""
+gunicorn ayarları (pre-fork, çok worker'lı üretim sunucusu)
+
+Master process uygulamayı bir kez kurar (preload_app: modüller, derlenmiş
+şablonlar, SQLite'ta migration'lar) ve worker'ları fork eder; worker'lar
+bu belleği copy-on-write paylaşır. Veritabanı bağlantıları fork'tan sonra
+her worker'da yeniden açılır (Services.after_fork).
+
+Worker'lar gthread'dir: her istek (açık SSE bildirim akışları dahil) bir
+thread tutar, worker başına en fazla `threads` eşzamanlı istek. Worker
+kapanırken (SIGTERM, max_requests, yeniden yükleme) SSE akışları
+kapatılır, yeni bağlantı alınmaz ve süren istekler graceful_timeout kadar
+beklenir.
+
+Zamanlanmış işler (bildirim taraması, saklama) yalnızca bir worker'da
+çalışır: işler, paylaşılan bir dosya kilidini (flock) alan worker'da
+başlar; o worker ölürse kilit serbest kalır ve bekleyen bir sonraki worker
+devralır.
+
+gunicorn fork() gerektirir; Windows'ta geliştirme sunucusu kullanılır
+(python app.py). Ayarlar app.create_app ile aynıdır (PMS_* ortam
+değişkenleri); komut satırı seçenekleri bu dosyadakilerin üzerine yazar.
+
+Kullanım:
+    gunicorn -w 4 -b 0.0.0.0:5000
+    PMS_DB_BACKEND=sqlite PMS_SQLITE_PATH=pms.db gunicorn -w 2 --threads 16
+"""
+import fcntl
+import gc
+import os
+import signal
+import sys
+import tempfile
+import threading
+
+# Zamanlanmış işler master'da değil fork'tan sonra başlatılır (thread'ler fork'ta kopyalanmaz)
+wsgi_app = "app:create_app({'BACKGROUND_JOBS': False})"
+preload_app = True
+
+bind = '0.0.0.0:5000'
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = 32
+# Worker'ın ana döngüsü bu süre boyunca yanıt vermezse master onu yeniden başlatır
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Master'ın PID'i: aynı makinedeki başka bir sunucuyla kilit paylaşılmaz
+JOBS_LOCK = os.path.join(tempfile.gettempdir(), f'pms-jobs-{os.getpid()}.lock')
+
+
+def _services(app):
+    return app.extensions['pms']
+
+
+def when_ready(server):
+    """Worker'lar fork edilmeden önce master'da"""
+    app = server.app.wsgi()
+    if app.config['PMS_DB_BACKEND'] == 'sqlite' and app.config['PMS_SQLITE_PATH'] == ':memory:':
+        sys.exit("Bellek içi SQLite process'ler arasında paylaşılamaz: PMS_SQLITE_PATH ile dosya verin")
+
+    # Şablonlar master'da derlenir: worker'lar derlenmiş halini fork ile devralır
+    for name in app.jinja_env.list_templates():
+        if name.endswith('.html'):
+            app.jinja_env.get_template(name)
+
+    # Migration'ların açtığı bağlantılar worker'lara taşınmasın
+    _services(app).db.close()
+    # Preload edilen nesneler GC tarafından taranıp sayfaları kopyalanmasın
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    _services(server.app.wsgi()).after_fork()
+
+
+def post_worker_init(worker):
+    """Worker uygulamayı yükledi, istek almaya başlamak üzere"""
+    services = _services(worker.wsgi)
+
+    # gunicorn'un SIGTERM işleyicisinden önce SSE akışları kapatılır: aksi halde
+    # worker açık akışlar yüzünden graceful_timeout dolana kadar boşalamaz
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def close_streams(signum, frame):
+        services.notification_hub.close_streams()
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, close_streams)
+
+    def run_background_jobs():
+        lock = open(JOBS_LOCK, 'a')
+        fcntl.flock(lock, fcntl.LOCK_EX)  # kilidi tutan worker ölene kadar bekler
+        worker.jobs_lock = lock  # worker süresince açık kalır
+        worker.log.info("Zamanlanmış işler worker %s'de başlatılıyor", worker.pid)
+        services.start_background()
+
+    threading.Thread(target=run_background_jobs, name='background-jobs-lock', daemon=True).start()
+
+
+def worker_exit(server, worker):
+    _services(worker.wsgi).close()
+
+
+def on_exit(server):
+    try:
+        os.remove(JOBS_LOCK)
+    except OSError:
+        pass
@@ -0,0 +1,1109 @@
+"""
+Sürümlü şema migration'ları
+
+Her migration bir sürüm numarası, index tanımları ve backend'e özel
+ifadelerden oluşur; index SQL'i backend'e göre (SQL Server / SQLite)
+üretilir. Uygulanan sürümler SchemaMigrations tablosunda tutulur,
+migrate() yalnızca eksik olanları sırayla uygular.
+
+Kullanım:
+    python migrations.py --sqlite bench.db            # eksik migration'ları uygula
+    python migrations.py --sqlite bench.db --status   # uygulanmış sürümler
+    python migrations.py --print mssql                # SSMS için T-SQL script'i
+"""
+import argparse
+import textwrap
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from database import DatabaseManager
+
+
+class Index(NamedTuple):
+    """
+    Nonclustered index tanımı
+
+    include: SQL Server'da INCLUDE ile yaprak seviyesine eklenen sütunlar;
+    SQLite INCLUDE desteklemediği için anahtarın sonuna eklenir (covering index).
+    """
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    include: Tuple[str, ...] = ()
+
+
+class Migration(NamedTuple):
+    """
+    Tek bir şema sürümü
+
+    up/down: backend'e göre ('mssql' / 'sqlite') sırayla çalıştırılacak
+    ifadeler; index'lerden sonra uygulanır, geri alınırken önce çalışır.
+    """
+    version: int
+    name: str
+    description: str
+    indexes: Tuple[Index, ...] = ()
+    up: Dict[str, Tuple[str, ...]] = {}
+    down: Dict[str, Tuple[str, ...]] = {}
+
+
+# ============================================
+# 003: PROJE / ÇALIŞAN SAYAÇLARI
+# ============================================
+# Liste sayfalarındaki member_count/task_count ve project_count/task_count her
+# satır için alt sorguyla hesaplanmak yerine özet tablolardan okunur.
+# Görev sayıları +1/-1 ile, üye sayıları (DISTINCT) yalnızca etkilenen
+# proje/çalışan için index üzerinden yeniden sayılarak güncellenir.
+_ROLLUP_BACKFILL = (
+    """
+    INSERT INTO ProjectStats (project_id, member_count, task_count)
+    SELECT p.project_id,
+        (SELECT COUNT(DISTINCT pm.employee_id) FROM ProjectMembers pm WHERE pm.project_id = p.project_id),
+        (SELECT COUNT(*) FROM Tasks t WHERE t.project_id = p.project_id)
+    FROM Projects p
+    WHERE NOT EXISTS (SELECT 1 FROM ProjectStats ps WHERE ps.project_id = p.project_id)
+    """,
+    """
+    INSERT INTO EmployeeStats (employee_id, project_count, task_count)
+    SELECT e.EmployeeID,
+        (SELECT COUNT(DISTINCT pm.project_id) FROM ProjectMembers pm WHERE pm.employee_id = e.EmployeeID),
+        (SELECT COUNT(*) FROM Tasks t WHERE t.employee_id = e.EmployeeID)
+    FROM Employees e
+    WHERE NOT EXISTS (SELECT 1 FROM EmployeeStats es WHERE es.employee_id = e.EmployeeID)
+    """,
+)
+
+ROLLUP_UP = {
+    'mssql': (
+        """
+        IF OBJECT_ID('ProjectStats', 'U') IS NULL
+            CREATE TABLE ProjectStats (
+                project_id INT PRIMARY KEY,
+                member_count INT NOT NULL DEFAULT 0,
+                task_count INT NOT NULL DEFAULT 0
+            )
+        """,
+        """
+        IF OBJECT_ID('EmployeeStats', 'U') IS NULL
+            CREATE TABLE EmployeeStats (
+                employee_id INT PRIMARY KEY,
+                project_count INT NOT NULL DEFAULT 0,
+                task_count INT NOT NULL DEFAULT 0
+            )
+        """,
+    ) + _ROLLUP_BACKFILL + (
+        """
+        CREATE OR ALTER TRIGGER trg_Projects_Stats
+        ON Projects
+        AFTER INSERT, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO ProjectStats (project_id) SELECT project_id FROM inserted;
+            DELETE ps FROM ProjectStats ps INNER JOIN deleted d ON ps.project_id = d.project_id;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_Employees_Stats
+        ON Employees
+        AFTER INSERT, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO EmployeeStats (employee_id) SELECT EmployeeID FROM inserted;
+            DELETE es FROM EmployeeStats es INNER JOIN deleted d ON es.employee_id = d.EmployeeID;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_Tasks_Stats
+        ON Tasks
+        AFTER INSERT, UPDATE, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+
+            -- Proje/çalışan değişmeyen güncellemeler sayaçları etkilemez
+            IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
+               AND NOT UPDATE(project_id) AND NOT UPDATE(employee_id)
+                RETURN;
+
+            UPDATE ps SET task_count = ps.task_count + x.delta
+            FROM ProjectStats ps
+            INNER JOIN (
+                SELECT project_id, SUM(delta) AS delta
+                FROM (SELECT project_id, 1 AS delta FROM inserted
+                      UNION ALL
+                      SELECT project_id, -1 FROM deleted) c
+                GROUP BY project_id
+            ) x ON ps.project_id = x.project_id
+            WHERE x.delta <> 0;
+
+            UPDATE es SET task_count = es.task_count + x.delta
+            FROM EmployeeStats es
+            INNER JOIN (
+                SELECT employee_id, SUM(delta) AS delta
+                FROM (SELECT employee_id, 1 AS delta FROM inserted
+                      UNION ALL
+                      SELECT employee_id, -1 FROM deleted) c
+                GROUP BY employee_id
+            ) x ON es.employee_id = x.employee_id
+            WHERE x.delta <> 0;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_ProjectMembers_Stats
+        ON ProjectMembers
+        AFTER INSERT, UPDATE, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+
+            UPDATE ps SET member_count = (
+                SELECT COUNT(DISTINCT pm.employee_id) FROM ProjectMembers pm WHERE pm.project_id = ps.project_id)
+            FROM ProjectStats ps
+            WHERE ps.project_id IN (SELECT project_id FROM inserted UNION SELECT project_id FROM deleted);
+
+            UPDATE es SET project_count = (
+                SELECT COUNT(DISTINCT pm.project_id) FROM ProjectMembers pm WHERE pm.employee_id = es.employee_id)
+            FROM EmployeeStats es
+            WHERE es.employee_id IN (SELECT employee_id FROM inserted UNION SELECT employee_id FROM deleted);
+        END
+        """,
+    ),
+    'sqlite': (
+        """
+        CREATE TABLE IF NOT EXISTS ProjectStats (
+            project_id INTEGER PRIMARY KEY,
+            member_count INTEGER NOT NULL DEFAULT 0,
+            task_count INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS EmployeeStats (
+            employee_id INTEGER PRIMARY KEY,
+            project_count INTEGER NOT NULL DEFAULT 0,
+            task_count INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+    ) + _ROLLUP_BACKFILL + (
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Projects_StatsInsert AFTER INSERT ON Projects
+        BEGIN
+            INSERT INTO ProjectStats (project_id) VALUES (new.project_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Projects_StatsDelete AFTER DELETE ON Projects
+        BEGIN
+            DELETE FROM ProjectStats WHERE project_id = old.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Employees_StatsInsert AFTER INSERT ON Employees
+        BEGIN
+            INSERT INTO EmployeeStats (employee_id) VALUES (new.EmployeeID);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Employees_StatsDelete AFTER DELETE ON Employees
+        BEGIN
+            DELETE FROM EmployeeStats WHERE employee_id = old.EmployeeID;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Tasks_StatsInsert AFTER INSERT ON Tasks
+        BEGIN
+            UPDATE ProjectStats SET task_count = task_count + 1 WHERE project_id = new.project_id;
+            UPDATE EmployeeStats SET task_count = task_count + 1 WHERE employee_id = new.employee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Tasks_StatsDelete AFTER DELETE ON Tasks
+        BEGIN
+            UPDATE ProjectStats SET task_count = task_count - 1 WHERE project_id = old.project_id;
+            UPDATE EmployeeStats SET task_count = task_count - 1 WHERE employee_id = old.employee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_Tasks_StatsUpdate AFTER UPDATE OF project_id, employee_id ON Tasks
+        WHEN old.project_id <> new.project_id OR old.employee_id <> new.employee_id
+        BEGIN
+            UPDATE ProjectStats SET task_count = task_count - 1 WHERE project_id = old.project_id;
+            UPDATE ProjectStats SET task_count = task_count + 1 WHERE project_id = new.project_id;
+            UPDATE EmployeeStats SET task_count = task_count - 1 WHERE employee_id = old.employee_id;
+            UPDATE EmployeeStats SET task_count = task_count + 1 WHERE employee_id = new.employee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_ProjectMembers_StatsInsert AFTER INSERT ON ProjectMembers
+        BEGIN
+            UPDATE ProjectStats SET member_count = (
+                SELECT COUNT(DISTINCT employee_id) FROM ProjectMembers WHERE project_id = new.project_id)
+            WHERE project_id = new.project_id;
+            UPDATE EmployeeStats SET project_count = (
+                SELECT COUNT(DISTINCT project_id) FROM ProjectMembers WHERE employee_id = new.employee_id)
+            WHERE employee_id = new.employee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_ProjectMembers_StatsDelete AFTER DELETE ON ProjectMembers
+        BEGIN
+            UPDATE ProjectStats SET member_count = (
+                SELECT COUNT(DISTINCT employee_id) FROM ProjectMembers WHERE project_id = old.project_id)
+            WHERE project_id = old.project_id;
+            UPDATE EmployeeStats SET project_count = (
+                SELECT COUNT(DISTINCT project_id) FROM ProjectMembers WHERE employee_id = old.employee_id)
+            WHERE employee_id = old.employee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_ProjectMembers_StatsUpdate
+        AFTER UPDATE OF project_id, employee_id ON ProjectMembers
+        BEGIN
+            UPDATE ProjectStats SET member_count = (
+                SELECT COUNT(DISTINCT employee_id) FROM ProjectMembers WHERE project_id = ProjectStats.project_id)
+            WHERE project_id IN (old.project_id, new.project_id);
+            UPDATE EmployeeStats SET project_count = (
+                SELECT COUNT(DISTINCT project_id) FROM ProjectMembers WHERE employee_id = EmployeeStats.employee_id)
+            WHERE employee_id IN (old.employee_id, new.employee_id);
+        END
+        """,
+    ),
+}
+
+ROLLUP_DOWN = {
+    'mssql': (
+        "DROP TRIGGER IF EXISTS trg_Projects_Stats",
+        "DROP TRIGGER IF EXISTS trg_Employees_Stats",
+        "DROP TRIGGER IF EXISTS trg_Tasks_Stats",
+        "DROP TRIGGER IF EXISTS trg_ProjectMembers_Stats",
+        "DROP TABLE IF EXISTS ProjectStats",
+        "DROP TABLE IF EXISTS EmployeeStats",
+    ),
+    'sqlite': tuple(
+        f"DROP TRIGGER IF EXISTS {name}" for name in (
+            'trg_Projects_StatsInsert', 'trg_Projects_StatsDelete',
+            'trg_Employees_StatsInsert', 'trg_Employees_StatsDelete',
+            'trg_Tasks_StatsInsert', 'trg_Tasks_StatsDelete', 'trg_Tasks_StatsUpdate',
+            'trg_ProjectMembers_StatsInsert', 'trg_ProjectMembers_StatsDelete', 'trg_ProjectMembers_StatsUpdate',
+        )
+    ) + (
+        "DROP TABLE IF EXISTS ProjectStats",
+        "DROP TABLE IF EXISTS EmployeeStats",
+    ),
+}
+
+
+# ============================================
+# 004: ZAMANLANMIŞ BİLDİRİM TARAMASI
+# ============================================
+# Deadline/gecikme bildirimleri her görev yazımında trigger ile değil,
+# notification_scanner.NotificationScanner ile watermark'tan itibaren toplu üretilir.
+SCANNER_UP = {
+    'mssql': (
+        """
+        IF OBJECT_ID('SchedulerState', 'U') IS NULL
+            CREATE TABLE SchedulerState (
+                name NVARCHAR(50) PRIMARY KEY,
+                watermark DATETIME NOT NULL
+            )
+        """,
+        "DROP TRIGGER IF EXISTS trg_DeadlineApproaching",
+        "DROP TRIGGER IF EXISTS trg_TaskOverdue",
+    ),
+    'sqlite': (
+        """
+        CREATE TABLE IF NOT EXISTS SchedulerState (
+            name VARCHAR(50) PRIMARY KEY,
+            watermark DATETIME NOT NULL
+        )
+        """,
+        "DROP TRIGGER IF EXISTS trg_DeadlineApproaching_Insert",
+        "DROP TRIGGER IF EXISTS trg_DeadlineApproaching_Update",
+        "DROP TRIGGER IF EXISTS trg_TaskOverdue_Insert",
+        "DROP TRIGGER IF EXISTS trg_TaskOverdue_Update",
+    ),
+}
+
+# Geri alırken eski trigger'lar (sql/triggers.sql) yeniden kurulur
+SCANNER_DOWN = {
+    'mssql': (
+        """
+        CREATE OR ALTER TRIGGER trg_DeadlineApproaching
+        ON Tasks
+        AFTER INSERT, UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            SELECT i.task_id, i.employee_id,
+                   CONCAT(N'Görev için deadline yaklaşıyor: ', i.task_title), N'Deadline Yaklaşıyor'
+            FROM inserted i
+            WHERE i.due_date IS NOT NULL
+              AND DATEDIFF(DAY, GETDATE(), i.due_date) = 3;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_TaskOverdue
+        ON Tasks
+        AFTER INSERT, UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            SELECT i.task_id, i.employee_id, CONCAT(N'Görev gecikti: ', i.task_title), N'Gecikme'
+            FROM inserted i
+            WHERE i.due_date < GETDATE()
+              AND i.status <> N'Tamamlandı';
+        END
+        """,
+        "DROP TABLE IF EXISTS SchedulerState",
+    ),
+    'sqlite': (
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_DeadlineApproaching_Insert
+        AFTER INSERT ON Tasks
+        WHEN NEW.due_date IS NOT NULL
+         AND CAST(julianday(date(NEW.due_date)) - julianday(date('now', 'localtime')) AS INTEGER) = 3
+        BEGIN
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            VALUES (NEW.task_id, NEW.employee_id, 'Görev için deadline yaklaşıyor: ' || NEW.task_title,
+                    'Deadline Yaklaşıyor');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_DeadlineApproaching_Update
+        AFTER UPDATE ON Tasks
+        WHEN NEW.due_date IS NOT NULL
+         AND CAST(julianday(date(NEW.due_date)) - julianday(date('now', 'localtime')) AS INTEGER) = 3
+        BEGIN
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            VALUES (NEW.task_id, NEW.employee_id, 'Görev için deadline yaklaşıyor: ' || NEW.task_title,
+                    'Deadline Yaklaşıyor');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_TaskOverdue_Insert
+        AFTER INSERT ON Tasks
+        WHEN NEW.due_date < datetime('now', 'localtime') AND NEW.status <> 'Tamamlandı'
+        BEGIN
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            VALUES (NEW.task_id, NEW.employee_id, 'Görev gecikti: ' || NEW.task_title, 'Gecikme');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_TaskOverdue_Update
+        AFTER UPDATE ON Tasks
+        WHEN NEW.due_date < datetime('now', 'localtime') AND NEW.status <> 'Tamamlandı'
+        BEGIN
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            VALUES (NEW.task_id, NEW.employee_id, 'Görev gecikti: ' || NEW.task_title, 'Gecikme');
+        END
+        """,
+        "DROP TABLE IF EXISTS SchedulerState",
+    ),
+}
+
+
+# ============================================
+# 005: TEK YAZIMLI DURUM GEÇİŞLERİ
+# ============================================
+# Durum değişikliğinde geçmiş kaydı ve tamamlanma bildirimi trigger'larla değil
+# prosedürün kendisi tarafından, geçiş başına bir kez yazılır. sp_UpdateTaskStatus
+# eskiden elle bir kayıt atıyor, trg_TaskStatusHistory ikincisini ekliyordu.
+APPLY_STATUS_CHANGES_PROC = """
+CREATE OR ALTER PROCEDURE sp_ApplyTaskStatusChanges
+    @changes NVARCHAR(MAX)  -- [{"task_id": 1, "status": "Tamamlandı", "changed_by": 5}, ...]
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @input TABLE (seq INT PRIMARY KEY, task_id INT, new_status NVARCHAR(30), changed_by INT);
+    DECLARE @applied TABLE (task_id INT PRIMARY KEY, old_status NVARCHAR(30), new_status NVARCHAR(30),
+                            changed_by INT, employee_id INT, task_title NVARCHAR(150));
+
+    INSERT INTO @input (seq, task_id, new_status, changed_by)
+    SELECT CAST([key] AS INT), JSON_VALUE(value, '$.task_id'), JSON_VALUE(value, '$.status'),
+           JSON_VALUE(value, '$.changed_by')
+    FROM OPENJSON(@changes);
+
+    BEGIN TRANSACTION;
+
+    UPDATE t SET t.status = i.new_status
+    OUTPUT inserted.task_id, deleted.status, inserted.status, i.changed_by, inserted.employee_id,
+           inserted.task_title
+    INTO @applied (task_id, old_status, new_status, changed_by, employee_id, task_title)
+    FROM Tasks t
+    INNER JOIN @input i ON i.task_id = t.task_id
+    WHERE t.status <> i.new_status OR t.status IS NULL;
+
+    INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by, changed_at)
+    SELECT task_id, old_status, new_status, changed_by, GETDATE() FROM @applied;
+
+    INSERT INTO Notifications (task_id, user_id, message, notification_type)
+    SELECT task_id, employee_id, CONCAT(N'Görev tamamlandı: ', task_title), N'Görev Tamamlandı'
+    FROM @applied
+    WHERE new_status = N'Tamamlandı';
+
+    COMMIT TRANSACTION;
+
+    -- Girdi sırasıyla her geçişin sonucu ve görevin yeni durumu
+    SELECT i.seq, i.task_id,
+           ISNULL(a.old_status, t.status) AS old_status,
+           ISNULL(a.new_status, t.status) AS status,
+           CAST(CASE WHEN a.task_id IS NULL THEN 0 ELSE 1 END AS BIT) AS applied,
+           CASE WHEN t.task_id IS NULL THEN N'Belirtilen Task bulunamadı!'
+                WHEN a.task_id IS NULL THEN N'Zaten bu statüde!' END AS message
+    FROM @input i
+    LEFT JOIN @applied a ON a.task_id = i.task_id
+    LEFT JOIN Tasks t ON t.task_id = i.task_id
+    ORDER BY i.seq;
+END
+"""
+
+UPDATE_STATUS_PROC = """
+CREATE OR ALTER PROCEDURE sp_UpdateTaskStatus
+    @task_id INT,
+    @new_status NVARCHAR(50),
+    @changed_by INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @old_status NVARCHAR(50), @employee_id INT, @task_title NVARCHAR(150);
+    SELECT @old_status = status, @employee_id = employee_id, @task_title = task_title
+    FROM Tasks WHERE task_id = @task_id;
+
+    IF @employee_id IS NULL
+    BEGIN
+        RAISERROR('Belirtilen Task bulunamadı!', 16, 1);
+        RETURN;
+    END
+
+    IF @old_status = @new_status
+    BEGIN
+        RAISERROR('Zaten bu statüde!', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRANSACTION;
+
+    UPDATE Tasks SET status = @new_status WHERE task_id = @task_id;
+
+    -- Tek geçmiş kaydı (trg_TaskStatusHistory kaldırıldı)
+    INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by)
+    VALUES (@task_id, @old_status, @new_status, @changed_by);
+
+    IF @new_status = N'Tamamlandı'
+        INSERT INTO Notifications (task_id, user_id, message, notification_type)
+        VALUES (@task_id, @employee_id, CONCAT(N'Görev tamamlandı: ', @task_title), N'Görev Tamamlandı');
+
+    COMMIT TRANSACTION;
+
+    SELECT
+        @task_id AS TaskID,
+        @old_status AS OldStatus,
+        @new_status AS NewStatus,
+        @changed_by AS ChangedBy,
+        GETDATE() AS ChangedAt;
+END
+"""
+
+STATUS_TRANSITIONS_UP = {
+    'mssql': (
+        "DROP TRIGGER IF EXISTS trg_TaskStatusHistory",
+        "DROP TRIGGER IF EXISTS trg_TaskCompleted",
+        APPLY_STATUS_CHANGES_PROC,
+        UPDATE_STATUS_PROC,
+    ),
+    'sqlite': (
+        "DROP TRIGGER IF EXISTS trg_TaskStatusHistory",
+        "DROP TRIGGER IF EXISTS trg_TaskCompleted",
+    ),
+}
+
+# Geri alırken sql/triggers.sql ve sql/stored_procedures.sql'deki tanımlar kurulur
+STATUS_TRANSITIONS_DOWN = {
+    'mssql': (
+        "DROP PROCEDURE IF EXISTS sp_ApplyTaskStatusChanges",
+        """
+        CREATE OR ALTER PROCEDURE sp_UpdateTaskStatus
+            @task_id INT,
+            @new_status NVARCHAR(50),
+            @changed_by INT
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            IF NOT EXISTS (SELECT 1 FROM Tasks WHERE task_id = @task_id)
+            BEGIN
+                RAISERROR('Belirtilen Task bulunamadı!', 16, 1);
+                RETURN;
+            END
+            DECLARE @old_status NVARCHAR(50);
+            SELECT @old_status = status FROM Tasks WHERE task_id = @task_id;
+            IF @old_status = @new_status
+            BEGIN
+                RAISERROR('Zaten bu statüde!', 16, 1);
+                RETURN;
+            END
+            UPDATE Tasks SET status = @new_status WHERE task_id = @task_id;
+            INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by)
+            VALUES (@task_id, @old_status, @new_status, @changed_by);
+            SELECT @task_id AS TaskID, @old_status AS OldStatus, @new_status AS NewStatus,
+                   @changed_by AS ChangedBy, GETDATE() AS ChangedAt;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_TaskStatusHistory
+        ON Tasks
+        AFTER UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by, changed_at)
+            SELECT i.task_id, d.status, i.status, i.employee_id, GETDATE()
+            FROM inserted i
+            INNER JOIN deleted d ON i.task_id = d.task_id
+            WHERE i.status <> d.status;
+        END
+        """,
+        """
+        CREATE OR ALTER TRIGGER trg_TaskCompleted
+        ON Tasks
+        AFTER UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            SELECT i.task_id, i.employee_id, CONCAT(N'Görev tamamlandı: ', i.task_title), N'Görev Tamamlandı'
+            FROM inserted i
+            INNER JOIN deleted d ON i.task_id = d.task_id
+            WHERE d.status <> N'Tamamlandı'
+              AND i.status = N'Tamamlandı';
+        END
+        """,
+    ),
+    'sqlite': (
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_TaskStatusHistory
+        AFTER UPDATE OF status ON Tasks
+        WHEN NEW.status <> OLD.status
+        BEGIN
+            INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by, changed_at)
+            VALUES (NEW.task_id, OLD.status, NEW.status, NEW.employee_id, datetime('now', 'localtime'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_TaskCompleted
+        AFTER UPDATE OF status ON Tasks
+        WHEN OLD.status <> 'Tamamlandı' AND NEW.status = 'Tamamlandı'
+        BEGIN
+            INSERT INTO Notifications (task_id, user_id, message, notification_type)
+            VALUES (NEW.task_id, NEW.employee_id, 'Görev tamamlandı: ' || NEW.task_title, 'Görev Tamamlandı');
+        END
+        """,
+    ),
+}
+
+
+# ============================================
+# 006: TOPLU GÖREV EKLEME
+# ============================================
+# sp_AddTask'in çok satırlı karşılığı: duplicate ve FK kontrolleri tüm girdi için
+# tek sorguda, ekleme tek INSERT ... SELECT ile ve tek transaction içinde yapılır.
+ADD_TASKS_PROC = """
+CREATE OR ALTER PROCEDURE sp_AddTasks
+    @tasks NVARCHAR(MAX)  -- [{"project_id": 1, "employee_id": 5, "task_title": "...", ...}, ...]
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @input TABLE (seq INT PRIMARY KEY, project_id INT, employee_id INT, task_title NVARCHAR(150),
+                          task_description NVARCHAR(255), priority NVARCHAR(20), start_date DATE,
+                          due_date DATE, assigned_role NVARCHAR(50), assigned_date DATE,
+                          message NVARCHAR(100));
+    DECLARE @created TABLE (task_id INT PRIMARY KEY, employee_id INT, task_title NVARCHAR(150));
+
+    INSERT INTO @input (seq, project_id, employee_id, task_title, task_description, priority,
+                        start_date, due_date, assigned_role, assigned_date)
+    SELECT CAST(o.[key] AS INT), j.project_id, j.employee_id, j.task_title, j.task_description, j.priority,
+           j.start_date, j.due_date, j.assigned_role, j.assigned_date
+    FROM OPENJSON(@tasks) o
+    CROSS APPLY OPENJSON(o.value) WITH (
+        project_id INT, employee_id INT, task_title NVARCHAR(150), task_description NVARCHAR(255),
+        priority NVARCHAR(20), start_date DATE, due_date DATE, assigned_role NVARCHAR(50),
+        assigned_date DATE
+    ) j;
+
+    -- Duplicate kontrolü: mevcut görevler ve aynı istekte daha önce geçenler
+    UPDATE i SET message = N'Bu çalışan için aynı task zaten var!'
+    FROM @input i
+    WHERE EXISTS (SELECT 1 FROM Tasks t WHERE t.employee_id = i.employee_id AND t.task_title = i.task_title)
+       OR EXISTS (SELECT 1 FROM @input d
+                  WHERE d.employee_id = i.employee_id AND d.task_title = i.task_title AND d.seq < i.seq);
+
+    UPDATE i SET message = N'Belirtilen proje veya çalışan bulunamadı!'
+    FROM @input i
+    WHERE i.message IS NULL
+      AND (NOT EXISTS (SELECT 1 FROM Projects p WHERE p.project_id = i.project_id)
+           OR NOT EXISTS (SELECT 1 FROM Employees e WHERE e.EmployeeID = i.employee_id));
+
+    BEGIN TRANSACTION;
+
+    INSERT INTO Tasks (project_id, employee_id, task_title, task_description, priority, status,
+                       start_date, due_date, assigned_role, assigned_date)
+    OUTPUT inserted.task_id, inserted.employee_id, inserted.task_title INTO @created
+    SELECT project_id, employee_id, task_title, task_description, priority, N'Atandı',
+           start_date, due_date, assigned_role, assigned_date
+    FROM @input
+    WHERE message IS NULL
+    ORDER BY seq;
+
+    -- İlk durum kayıtları
+    INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by)
+    SELECT task_id, NULL, N'Atandı', employee_id FROM @created;
+
+    COMMIT TRANSACTION;
+
+    -- (employee_id, task_title) eklenen satırlar arasında benzersizdir; aynı çifti tekrarlayan
+    -- satırlar (message dolu) eklenen satırla eşleşmemeli
+    SELECT i.seq, c.task_id,
+           CAST(CASE WHEN c.task_id IS NULL THEN 0 ELSE 1 END AS BIT) AS created,
+           i.message
+    FROM @input i
+    LEFT JOIN @created c ON i.message IS NULL
+                        AND c.employee_id = i.employee_id AND c.task_title = i.task_title
+    ORDER BY i.seq;
+END
+"""
+
+BULK_TASKS_UP = {
+    'mssql': (ADD_TASKS_PROC,),
+}
+
+BULK_TASKS_DOWN = {
+    'mssql': ("DROP PROCEDURE IF EXISTS sp_AddTasks",),
+}
+
+
+# ============================================
+# 007: DEĞİŞİKLİK GÜNLÜĞÜ (CHANGE FEED)
+# ============================================
+# Listelenen tablolara yapılan her ekleme/güncelleme/silme ChangeLog'a bir satır
+# olarak yazılır; /api/changes?since=<change_id> istemciye yalnızca değişen satırları
+# döndürür. Sayaç tablolarındaki (migration 003) değişiklikler ilgili proje/çalışan
+# satırının güncellenmesi olarak kaydedilir, liste satırlarındaki sayılar da güncel kalır.
+CHANGE_LOG_TABLES = (('Projects', 'project_id'), ('Tasks', 'task_id'), ('Employees', 'EmployeeID'))
+CHANGE_LOG_COUNTERS = (('ProjectStats', 'Projects', 'project_id'), ('EmployeeStats', 'Employees', 'employee_id'))
+
+CHANGE_LOG_UP = {
+    'mssql': (
+        """
+        IF OBJECT_ID('ChangeLog', 'U') IS NULL
+            CREATE TABLE ChangeLog (
+                change_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+                table_name NVARCHAR(50) NOT NULL,
+                row_id INT NOT NULL,
+                operation CHAR(1) NOT NULL,  -- I, U, D
+                changed_at DATETIME NOT NULL DEFAULT GETDATE()
+            )
+        """,
+    ) + tuple(
+        f"""
+        CREATE OR ALTER TRIGGER trg_{table}_ChangeLog
+        ON {table}
+        AFTER INSERT, UPDATE, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO ChangeLog (table_name, row_id, operation)
+            SELECT N'{table}', COALESCE(i.{key}, d.{key}),
+                   CASE WHEN d.{key} IS NULL THEN 'I' WHEN i.{key} IS NULL THEN 'D' ELSE 'U' END
+            FROM inserted i
+            FULL OUTER JOIN deleted d ON i.{key} = d.{key};
+        END
+        """ for table, key in CHANGE_LOG_TABLES
+    ) + tuple(
+        f"""
+        CREATE OR ALTER TRIGGER trg_{counter}_ChangeLog
+        ON {counter}
+        AFTER UPDATE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            INSERT INTO ChangeLog (table_name, row_id, operation)
+            SELECT N'{table}', {key}, 'U' FROM inserted;
+        END
+        """ for counter, table, key in CHANGE_LOG_COUNTERS
+    ),
+    'sqlite': (
+        """
+        CREATE TABLE IF NOT EXISTS ChangeLog (
+            change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name VARCHAR(50) NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation CHAR(1) NOT NULL,
+            changed_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+    ) + tuple(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_ChangeLog{event.title()} AFTER {event} ON {table}
+        BEGIN
+            INSERT INTO ChangeLog (table_name, row_id, operation) VALUES ('{table}', {row}.{key}, '{event[0]}');
+        END
+        """ for table, key in CHANGE_LOG_TABLES
+        for event, row in (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old'))
+    ) + tuple(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{counter}_ChangeLogUpdate AFTER UPDATE ON {counter}
+        BEGIN
+            INSERT INTO ChangeLog (table_name, row_id, operation) VALUES ('{table}', new.{key}, 'U');
+        END
+        """ for counter, table, key in CHANGE_LOG_COUNTERS
+    ),
+}
+
+CHANGE_LOG_DOWN = {
+    'mssql': tuple(
+        f"DROP TRIGGER IF EXISTS trg_{table}_ChangeLog"
+        for table in [t for t, _ in CHANGE_LOG_TABLES] + [c for c, _, _ in CHANGE_LOG_COUNTERS]
+    ) + ("DROP TABLE IF EXISTS ChangeLog",),
+    'sqlite': tuple(
+        f"DROP TRIGGER IF EXISTS trg_{table}_ChangeLog{event}"
+        for table, _ in CHANGE_LOG_TABLES for event in ('Insert', 'Update', 'Delete')
+    ) + tuple(
+        f"DROP TRIGGER IF EXISTS trg_{counter}_ChangeLogUpdate" for counter, _, _ in CHANGE_LOG_COUNTERS
+    ) + ("DROP TABLE IF EXISTS ChangeLog",),
+}
+
+
+# ============================================
+# TABLO SÜRÜMLERİ (koşullu GET için)
+# ============================================
+# Her yazma ilgili satırın sayacını artırır; SQL Server'da trigger statement
+# başına bir kez, SQLite'ta satır başına çalışır
+DATA_VERSION_TABLES = ('Projects', 'Tasks', 'Employees', 'Departments', 'ProjectMembers',
+                       'TaskStatusHistory', 'Notifications')
+
+DATA_VERSIONS_UP = {
+    'mssql': (
+        """
+        IF OBJECT_ID('DataVersions', 'U') IS NULL
+            CREATE TABLE DataVersions (
+                table_name NVARCHAR(50) NOT NULL PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                updated_at DATETIME2(3) NOT NULL DEFAULT SYSUTCDATETIME()
+            )
+        """,
+    ) + tuple(
+        f"""
+        IF NOT EXISTS (SELECT 1 FROM DataVersions WHERE table_name = N'{table}')
+            INSERT INTO DataVersions (table_name) VALUES (N'{table}')
+        """ for table in DATA_VERSION_TABLES
+    ) + tuple(
+        f"""
+        CREATE OR ALTER TRIGGER trg_{table}_DataVersion
+        ON {table}
+        AFTER INSERT, UPDATE, DELETE
+        AS
+        BEGIN
+            SET NOCOUNT ON;
+            IF NOT EXISTS (SELECT 1 FROM inserted) AND NOT EXISTS (SELECT 1 FROM deleted) RETURN;
+            UPDATE DataVersions SET version = version + 1, updated_at = SYSUTCDATETIME()
+            WHERE table_name = N'{table}';
+        END
+        """ for table in DATA_VERSION_TABLES
+    ),
+    'sqlite': (
+        """
+        CREATE TABLE IF NOT EXISTS DataVersions (
+            table_name VARCHAR(50) NOT NULL PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )
+        """,
+    ) + tuple(
+        f"INSERT OR IGNORE INTO DataVersions (table_name) VALUES ('{table}')" for table in DATA_VERSION_TABLES
+    ) + tuple(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_DataVersion{event.title()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE DataVersions SET version = version + 1, updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            WHERE table_name = '{table}';
+        END
+        """ for table in DATA_VERSION_TABLES for event in ('INSERT', 'UPDATE', 'DELETE')
+    ),
+}
+
+DATA_VERSIONS_DOWN = {
+    'mssql': tuple(
+        f"DROP TRIGGER IF EXISTS trg_{table}_DataVersion" for table in DATA_VERSION_TABLES
+    ) + ("DROP TABLE IF EXISTS DataVersions",),
+    'sqlite': tuple(
+        f"DROP TRIGGER IF EXISTS trg_{table}_DataVersion{event}"
+        for table in DATA_VERSION_TABLES for event in ('Insert', 'Update', 'Delete')
+    ) + ("DROP TABLE IF EXISTS DataVersions",),
+}
+
+# ============================================
+# SAKLAMA / ARŞİV (retention.py)
+# ============================================
+ARCHIVE_UP = {
+    'mssql': (
+        """
+        IF OBJECT_ID('ArchiveBatches', 'U') IS NULL
+            CREATE TABLE ArchiveBatches (
+                batch_id INT IDENTITY(1,1) PRIMARY KEY,
+                table_name NVARCHAR(50) NOT NULL,
+                file_name NVARCHAR(100) NOT NULL,
+                first_id BIGINT NOT NULL,
+                last_id BIGINT NOT NULL,
+                row_count INT NOT NULL,
+                oldest_at DATETIME NOT NULL,
+                newest_at DATETIME NOT NULL,
+                archived_at DATETIME NOT NULL DEFAULT GETDATE(),
+                CONSTRAINT UQ_ArchiveBatches_file UNIQUE (table_name, file_name)
+            )
+        """,
+    ),
+    'sqlite': (
+        """
+        CREATE TABLE IF NOT EXISTS ArchiveBatches (
+            batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name VARCHAR(50) NOT NULL,
+            file_name VARCHAR(100) NOT NULL,
+            first_id INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            oldest_at DATETIME NOT NULL,
+            newest_at DATETIME NOT NULL,
+            archived_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+            UNIQUE (table_name, file_name)
+        )
+        """,
+    ),
+}
+
+ARCHIVE_DOWN = {
+    'mssql': ("DROP TABLE IF EXISTS ArchiveBatches",),
+    'sqlite': ("DROP TABLE IF EXISTS ArchiveBatches",),
+}
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'hot_path_indexes', "View, prosedür ve /reports join/filtre yolları için index'ler", (
+        # V_TaskDetails/sp_GetProjectTasks: project_id ile join ve filtre
+        Index('IX_Tasks_project_id', 'Tasks', ('project_id',), ('employee_id', 'status', 'due_date')),
+        # sp_GetEmployeeTaskSummary, sp_AddTask duplicate kontrolü, çalışan görev sayıları
+        Index('IX_Tasks_employee_id', 'Tasks', ('employee_id',),
+              ('project_id', 'status', 'due_date', 'task_title')),
+        # Dashboard sayaçları ve durum filtreleri
+        Index('IX_Tasks_status_due_date', 'Tasks', ('status', 'due_date')),
+        # Görev listesinin varsayılan sıralaması (due_date, task_id) ve yaklaşan deadline'lar
+        Index('IX_Tasks_due_date', 'Tasks', ('due_date',), ('status',)),
+        Index('IX_ProjectMembers_project_employee', 'ProjectMembers', ('project_id', 'employee_id'),
+              ('role', 'assigned_role')),
+        Index('IX_ProjectMembers_employee_id', 'ProjectMembers', ('employee_id',), ('project_id',)),
+        Index('IX_TaskStatusHistory_task_id', 'TaskStatusHistory', ('task_id', 'changed_at')),
+        Index('IX_Notifications_user_created', 'Notifications', ('user_id', 'created_at DESC'),
+              ('is_read', 'notification_type')),
+        # ON DELETE CASCADE ve görev bazlı bildirim aramaları
+        Index('IX_Notifications_task_id', 'Notifications', ('task_id',)),
+    )),
+    Migration(2, 'keyset_sort_indexes', "Proje ve çalışan listelerinin keyset sıralama sütunları", (
+        Index('IX_Projects_start_date', 'Projects', ('start_date', 'project_id')),
+        Index('IX_Employees_FirstName', 'Employees', ('FirstName', 'EmployeeID')),
+    )),
+    Migration(3, 'rollup_counters', "Proje/çalışan sayaçları için trigger ile güncellenen özet tablolar",
+              up=ROLLUP_UP, down=ROLLUP_DOWN),
+    Migration(4, 'scheduled_notifications', "Deadline/gecikme trigger'ları yerine zamanlanmış bildirim taraması",
+              up=SCANNER_UP, down=SCANNER_DOWN),
+    Migration(5, 'single_write_status_transitions',
+              "Durum geçişinde tek geçmiş kaydı ve en fazla bir bildirim, toplu geçiş prosedürü",
+              up=STATUS_TRANSITIONS_UP, down=STATUS_TRANSITIONS_DOWN),
+    Migration(6, 'bulk_task_creation', "Görevleri set tabanlı, tek transaction'da ekleyen sp_AddTasks",
+              up=BULK_TASKS_UP, down=BULK_TASKS_DOWN),
+    Migration(7, 'change_log', "Proje/görev/çalışan değişikliklerini /api/changes için kaydeden ChangeLog",
+              up=CHANGE_LOG_UP, down=CHANGE_LOG_DOWN),
+    Migration(8, 'data_versions', "Koşullu GET (ETag/Last-Modified) için trigger ile tutulan tablo sürümleri",
+              up=DATA_VERSIONS_UP, down=DATA_VERSIONS_DOWN),
+    Migration(9, 'unread_notifications', "Okunmamış bildirim sayacı ve toplu okundu işaretleme", (
+        Index('IX_Notifications_user_unread', 'Notifications', ('user_id', 'is_read')),
+    )),
+    Migration(10, 'retention_archive', "Eski geçmiş/bildirim satırlarının arşiv kaydı ve saklama index'leri", (
+        # Saklama işinin kesme tarihi taraması ve /reports'un zaman sıralaması
+        Index('IX_TaskStatusHistory_changed_at', 'TaskStatusHistory', ('changed_at',)),
+        Index('IX_Notifications_created_at', 'Notifications', ('created_at',)),
+        Index('IX_ChangeLog_changed_at', 'ChangeLog', ('changed_at',)),
+    ), up=ARCHIVE_UP, down=ARCHIVE_DOWN),
+]
+
+
+# ============================================
+# SQL ÜRETİMİ
+# ============================================
+def _column_name(column: str) -> str:
+    """'created_at DESC' -> 'created_at'"""
+    return column.split()[0]
+
+
+def create_index_sql(index: Index, dialect: str) -> str:
+    if dialect == 'sqlite':
+        keys = ', '.join(index.columns + tuple(c for c in index.include
+                                               if c not in map(_column_name, index.columns)))
+        return f"CREATE INDEX IF NOT EXISTS {index.name} ON {index.table} ({keys})"
+
+    sql = f"CREATE NONCLUSTERED INDEX {index.name} ON {index.table} ({', '.join(index.columns)})"
+    if index.include:
+        sql += f" INCLUDE ({', '.join(index.include)})"
+    return (f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index.name}' "
+            f"AND object_id = OBJECT_ID('{index.table}'))\n    {sql}")
+
+
+def drop_index_sql(index: Index, dialect: str) -> str:
+    if dialect == 'sqlite':
+        return f"DROP INDEX IF EXISTS {index.name}"
+    return f"DROP INDEX IF EXISTS {index.name} ON {index.table}"
+
+
+def version_table_sql(dialect: str) -> str:
+    if dialect == 'sqlite':
+        return """
+            CREATE TABLE IF NOT EXISTS SchemaMigrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at DATETIME DEFAULT (datetime('now', 'localtime'))
+            )
+        """
+    return """
+        IF OBJECT_ID('SchemaMigrations', 'U') IS NULL
+            CREATE TABLE SchemaMigrations (
+                version INT PRIMARY KEY,
+                name NVARCHAR(100) NOT NULL,
+                applied_at DATETIME NOT NULL DEFAULT GETDATE()
+            )
+    """
+
+
+def migration_script(dialect: str, migrations: Sequence[Migration] = MIGRATIONS) -> str:
+    """Tüm migration'ları elle çalıştırılabilir tek bir script olarak döndür"""
+    separator = "\nGO\n\n" if dialect == 'mssql' else ";\n\n"
+    parts = [textwrap.dedent(version_table_sql(dialect)).strip()]
+    if dialect == 'mssql':
+        parts.insert(0, "USE ProjectManagementDB2;")
+    for migration in migrations:
+        statements = [create_index_sql(index, dialect) for index in migration.indexes]
+        statements.extend(textwrap.dedent(sql).strip() for sql in migration.up.get(dialect, ()))
+        statements.append(f"INSERT INTO SchemaMigrations (version, name) "
+                          f"VALUES ({migration.version}, '{migration.name}')")
+        statements[0] = f"-- {migration.version:03d}_{migration.name}: {migration.description}\n" + statements[0]
+        parts.extend(statements)
+    return separator.join(parts) + separator.rstrip('\n') + '\n'
+
+
+# ============================================
+# UYGULAMA
+# ============================================
+def _dialect(db: DatabaseManager) -> str:
+    return 'sqlite' if db.backend.name == 'sqlite' else 'mssql'
+
+
+def applied_versions(db: DatabaseManager) -> List[int]:
+    """Uygulanmış migration sürümleri (artan sırada)"""
+    db.execute_update(version_table_sql(_dialect(db)))
+    with db.primary():
+        rows = db.execute_query("SELECT version FROM SchemaMigrations ORDER BY version")
+    return [row['version'] for row in rows]
+
+
+def migrate(db: DatabaseManager, target: Optional[int] = None) -> List[int]:
+    """
+    Eksik migration'ları sırayla uygula
+
+    Args:
+        db: Veritabanı yöneticisi
+        target: Bu sürüme kadar uygula (None ise en sonuncuya kadar)
+
+    Returns:
+        Bu çağrıda uygulanan sürümler
+    """
+    dialect = _dialect(db)
+    done = set(applied_versions(db))
+    applied = []
+
+    for migration in MIGRATIONS:
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+        for index in migration.indexes:
+            db.execute_update(create_index_sql(index, dialect))
+        for sql in migration.up.get(dialect, ()):
+            db.execute_update(sql)
+        db.execute_update("INSERT INTO SchemaMigrations (version, name) VALUES (?, ?)",
+                          (migration.version, migration.name))
+        applied.append(migration.version)
+        print(f"✓ Migration {migration.version:03d}_{migration.name} uygulandı")
+
+    if applied and dialect == 'sqlite':
+        # Sorgu planlayıcısı yeni index'lerin seçiciliğini bilsin
+        db.execute_update("ANALYZE")
+    return applied
+
+
+def rollback(db: DatabaseManager, target: int = 0) -> List[int]:
+    """target'tan büyük sürümleri ters sırayla geri al"""
+    dialect = _dialect(db)
+    done = set(applied_versions(db))
+    reverted = []
+
+    for migration in reversed(MIGRATIONS):
+        if migration.version not in done or migration.version <= target:
+            continue
+        for sql in migration.down.get(dialect, ()):
+            db.execute_update(sql)
+        for index in migration.indexes:
+            db.execute_update(drop_index_sql(index, dialect))
+        db.execute_update("DELETE FROM SchemaMigrations WHERE version = ?", (migration.version,))
+        reverted.append(migration.version)
+        print(f"✓ Migration {migration.version:03d}_{migration.name} geri alındı")
+    return reverted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sqlite', help="SQLite veritabanı dosyası (yoksa SQL Server)")
+    parser.add_argument('--print', dest='dialect', choices=('mssql', 'sqlite'),
+                        help="Uygulamadan yalnızca script'i yazdır")
+    parser.add_argument('--status', action='store_true')
+    parser.add_argument('--target', type=int)
+    parser.add_argument('--rollback', type=int, metavar='VERSION', help="Bu sürümün üstündekileri geri al")
+    args = parser.parse_args()
+
+    if args.dialect:
+        print(migration_script(args.dialect))
+        return
+
+    if args.sqlite:
+        from sqlite_backend import SQLiteBackend
+        db = DatabaseManager(backend=SQLiteBackend(args.sqlite))
+    else:
+        db = DatabaseManager(server='localhost\\SQLEXPRESS', database='ProjectManagementDB2')
+
+    try:
+        if args.status:
+            done = set(applied_versions(db))
+            for migration in MIGRATIONS:
+                mark = '✓' if migration.version in done else ' '
+                print(f"[{mark}] {migration.version:03d}_{migration.name} - {migration.description}")
+        elif args.rollback is not None:
+            rollback(db, args.rollback)
+        else:
+            if not migrate(db, args.target):
+                print("Uygulanacak migration yok")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from database import DatabaseManager
+
+
+# Görev son tarihini geçince (due_date < şimdi, sp_GetEmployeeTaskSummary ile aynı tanım)
+OVERDUE_QUERY = """
+    INSERT INTO Notifications (task_id, user_id, message, notification_type, created_at)
+    SELECT t.task_id, t.employee_id, N'Görev gecikti: ' + t.task_title, N'Gecikme', ?
+    FROM Tasks t
+    WHERE t.due_date >= ? AND t.due_date <= ?
+      AND t.status <> N'Tamamlandı'
+      AND NOT EXISTS (
+          SELECT 1 FROM Notifications n
+          WHERE n.task_id = t.task_id
+            AND n.notification_type = N'Gecikme'
+            AND n.created_at >= t.due_date
+      )
+"""
+
+# Son tarihi geçmiş haliyle yazılan görevler (eski trg_TaskOverdue'nun INSERT/UPDATE'te
+# yakaladığı durum): geçmiş tarihle eklenen, son tarihi geriye çekilen veya son tarihten
+# sonra yeniden açılan görevler. Son taramadan bu yana ChangeLog'a (migration 007) düşen
+# görevlerle sınırlıdır; son tarihinden beri gecikme bildirimi olanlar elenir.
+CHANGED_OVERDUE_QUERY = """
+    INSERT INTO Notifications (task_id, user_id, message, notification_type, created_at)
+    SELECT t.task_id, t.employee_id, N'Görev gecikti: ' + t.task_title, N'Gecikme', ?
+    FROM Tasks t
+    WHERE t.task_id IN (
+          SELECT c.row_id FROM ChangeLog c
+          WHERE c.table_name = N'Tasks' AND c.operation <> 'D' AND c.changed_at >= ?
+      )
+      AND t.due_date <= ?
+      AND t.status <> N'Tamamlandı'
+      AND NOT EXISTS (
+          SELECT 1 FROM Notifications n
+          WHERE n.task_id = t.task_id
+            AND n.notification_type = N'Gecikme'
+            AND n.created_at >= t.due_date
+      )
+"""
+
+# Son tarihe approaching_days gün kala (trg_DeadlineApproaching'deki DATEDIFF = 3)
+APPROACHING_QUERY = """
+    INSERT INTO Notifications (task_id, user_id, message, notification_type, created_at)
+    SELECT t.task_id, t.employee_id, N'Görev için deadline yaklaşıyor: ' + t.task_title,
+           N'Deadline Yaklaşıyor', ?
+    FROM Tasks t
+    WHERE t.due_date >= ? AND t.due_date <= ? AND t.due_date > ?
+      AND t.status <> N'Tamamlandı'
+      AND NOT EXISTS (
+          SELECT 1 FROM Notifications n
+          WHERE n.task_id = t.task_id
+            AND n.notification_type = N'Deadline Yaklaşıyor'
+            AND n.created_at >= ?
+      )
+"""
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class NotificationScanner:
+    """
+    Deadline ve gecikme bildirimlerini zamanlanmış olarak üreten tarayıcı
+
+    trg_DeadlineApproaching / trg_TaskOverdue yerine geçer: görev yazma
+    işlemleri bildirim maliyeti ödemez. Her çalıştırmada yalnızca son tarihi,
+    kaydedilen watermark'tan bu yana eşiği geçen görevler (due_date index'i
+    üzerinden aralık taraması) ele alınır; mevcut bildirimlerle çakışanlar
+    NOT EXISTS ile elenir ve kalanlar tek bir INSERT ... SELECT ile eklenir.
+
+    Son tarihi yazıldığı anda zaten geçmiş olan görevler bu pencereye
+    girmez; onlar ChangeLog'daki görev değişikliklerinden yakalanır. Okunan
+    son ChangeLog zamanı (veritabanı saati) SchedulerState'te ayrı bir
+    işaret olarak saklanır; commit'i geciken yazmalar kaçmasın diye bir
+    sonraki tarama işaretin change_settle kadar gerisinden başlar.
+
+    Pencerenin alt sınırı watermark'ın gün başıdır: son tarihler gün
+    hassasiyetinde olduğundan gün içinde eklenen görevler de aynı gün
+    içindeki sonraki çalıştırmalarda yakalanır. Adımlar tekrar
+    çalıştırılabilir (idempotent), yarıda kalan bir çalıştırma bildirimleri
+    çoğaltmaz.
+    """
+
+    WATERMARK_NAME = 'notification_scanner'
+    CHANGES_MARK_NAME = 'notification_scanner.changes'
+
+    def __init__(self, db: DatabaseManager, approaching_days: int = 3,
+                 initial_lookback: timedelta = timedelta(days=1),
+                 change_settle: timedelta = timedelta(minutes=1)):
+        """
+        Args:
+            db: Veritabanı yöneticisi
+            approaching_days: Son tarihe kaç gün kala uyarı verileceği
+            initial_lookback: Watermark yokken (ilk çalıştırma) ne kadar geriye bakılacağı
+            change_settle: ChangeLog taramasının son işaretten ne kadar geriden başlayacağı
+        """
+        self.db = db
+        self.approaching_days = approaching_days
+        self.initial_lookback = initial_lookback
+        self.change_settle = change_settle
+        self.last_result: Optional[Dict[str, Any]] = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_watermark(self, name: str = WATERMARK_NAME) -> Optional[datetime]:
+        return _as_datetime(self.db.execute_scalar(
+            "SELECT watermark FROM SchedulerState WHERE name = ?", (name,)))
+
+    def set_watermark(self, value: datetime, name: str = WATERMARK_NAME):
+        updated = self.db.execute_update(
+            "UPDATE SchedulerState SET watermark = ? WHERE name = ?", (value, name))
+        if not updated:
+            self.db.execute_update(
+                "INSERT INTO SchedulerState (name, watermark) VALUES (?, ?)", (name, value))
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Watermark'tan now'a kadar eşiği geçen görevler için bildirim üret
+
+        Returns:
+            Eklenen gecikme/yaklaşan bildirim sayıları, pencere ve süre
+        """
+        with self._lock, self.db.primary():
+            started = time.perf_counter()
+            now = (now or datetime.now()).replace(microsecond=0)
+            watermark = self.get_watermark() or now - self.initial_lookback
+
+            since = datetime.combine(watermark.date(), datetime.min.time())
+            ahead = timedelta(days=self.approaching_days)
+
+            # İşaret sorgulardan önce okunur: tarama sırasında yazılanlar bir sonraki çalıştırmaya kalır
+            changes_mark = self.get_watermark(self.CHANGES_MARK_NAME)
+            changes_since = changes_mark - self.change_settle if changes_mark else since
+            latest_change = _as_datetime(self.db.execute_scalar("SELECT MAX(changed_at) FROM ChangeLog"))
+
+            overdue = self.db.execute_update(OVERDUE_QUERY, (now, since, now))
+            overdue += self.db.execute_update(CHANGED_OVERDUE_QUERY, (now, changes_since, now))
+            approaching = self.db.execute_update(
+                APPROACHING_QUERY, (now, since + ahead, now + ahead, now, since))
+            self.set_watermark(now)
+            if latest_change is not None:
+                self.set_watermark(latest_change, self.CHANGES_MARK_NAME)
+
+            self.last_result = {
+                'overdue': overdue,
+                'approaching': approaching,
+                'since': since,
+                'until': now,
+                'elapsed': time.perf_counter() - started,
+            }
+            return self.last_result
+
+    def start(self, interval: float = 300.0):
+        """Tarayıcıyı arka plan thread'inde interval saniyede bir çalıştır"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,),
+                                        name='notification-scanner', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                if result['overdue'] or result['approaching']:
+                    print(f"Bildirim taraması: {result['overdue']} gecikme, "
+                          f"{result['approaching']} yaklaşan deadline")
+            except Exception as e:
+                # Yalnızca veritabanı hataları değil (ör. PoolTimeoutError): thread ölürse worker
+                # iş kilidini tutmaya devam eder, tarama yeniden başlatılana kadar durur
+                print(f"Bildirim taraması hatası: {type(e).__name__}: {e}")
+            self._stop.wait(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deadline/gecikme bildirim taramasını bir kez çalıştır")
+    parser.add_argument('--sqlite', help="SQLite veritabanı dosyası (yoksa SQL Server)")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLiteBackend
+        manager = DatabaseManager(backend=SQLiteBackend(args.sqlite))
+    else:
+        manager = DatabaseManager(server='localhost\\SQLEXPRESS', database='ProjectManagementDB2')
+
+    print(NotificationScanner(manager).run_once())
+    manager.close()
@@ -0,0 +1,261 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from database import DatabaseManager
+
+NOTIFICATION_COLUMNS = "n.notification_id, n.user_id, n.task_id, n.message, n.notification_type, n.created_at"
+
+# Kullanıcının okunmamış bildirimleri (IX_Notifications_user_unread, migration 009)
+UNREAD_COUNT_QUERY = "SELECT COUNT(*) FROM Notifications WHERE user_id = ? AND is_read = 0"
+
+
+class NotificationError(ValueError):
+    """Okundu işaretleme isteği hatalı olduğunda fırlatılır"""
+
+
+def unread_count(db: DatabaseManager, user_id: int) -> int:
+    return db.execute_scalar(UNREAD_COUNT_QUERY, (user_id,)) or 0
+
+
+def mark_read(db: DatabaseManager, user_id: int, ids: Optional[Sequence[Any]] = None,
+              up_to: Optional[Any] = None) -> int:
+    """
+    Kullanıcının bildirimlerini tek UPDATE ile okundu işaretle
+
+    Args:
+        ids: Belirli bildirimler
+        up_to: Bu id'ye kadar (dahil) tüm okunmamışlar; ids ve up_to verilmezse hepsi
+
+    Returns:
+        Okundu işaretlenen bildirim sayısı
+    """
+    query = "UPDATE Notifications SET is_read = 1 WHERE user_id = ? AND is_read = 0"
+    params: List[Any] = [user_id]
+    try:
+        if ids is not None:
+            if not isinstance(ids, (list, tuple)):
+                raise TypeError(ids)
+            ids = [int(notification_id) for notification_id in ids]
+            if not ids:
+                return 0
+            query += f" AND notification_id IN ({', '.join('?' for _ in ids)})"
+            params.extend(ids)
+        elif up_to is not None:
+            query += " AND notification_id <= ?"
+            params.append(int(up_to))
+    except (TypeError, ValueError):
+        raise NotificationError("ids bir id listesi, up_to bir id olmalı")
+    return db.execute_update(query, tuple(params))
+
+
+def format_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Server-Sent Events mesajı"""
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class Subscription:
+    """Bir SSE bağlantısının olay kuyruğu (NotificationHub.subscribe ile oluşturulur)"""
+
+    def __init__(self, user_id: int, max_events: int):
+        self.user_id = user_id
+        self.queue: 'queue.Queue' = queue.Queue(maxsize=max_events)
+        self.lagged = False  # kuyruk dolduğunda olay atlandı, sayaç yeniden okunmalı
+
+    def offer(self, event: str, data: Any, event_id: Optional[int] = None):
+        try:
+            self.queue.put_nowait((event, data, event_id))
+        except queue.Full:
+            self.lagged = True
+
+
+class NotificationHub:
+    """
+    Yeni bildirimleri tüm SSE bağlantılarına dağıtan tek paylaşımlı poller
+
+    Bağlı kullanıcı sayısından bağımsız olarak interval saniyede bir tek
+    sorgu çalışır: son görülen notification_id'den sonraki satırlar PK
+    üzerinden okunur ve user_id'ye göre ilgili bağlantıların kuyruklarına
+    dağıtılır. Bağlantı yokken hiç sorgu atılmaz.
+
+    IDENTITY değerleri commit sırasından önce dağıtıldığından, id dizisindeki
+    bir boşluktan sonraki satırlar boşluk ilk görüldükten settle saniye
+    sonrasına kadar bekletilir (ChangeFeed ile aynı yaklaşım).
+
+    Her bağlantı bir worker thread'i tutar. Bağlantılar max_age saniye sonra
+    ve close_streams() ile (worker kapanırken) sunucu tarafından kapatılır;
+    tarayıcının EventSource'u Last-Event-ID ile (başka bir worker'a) yeniden
+    bağlanır, böylece kapanan worker açık akışları beklemeden boşalır.
+    """
+
+    def __init__(self, db: DatabaseManager, interval: float = 2.0, settle: float = 5.0,
+                 batch: int = 500, heartbeat: float = 15.0, max_events: int = 256,
+                 max_age: float = 300.0):
+        """
+        Args:
+            db: Veritabanı yöneticisi
+            interval: Yeni bildirim sorgusu aralığı (saniye)
+            settle: id boşluğu sonrasındaki satırların bekletileceği süre (saniye)
+            batch: Bir sorguda okunacak en fazla bildirim
+            heartbeat: Olay yokken bağlantıyı canlı tutan yorum satırı aralığı (saniye)
+            max_events: Bağlantı başına kuyruktaki en fazla olay
+            max_age: Bağlantının sunucu tarafından kapatılacağı süre (saniye, 0: sınırsız)
+        """
+        self.db = db
+        self.interval = interval
+        self.settle = settle
+        self.batch = batch
+        self.heartbeat = heartbeat
+        self.max_events = max_events
+        self.max_age = max_age
+
+        self._closing = threading.Event()
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Subscription]] = {}
+        self._last_id: Optional[int] = None
+        self._gap_seen: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.polls = 0
+        self.delivered = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Kullanıcı için yeni bağlantı kaydı; poller gerekiyorsa başlatılır"""
+        subscription = Subscription(user_id, self.max_events)
+        with self._lock:
+            self._subscribers.setdefault(user_id, []).append(subscription)
+            if not (self._thread and self._thread.is_alive()):
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name='notification-hub', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscribers.pop(subscription.user_id, None)
+            if not self._subscribers:
+                self._last_id = None  # boşta kaçan bildirimler bağlanırken sayaçla alınır
+
+    def publish(self, user_id: int, event: str, data: Any):
+        """Kullanıcının tüm bağlantılarına olay gönder (ör. okundu işaretlemeden sonra sayaç)"""
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.offer(event, data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'users': len(self._subscribers),
+                'connections': sum(len(subs) for subs in self._subscribers.values()),
+                'polls': self.polls,
+                'delivered': self.delivered,
+            }
+
+    def poll_once(self) -> int:
+        """Yeni bildirimleri tek sorguyla oku ve dağıt; dağıtılan olay sayısı döner"""
+        with self._lock:
+            if not self._subscribers:
+                return 0
+            last_id = self._last_id
+
+        self.polls += 1
+        if last_id is None:
+            current = self.db.execute_scalar("SELECT ISNULL(MAX(notification_id), 0) FROM Notifications")
+            with self._lock:
+                if self._subscribers and self._last_id is None:
+                    self._last_id = current
+            return 0
+
+        rows = self.db.execute_query(
+            f"SELECT TOP ({self.batch}) {NOTIFICATION_COLUMNS} FROM Notifications n "
+            f"WHERE n.notification_id > ? ORDER BY n.notification_id", (last_id,))
+
+        now = time.monotonic()
+        expected = last_id + 1
+        ready = []
+        for row in rows:
+            if row['notification_id'] != expected:
+                if self._gap_seen is None:
+                    self._gap_seen = now
+                if now - self._gap_seen < self.settle:
+                    break
+            self._gap_seen = None
+            ready.append(row)
+            expected = row['notification_id'] + 1
+
+        delivered = 0
+        with self._lock:
+            if self._last_id != last_id:
+                return 0  # bu arada tüm bağlantılar kapandı
+            if ready:
+                self._last_id = ready[-1]['notification_id']
+            for row in ready:
+                for subscription in self._subscribers.get(row['user_id'], ()):
+                    subscription.offer('notification', row, row['notification_id'])
+                    delivered += 1
+        self.delivered += delivered
+        return delivered
+
+    def events(self, subscription: Subscription, initial: Sequence[str] = ()) -> Iterator[str]:
+        """Bağlantı, max_age veya close_streams() ile kapanana kadar SSE mesajları üret; abonelik silinir"""
+        deadline = time.monotonic() + self.max_age if self.max_age else None
+        try:
+            yield from initial
+            while not self._closing.is_set():
+                timeout = self.heartbeat
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.monotonic())
+                    if timeout <= 0:
+                        return
+                try:
+                    event, data, event_id = subscription.queue.get(timeout=timeout)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    return  # close_streams()
+                yield format_event(event, data, event_id)
+                if subscription.lagged:
+                    subscription.lagged = False
+                    yield format_event('unread', {'count': unread_count(self.db, subscription.user_id)})
+        finally:
+            self.unsubscribe(subscription)
+
+    def close_streams(self):
+        """Açık akışları bitir (worker kapanırken); yeni akışlar da hemen kapanır"""
+        self._closing.set()
+        with self._lock:
+            subscriptions = [subscription for subs in self._subscribers.values() for subscription in subs]
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait((None, None, None))
+            except queue.Full:
+                pass  # kuyruk doluysa akış bir sonraki olayda kapanır
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self.poll_once()
+            except Exception as e:
+                # Herhangi bir hata (ör. PoolTimeoutError) thread'i öldürmesin; açık akışlar beklemede kalır
+                print(f"Bildirim akışı hatası: {type(e).__name__}: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,197 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+
+class PaginationError(ValueError):
+    """Geçersiz sayfalama, filtre veya sıralama parametresi verildiğinde fırlatılır"""
+
+
+class KeysetPaginator:
+    """
+    Keyset (seek) sayfalama yardımcısı
+
+    OFFSET yerine son görülen satırın (sıralama değeri, birincil anahtar)
+    ikilisinden devam eder; böylece sayfa numarası büyüdükçe sorgu yavaşlamaz.
+    Sıralama sütunları ve filtreler whitelist ile sınırlandırılır, istemciden
+    gelen değerler SQL'e yalnızca parametre olarak girer.
+
+    SQL Server ve SQLite'ta NULL değerler en küçük kabul edilir: ASC sıralamada
+    başta, DESC sıralamada sonda yer alır. Cursor koşulu buna göre kurulur.
+    """
+
+    def __init__(self, source: str, key: Tuple[str, str],
+                 sort_columns: Dict[str, Tuple[str, str]], default_sort: str,
+                 filters: Optional[Dict[str, Tuple[str, str, Callable[[str], Any]]]] = None,
+                 columns: str = "*", default_order: str = 'asc',
+                 default_limit: int = 50, max_limit: int = 500):
+        """
+        Sayfalayıcıyı tanımla
+
+        Args:
+            source: FROM ifadesi (tablo, view veya JOIN)
+            key: Benzersiz anahtar için (SQL ifadesi, satırdaki sütun adı)
+            sort_columns: API adı -> (SQL ifadesi, satırdaki sütun adı)
+            default_sort: Parametre verilmezse kullanılan sıralama
+            filters: API parametresi -> (SQL ifadesi, operatör, dönüştürücü)
+            columns: SELECT listesi
+            default_order: 'asc' veya 'desc'
+            default_limit: Varsayılan sayfa boyutu
+            max_limit: İzin verilen en büyük sayfa boyutu
+        """
+        if default_sort not in sort_columns:
+            raise ValueError(f"Varsayılan sıralama whitelist'te yok: {default_sort}")
+
+        self.source = source
+        self.key = key
+        self.sort_columns = sort_columns
+        self.default_sort = default_sort
+        self.filters = filters or {}
+        self.columns = columns
+        self.default_order = default_order
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def build_query(self, args: Mapping[str, Any]) -> Tuple[str, List[Any], Dict[str, Any]]:
+        """
+        İstek parametrelerinden sayfa sorgusunu oluştur
+
+        Args:
+            args: İstek parametreleri (request.args gibi)
+
+        Returns:
+            (SQL, parametreler, sayfa bilgisi) üçlüsü
+
+        Raises:
+            PaginationError: Parametreler geçersizse
+        """
+        sort = args.get('sort') or self.default_sort
+        if sort not in self.sort_columns:
+            raise PaginationError(
+                f"Geçersiz sıralama sütunu: {sort} (izin verilenler: {', '.join(self.sort_columns)})"
+            )
+
+        order = (args.get('order') or self.default_order).lower()
+        if order not in ('asc', 'desc'):
+            raise PaginationError("order parametresi 'asc' veya 'desc' olmalı")
+
+        try:
+            limit = int(args.get('limit') or self.default_limit)
+        except ValueError:
+            raise PaginationError("limit parametresi sayı olmalı")
+        limit = max(1, min(limit, self.max_limit))
+
+        conditions = []
+        params: List[Any] = []
+
+        for name, (expr, operator, convert) in self.filters.items():
+            raw = args.get(name)
+            if raw in (None, ''):
+                continue
+            try:
+                value = convert(raw)
+            except ValueError:
+                raise PaginationError(f"Geçersiz filtre değeri: {name}={raw}")
+            conditions.append(f"{expr} {operator} ?")
+            params.append(value)
+
+        sort_expr = self.sort_columns[sort][0]
+        key_expr = self.key[0]
+
+        cursor = args.get('cursor')
+        if cursor:
+            last_value, last_key = self.decode_cursor(cursor, sort, order)
+            condition, cursor_params = self._seek_condition(sort_expr, key_expr, order, last_value, last_key)
+            conditions.append(condition)
+            params.extend(cursor_params)
+
+        direction = order.upper()
+        query = f"SELECT TOP ({limit + 1}) {self.columns} FROM {self.source}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {sort_expr} {direction}, {key_expr} {direction}"
+
+        return query, params, {'sort': sort, 'order': order, 'limit': limit}
+
+    def fetch_page(self, db, args: Mapping[str, Any], compact: bool = False) -> Dict[str, Any]:
+        """
+        Bir sayfa satır getir
+
+        Args:
+            db: DatabaseManager örneği
+            args: İstek parametreleri
+            compact: True ise items satır başına dict yerine ResultSet olur
+
+        Returns:
+            items, next_cursor, has_more, sort, order ve limit alanlarını içeren dictionary
+        """
+        query, params, page = self.build_query(args)
+        rows = db.execute_query(query, tuple(params) if params else None, compact=compact)
+
+        has_more = len(rows) > page['limit']
+        rows = rows[:page['limit']]
+
+        next_cursor = None
+        if has_more:
+            next_cursor = self.encode_cursor(rows[-1], page['sort'], page['order'])
+
+        page.update({'items': rows, 'next_cursor': next_cursor, 'has_more': has_more})
+        return page
+
+    def encode_cursor(self, row: Mapping[str, Any], sort: str, order: str) -> str:
+        """Son satırdan opak cursor üret"""
+        payload = {
+            's': sort,
+            'o': order,
+            'v': _to_json_value(row[self.sort_columns[sort][1]]),
+            'k': _to_json_value(row[self.key[1]])
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str, sort: str, order: str) -> Tuple[Any, Any]:
+        """Cursor'ı çöz ve isteğin sıralamasıyla uyumlu olduğunu doğrula"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            cursor_sort, cursor_order = payload['s'], payload['o']
+            value, key = payload['v'], payload['k']
+        except (ValueError, KeyError, TypeError):
+            raise PaginationError("Geçersiz cursor")
+
+        if cursor_sort != sort or cursor_order != order:
+            raise PaginationError("Cursor farklı bir sıralama için üretilmiş")
+        return value, key
+
+    @staticmethod
+    def _seek_condition(sort_expr: str, key_expr: str, order: str,
+                        last_value: Any, last_key: Any) -> Tuple[str, List[Any]]:
+        """Son görülen (değer, anahtar) ikilisinden sonraki satırlar için koşul"""
+        if order == 'asc':
+            if last_value is None:
+                # NULL'lar başta: kalan NULL'lar ve tüm NULL olmayanlar
+                return (f"(({sort_expr} IS NULL AND {key_expr} > ?) OR {sort_expr} IS NOT NULL)",
+                        [last_key])
+            return (f"({sort_expr} > ? OR ({sort_expr} = ? AND {key_expr} > ?))",
+                    [last_value, last_value, last_key])
+
+        if last_value is None:
+            # NULL'lar sonda: yalnızca kalan NULL'lar
+            return f"({sort_expr} IS NULL AND {key_expr} < ?)", [last_key]
+        return (f"({sort_expr} < ? OR ({sort_expr} = ? AND {key_expr} < ?) OR {sort_expr} IS NULL)",
+                [last_value, last_value, last_key])
+
+
+def parse_date(value: str) -> str:
+    """YYYY-MM-DD formatındaki filtre değerini doğrula"""
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+
+def _to_json_value(value: Any) -> Any:
+    """Cursor içine yazılacak değeri JSON uyumlu hale getir"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
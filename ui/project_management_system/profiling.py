@@ -0,0 +1,328 @@
+"""
+İstek bazlı profil çıkarma
+
+Yetkili bir kullanıcının isteği (X-Profile başlığı veya ?_profile=
+parametresi) ya da sample_every ile her N. istek profillenir:
+
+    sample    (varsayılan) istek thread'inin yığını interval saniyede bir
+              örneklenir; her örnek önceki örnekten beri geçen süreyle
+              ağırlıklanır ve db / rows / template / json / python
+              fazlarından birine atanır. Çıktı flamegraph.pl, speedscope
+              veya inferno'nun okuduğu collapsed stack (.folded) formatıdır;
+              değerler mikrosaniyedir.
+    cprofile  deterministik cProfile; .prof dosyası (snakeviz, gprof2dot)
+
+Her profil için ayrıca faz süreleri, ölçülen DB süresi/round trip, şablon
+süresi ve en pahalı fonksiyonları içeren bir .json özeti yazılır; dizinde
+en fazla max_files profil tutulur.
+
+Kapalıyken (ne yetkili kullanıcı/token ne örnekleme tanımlı) istek başına
+maliyet tek bir bayrak kontrolüdür.
+
+Kullanım:
+    python profiling.py profiles/            # son profillerin özet tablosu
+"""
+import cProfile
+import hmac
+import itertools
+import json
+import linecache
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PHASES = ('db', 'rows', 'template', 'json', 'python')
+
+# Bu dosyalardaki yığın çerçeveleri veritabanı fazına sayılır
+DB_FILES = ('database.py', 'sqlite_backend.py', 'connection_pool.py', 'backends.py')
+
+# database.py'de sonuç satırlarını dönüştüren satırlar (rows fazı)
+ROW_CONVERSION = ('dict(zip(', 'ResultSet(', 'dict(row)')
+
+_SEPARATOR = os.sep
+
+
+def _phase_of(frame_path: str) -> Optional[str]:
+    name = os.path.basename(frame_path)
+    if name in DB_FILES or f'{_SEPARATOR}pyodbc' in frame_path or f'{_SEPARATOR}sqlite3{_SEPARATOR}' in frame_path:
+        return 'db'
+    if (f'{_SEPARATOR}jinja2{_SEPARATOR}' in frame_path or frame_path.endswith('.html')
+            or frame_path.endswith(f'flask{_SEPARATOR}templating.py')):
+        return 'template'
+    if f'{_SEPARATOR}json{_SEPARATOR}' in frame_path:
+        return 'json'
+    return None
+
+
+def classify(stack: List[Tuple[str, str, int]]) -> str:
+    """
+    Yığını (dıştan içe (dosya, fonksiyon, satır)) faza ata
+
+    İçten dışa ilk tanınan çerçeve belirler: şablon içinden yapılan bir
+    sorgu db, sorgu sonucunun dict'e çevrildiği satır rows sayılır.
+    """
+    for path, _, line in reversed(stack):
+        phase = _phase_of(path)
+        if phase == 'db' and os.path.basename(path) == 'database.py':
+            source = linecache.getline(path, line)
+            if any(marker in source for marker in ROW_CONVERSION):
+                return 'rows'
+        if phase:
+            return phase
+    return 'python'
+
+
+class ProfileSession:
+    """Profillenen tek bir istek"""
+
+    def __init__(self, mode: str, trigger: str, thread_id: int, info: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:8]
+        self.mode = mode
+        self.trigger = trigger
+        self.thread_id = thread_id
+        self.info = info
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.last_sample = self.started
+
+        self.stacks: Counter = Counter()  # (faz, çerçeveler) -> saniye
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.samples = 0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self._template_started = 0.0
+        self.profile = cProfile.Profile() if mode == 'cprofile' else None
+
+    def sample(self, frame, now: float):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_name, frame.f_lineno))
+            frame = frame.f_back
+        stack.reverse()
+        # Flask/werkzeug çerçeveleri view'a kadar atlanır
+        for i, (path, name, _) in enumerate(stack):
+            if name == 'dispatch_request' and path.endswith(f'flask{_SEPARATOR}app.py'):
+                stack = stack[i + 1:]
+                break
+
+        weight = now - self.last_sample
+        self.last_sample = now
+        phase = classify(stack)
+        self.phases[phase] += weight
+        self.stacks[(phase, tuple((path, name) for path, name, _ in stack))] += weight
+        self.samples += 1
+
+
+class RequestProfiler:
+    """İstek profillerini başlatan, örnekleyen ve dosyaya yazan yönetici"""
+
+    def __init__(self, directory: str, sample_every: int = 0, users: Iterable[int] = (),
+                 token: Optional[str] = None, interval: float = 0.001, max_files: int = 200,
+                 max_active: int = 2):
+        """
+        Args:
+            directory: Profil dosyalarının yazılacağı dizin
+            sample_every: Her N. isteği profille (0: kapalı)
+            users: X-Profile / ?_profile= ile profil isteyebilecek kullanıcı id'leri
+            token: X-Profile-Token başlığıyla profil isteme anahtarı (oturumsuz istemciler)
+            interval: Örnekleme aralığı (saniye)
+            max_files: Dizinde tutulacak en fazla profil
+            max_active: Aynı anda profillenebilecek en fazla istek (fazlası atlanır)
+        """
+        self.directory = directory
+        self.sample_every = sample_every
+        self.users = set(users)
+        self.token = token
+        self.interval = interval
+        self.max_files = max_files
+        self.max_active = max_active
+        self.enabled = bool(sample_every or self.users or token)
+
+        self._lock = threading.Lock()
+        self._active: Dict[int, ProfileSession] = {}
+        self._counter = itertools.count(1)
+        self._sampler: Optional[threading.Thread] = None
+
+        self.captured = 0
+        self.skipped = 0
+
+    # ============================================
+    # BAŞLATMA / BİTİRME
+    # ============================================
+    def trigger(self, headers, args, user_id: Optional[int]) -> Optional[Tuple[str, str]]:
+        """İstek profillenecekse (mod, tetikleyici), aksi halde None"""
+        if not self.enabled:
+            return None
+        requested = headers.get('X-Profile') or args.get('_profile')
+        if requested and (user_id in self.users or (
+                self.token and hmac.compare_digest(headers.get('X-Profile-Token', ''), self.token))):
+            return ('cprofile' if requested == 'cprofile' else 'sample'), 'request'
+        if self.sample_every and next(self._counter) % self.sample_every == 0:
+            return 'sample', 'sampled'
+        return None
+
+    def start(self, mode: str, trigger: str, **info) -> Optional[ProfileSession]:
+        thread_id = threading.get_ident()
+        with self._lock:
+            if len(self._active) >= self.max_active or thread_id in self._active:
+                self.skipped += 1
+                return None
+            session = ProfileSession(mode, trigger, thread_id, info)
+            self._active[thread_id] = session
+            if mode == 'sample' and not (self._sampler and self._sampler.is_alive()):
+                self._sampler = threading.Thread(target=self._sample_loop, args=(sys.getswitchinterval(),),
+                                                 name='request-profiler', daemon=True)
+                self._sampler.start()
+        if session.profile:
+            session.profile.enable()
+        return session
+
+    def finish(self, session: ProfileSession, status: int, db_time: float = 0.0,
+               round_trips: int = 0) -> Optional[Dict[str, Any]]:
+        """Profili durdur, dosyalarını yaz ve özetini döndür (ikinci çağrı None döner)"""
+        if session.profile:
+            session.profile.disable()
+        with self._lock:
+            if self._active.get(session.thread_id) is not session:
+                return None
+            del self._active[session.thread_id]
+        elapsed = time.perf_counter() - session.started
+        if session.mode == 'sample':
+            # Son örnekten bitişe kadarki süre python fazına sayılır
+            session.phases['python'] += max(0.0, session.started + elapsed - session.last_sample)
+
+        summary = {
+            'id': session.id,
+            'mode': session.mode,
+            'trigger': session.trigger,
+            'started_at': session.started_at.isoformat(timespec='milliseconds'),
+            **session.info,
+            'status': status,
+            'wall_ms': round(elapsed * 1000, 2),
+            'measured': {
+                'db_ms': round(db_time * 1000, 2),
+                'round_trips': round_trips,
+                'template_ms': round(session.template_time * 1000, 2),
+            },
+        }
+        try:
+            summary.update(self._write(session, summary))
+        except OSError as e:
+            print(f"Profil yazılamadı: {e}")
+            return summary
+        self.captured += 1
+        return summary
+
+    def _write(self, session: ProfileSession, summary: Dict[str, Any]) -> Dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        route = (summary.get('route') or 'unmatched').strip('/').replace('/', '_').replace('<', '').replace('>', '')
+        stem = f"{session.started_at:%Y%m%d-%H%M%S}-{route or 'index'}-{session.id}"
+        extra: Dict[str, Any] = {'file': stem}
+
+        if session.profile:
+            stats = pstats.Stats(session.profile)
+            stats.dump_stats(os.path.join(self.directory, f'{stem}.prof'))
+            extra['top'] = [
+                {'function': f"{name} ({os.path.basename(path)}:{line})", 'calls': calls,
+                 'self_ms': round(tottime * 1000, 2), 'cumulative_ms': round(cumtime * 1000, 2)}
+                for (path, line, name), (_, calls, tottime, cumtime, _) in
+                sorted(stats.stats.items(), key=lambda item: -item[1][3])[:25]]
+        else:
+            self_time: Counter = Counter()
+            with open(os.path.join(self.directory, f'{stem}.folded'), 'w', encoding='utf-8') as folded:
+                for (phase, frames), weight in session.stacks.most_common():
+                    names = [f"{name} ({os.path.basename(path)})" for path, name in frames]
+                    folded.write(f"{';'.join([phase] + names)} {max(1, round(weight * 1e6))}\n")
+                    if names:
+                        self_time[names[-1]] += weight
+            extra['samples'] = session.samples
+            extra['phases_ms'] = {phase: round(value * 1000, 2) for phase, value in session.phases.items()}
+            extra['top'] = [{'function': name, 'self_ms': round(weight * 1000, 2)}
+                            for name, weight in self_time.most_common(25)]
+
+        with open(os.path.join(self.directory, f'{stem}.json'), 'w', encoding='utf-8') as out:
+            json.dump(dict(summary, **extra), out, ensure_ascii=False, indent=2)
+        self._prune()
+        return extra
+
+    def _prune(self):
+        """Dizinde max_files'tan fazla profil varsa en eskilerini sil"""
+        summaries = sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+        for name in summaries[:max(0, len(summaries) - self.max_files)]:
+            stem = name[:-len('.json')]
+            for extension in ('.json', '.folded', '.prof'):
+                path = os.path.join(self.directory, stem + extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # ============================================
+    # ÖRNEKLEME VE ŞABLON ZAMANLAMASI
+    # ============================================
+    def _sample_loop(self, switch_interval: float):
+        # GIL varsayılan olarak 5 ms'de bir el değiştirir; CPU'da çalışan istek
+        # thread'i örnekleyiciyi bekletmesin diye profil sürerken kısaltılır
+        sys.setswitchinterval(min(switch_interval, self.interval))
+        while True:
+            time.sleep(self.interval)
+            # Kilit altında: finish() örnekleme sürerken özeti okumasın
+            with self._lock:
+                sessions = [session for session in self._active.values() if session.mode == 'sample']
+                if not sessions:
+                    self._sampler = None
+                    sys.setswitchinterval(switch_interval)
+                    return
+                frames = sys._current_frames()
+                now = time.perf_counter()
+                for session in sessions:
+                    frame = frames.get(session.thread_id)
+                    if frame is not None:
+                        session.sample(frame, now)
+                del frames
+
+    def template_started(self, *args, **kwargs):
+        """Flask before_render_template sinyali"""
+        session = self._active.get(threading.get_ident()) if self._active else None
+        if session is not None:
+            if not session.template_depth:
+                session._template_started = time.perf_counter()
+            session.template_depth += 1
+
+    def template_finished(self, *args, **kwargs):
+        """Flask template_rendered sinyali"""
+        session = self._active.get(threading.get_ident()) if self._active else None
+        if session is not None and session.template_depth:
+            session.template_depth -= 1
+            if not session.template_depth:
+                session.template_time += time.perf_counter() - session._template_started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'enabled': self.enabled, 'active': len(self._active),
+                    'captured': self.captured, 'skipped': self.skipped}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kaydedilmiş profillerin özet tablosu")
+    parser.add_argument('directory', nargs='?', default='profiles')
+    parser.add_argument('--limit', type=int, default=30)
+    args = parser.parse_args()
+
+    names = sorted(name for name in os.listdir(args.directory) if name.endswith('.json'))[-args.limit:]
+    print(f"{'zaman':<20}{'route':<28}{'mod':<9}{'ms':>9}" + ''.join(f"{phase:>10}" for phase in PHASES))
+    for name in names:
+        with open(os.path.join(args.directory, name), encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+        # cProfile özetinde örneklenmiş faz yok, ölçülen DB/şablon süreleri gösterilir
+        phases = summary.get('phases_ms') or {'db': summary['measured']['db_ms'],
+                                              'template': summary['measured']['template_ms']}
+        print(f"{summary['started_at'][:19]:<20}{str(summary.get('route'))[:27]:<28}{summary['mode']:<9}"
+              f"{summary['wall_ms']:>9.1f}" + ''.join(f"{phases.get(phase, 0):>10.1f}" for phase in PHASES))
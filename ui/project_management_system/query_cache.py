@@ -0,0 +1,182 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+# View'lar ve trigger'la güncellenen özet tablolar: okunduklarında bağlı oldukları
+# tablolara yapılan yazmalar da önbelleği geçersiz kılar (sql/views.sql, migration 003)
+DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'v_taskdetails': ('tasks', 'employees', 'projects'),
+    'v_upcomingdeadlines': ('tasks', 'employees', 'projects'),
+    'v_completedtasks': ('tasks', 'employees', 'projects'),
+    'v_projectmembers': ('projectmembers', 'projects', 'employees', 'departments'),
+    'v_departmenttaskcount': ('tasks', 'employees', 'departments'),
+    'vw_taskfulldetails': ('tasks', 'projects', 'employees', 'departments', 'projectmembers'),
+    'vw_upcomingdeadlines': ('tasks', 'employees', 'projects'),
+    'vw_completedtasks': ('tasks', 'employees', 'projects'),
+    'vw_projectmembersdetails': ('projectmembers', 'employees', 'projects', 'departments'),
+    'vw_departmenttaskcount': ('departments', 'employees', 'tasks'),
+    'projectstats': ('projects', 'tasks', 'projectmembers'),
+    'employeestats': ('employees', 'tasks', 'projectmembers'),
+}
+
+# Prosedürlerin yazdığı tablolar; listede olmayan bir prosedür tüm önbelleği boşaltır
+PROCEDURE_WRITES: Dict[str, Tuple[str, ...]] = {
+    'sp_addtask': ('tasks', 'taskstatushistory'),
+    'sp_addtasks': ('tasks', 'taskstatushistory'),
+    'sp_updatetaskstatus': ('tasks', 'taskstatushistory', 'notifications'),
+    'sp_applytaskstatuschanges': ('tasks', 'taskstatushistory', 'notifications'),
+    'sp_assignemployeetoproject': ('projectmembers',),
+    'sp_getprojecttasks': (),
+    'sp_getemployeetasksummary': (),
+}
+
+_TABLE_REF = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|MERGE|TABLE)\s+(?:\[?dbo\]?\.)?\[?([A-Za-z_]\w*)", re.IGNORECASE)
+_NOT_TABLE = {'select', 'set', 'where', 'openjson', 'json_each', 'values'}
+
+
+def tables_in(query: str) -> FrozenSet[str]:
+    """Sorgunun okuduğu/yazdığı tablo ve view adları (küçük harf, view bağımlılıkları dahil)"""
+    names: Set[str] = set()
+    for name in _TABLE_REF.findall(query):
+        name = name.lower()
+        if name in _NOT_TABLE:
+            continue
+        names.add(name)
+        names.update(DEPENDENCIES.get(name, ()))
+    return frozenset(names)
+
+
+class QueryCache:
+    """
+    Okuma sorguları için LRU + TTL sonuç önbelleği
+
+    Anahtar (SQL, parametreler) ikilisidir; her kayıt sorgunun okuduğu
+    tablolarla etiketlenir. Bir tabloya yazıldığında invalidate() o tabloyu
+    okuyan tüm kayıtları siler. Yazma ile eşzamanlı çalışan bir okuma,
+    başladığından beri etiketlerinden biri geçersiz kılındıysa sonucunu
+    önbelleğe yazmaz (begin() / put() token'ı ile).
+
+    Önbellek process içindedir. versions verilirse her kayıt, sorgudan önce
+    okunan tablo sürümleriyle (DataVersions, migration 008) damgalanır ve
+    okurken güncel sürümlerle karşılaştırılır: başka process'lerin veya
+    doğrudan SQL ile yapılan yazmalar da kaydı hemen geçersiz kılar. versions
+    yoksa bu yazmaların etkisi en geç ttl saniye sonra görülür.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 60.0,
+                 versions: Optional[Callable[[FrozenSet[str]], Optional[Hashable]]] = None):
+        """
+        Args:
+            max_entries: En fazla kayıt sayısı (aşılınca en eski kullanılan silinir)
+            ttl: Kaydın geçerlilik süresi (saniye)
+            versions: Tablo etiketlerinin güncel sürüm damgasını döndüren fonksiyon
+                (None dönerse sürümü bilinmeyen sorgu önbelleğe alınmaz)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.versions = versions
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float, FrozenSet[str], Hashable]]' = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    def stamp(self, tables: FrozenSet[str]) -> Optional[Hashable]:
+        """Etiketlerin güncel sürüm damgası; versions yoksa (), sürüm bilinmiyorsa None"""
+        return self.versions(tables) if self.versions is not None else ()
+
+    def get(self, key: Hashable, stamp: Hashable = ()) -> Tuple[bool, Any]:
+        """(bulundu mu, değer) döndür; süresi dolmuş veya damgası eskimiş kayıt silinir"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic() and entry[3] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                if entry[3] != stamp:
+                    self.stale += 1  # başka bir process'in yazması
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def begin(self, tables: Iterable[str]) -> Tuple:
+        """Sorgu çalıştırılmadan önce alınan token (put() ile verilir)"""
+        with self._lock:
+            return self._epoch, tuple(self._versions.get(table, 0) for table in sorted(tables))
+
+    def put(self, key: Hashable, value: Any, tables: FrozenSet[str], token: Optional[Tuple] = None,
+            stamp: Hashable = ()):
+        """
+        Sonucu önbelleğe yaz
+
+        stamp sorgudan önce okunmalıdır: sorgu sürerken yapılan bir yazma
+        kaydı eski damgayla saklar, bir sonraki okuma onu eskimiş bulur.
+        """
+        with self._lock:
+            if token is not None and token != (self._epoch, tuple(self._versions.get(table, 0)
+                                                                  for table in sorted(tables))):
+                return  # sorgu sürerken ilgili tablolara yazıldı, sonuç eski olabilir
+
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tables, stamp)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tables: str):
+        """Verilen tabloları okuyan tüm kayıtları sil"""
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        """Tüm kayıtları sil (yazdığı tablolar bilinmeyen işlemlerden sonra)"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self._epoch += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'stale': self.stale,
+            }
+
+    def _remove(self, key: Hashable):
+        tables = self._entries.pop(key)[2]
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
@@ -0,0 +1,338 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+slow_query_logger = logging.getLogger('query_metrics.slow')
+
+# Gecikme histogramı kova sınırları (saniye)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route başına round trip histogramı kova sınırları
+ROUND_TRIP_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(query: str) -> str:
+    """
+    Sorgunun literal değerlerden arındırılmış normal biçimi
+
+    Aynı şablondan üretilen sorgular (farklı sayı/metin değerleri, farklı
+    uzunlukta IN listeleri) aynı parmak izine düşer.
+    """
+    text = _STRING_LITERAL.sub('?', query)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _IN_LIST.sub('(?+)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def estimate_bytes(rows: Iterable[Any]) -> int:
+    """Satırlardaki değerlerin yaklaşık veri boyutu (bayt)"""
+    total = 0
+    for row in rows:
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, (str, bytes, bytearray)):
+                total += len(value)
+            else:
+                # Sayı, tarih vb. sabit boyutlu değerler
+                total += 8
+    return total
+
+
+class _Histogram:
+    """Sabit kovalı kümülatif histogram (Prometheus uyumlu)"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        result, running = [], 0
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Kova sınırlarından yaklaşık yüzdelik (üst sınır)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, cumulative in zip(self.buckets, self.cumulative()):
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+
+class _StatementStats:
+    """Bir sorgu parmak izi için biriken ölçümler"""
+
+    __slots__ = ('query_id', 'statement', 'latency', 'rows', 'bytes', 'errors', 'max_time')
+
+    def __init__(self, query_id: str, statement: str):
+        self.query_id = query_id
+        self.statement = statement
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.rows = 0
+        self.bytes = 0
+        self.errors = 0
+        self.max_time = 0.0
+
+
+class QueryMetrics:
+    """
+    Veritabanı katmanı için sorgu ölçümleri
+
+    Her sorgunun süresi, döndürdüğü satır ve yaklaşık bayt sayısı parmak izi
+    (fingerprint) bazında toplanır. Eşik değerini aşan sorgular slow-query
+    loguna yazılır. Listener'lar her sorguda çağrılır (örn: Flask g üzerinde
+    istek başına round trip sayacı).
+    """
+
+    def __init__(self, slow_query_threshold: Optional[float] = 0.5, track_bytes: bool = True,
+                 slow_log_size: int = 100):
+        """
+        Args:
+            slow_query_threshold: Bu süreyi (saniye) aşan sorgular loglanır (None ise kapalı)
+            track_bytes: Sonuç boyutunu tahmin et (büyük sonuçlarda ek CPU maliyeti vardır)
+            slow_log_size: Bellekte tutulacak son yavaş sorgu sayısı
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.track_bytes = track_bytes
+
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._routes: Dict[str, _Histogram] = {}
+        self._route_latency: Dict[str, _Histogram] = {}
+        self._slow_queries = deque(maxlen=slow_log_size)
+        self._listeners: List[Callable[[str, float, int], None]] = []
+        self.started_at = time.time()
+
+    def add_listener(self, listener: Callable[[str, float, int], None]):
+        """Her sorgudan sonra (sorgu, süre, satır sayısı) ile çağrılacak fonksiyon ekle"""
+        self._listeners.append(listener)
+
+    def record(self, query: str, elapsed: float, rows: int = 0, nbytes: int = 0,
+               failed: bool = False, params: Any = None):
+        """
+        Bir round trip'in ölçümünü kaydet
+
+        Args:
+            query: Çalıştırılan SQL
+            elapsed: Duvar saati süresi (saniye)
+            rows: Okunan veya etkilenen satır sayısı
+            nbytes: Okunan verinin yaklaşık boyutu
+            failed: Sorgu hata ile bittiyse True
+            params: Sorgu parametreleri; slow-query loguna yalnızca tipleri yazılır
+                (değerler e-posta gibi kişisel veri içerebilir)
+        """
+        stats = self._get_stats(query)
+
+        with self._lock:
+            stats.latency.observe(elapsed)
+            stats.rows += max(rows, 0)
+            stats.bytes += nbytes
+            if failed:
+                stats.errors += 1
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+
+        if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+            entry = {
+                'query_id': stats.query_id,
+                'statement': stats.statement,
+                'elapsed_ms': round(elapsed * 1000, 2),
+                'rows': rows,
+                'param_types': _param_types(params),
+                'at': datetime.now().isoformat(timespec='seconds')
+            }
+            with self._lock:
+                self._slow_queries.append(entry)
+            slow_query_logger.warning("Yavaş sorgu (%.1f ms, %d satır) [%s]: %s",
+                                      elapsed * 1000, rows, stats.query_id, stats.statement)
+
+        for listener in self._listeners:
+            listener(query, elapsed, rows)
+
+    def record_request(self, route: str, round_trips: int, elapsed: float):
+        """Bir HTTP isteğinin route, round trip sayısı ve süresini kaydet"""
+        with self._lock:
+            if route not in self._routes:
+                self._routes[route] = _Histogram(ROUND_TRIP_BUCKETS)
+                self._route_latency[route] = _Histogram(LATENCY_BUCKETS)
+            self._routes[route].observe(round_trips)
+            self._route_latency[route].observe(elapsed)
+
+    def reset(self):
+        """Tüm ölçümleri sıfırla"""
+        with self._lock:
+            self._statements.clear()
+            self._routes.clear()
+            self._route_latency.clear()
+            self._slow_queries.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Ölçümlerin JSON'a çevrilebilir özeti
+
+        Returns:
+            statements, routes ve slow_queries alanlarını içeren dictionary
+        """
+        with self._lock:
+            statements = [{
+                'query_id': s.query_id,
+                'statement': s.statement,
+                'count': s.latency.count,
+                'errors': s.errors,
+                'total_ms': round(s.latency.total * 1000, 2),
+                'avg_ms': round(s.latency.total * 1000 / s.latency.count, 2) if s.latency.count else 0,
+                'max_ms': round(s.max_time * 1000, 2),
+                'p50_ms': _ms(s.latency.quantile(0.50)),
+                'p95_ms': _ms(s.latency.quantile(0.95)),
+                'p99_ms': _ms(s.latency.quantile(0.99)),
+                'rows': s.rows,
+                'bytes': s.bytes,
+            } for s in self._statements.values()]
+
+            routes = [{
+                'route': route,
+                'requests': hist.count,
+                'round_trips_total': int(hist.total),
+                'round_trips_avg': round(hist.total / hist.count, 2) if hist.count else 0,
+                'p50_ms': _ms(self._route_latency[route].quantile(0.50)),
+                'p95_ms': _ms(self._route_latency[route].quantile(0.95)),
+                'p99_ms': _ms(self._route_latency[route].quantile(0.99)),
+            } for route, hist in self._routes.items()]
+
+            slow_queries = list(self._slow_queries)
+
+        statements.sort(key=lambda s: s['total_ms'], reverse=True)
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'slow_query_threshold_ms': (self.slow_query_threshold * 1000
+                                        if self.slow_query_threshold is not None else None),
+            'statements': statements,
+            'routes': routes,
+            'slow_queries': slow_queries,
+        }
+
+    def to_prometheus(self, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        Ölçümleri Prometheus text formatında döndür
+
+        Args:
+            extra_gauges: Ek olarak yazılacak gauge'lar (örn: havuz istatistikleri)
+        """
+        lines = [
+            '# HELP db_query_duration_seconds Sorgu süresi (parmak izi bazında)',
+            '# TYPE db_query_duration_seconds histogram',
+        ]
+
+        with self._lock:
+            statements = list(self._statements.values())
+            for s in statements:
+                labels = f'query="{s.query_id}"'
+                for bound, cumulative in zip(s.latency.buckets, s.latency.cumulative()):
+                    lines.append(f'db_query_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'db_query_duration_seconds_bucket{{{labels},le="+Inf"}} {s.latency.count}')
+                lines.append(f'db_query_duration_seconds_sum{{{labels}}} {s.latency.total:.6f}')
+                lines.append(f'db_query_duration_seconds_count{{{labels}}} {s.latency.count}')
+
+            lines += ['# HELP db_query_rows_total Okunan/etkilenen satır sayısı',
+                      '# TYPE db_query_rows_total counter']
+            lines += [f'db_query_rows_total{{query="{s.query_id}"}} {s.rows}' for s in statements]
+
+            lines += ['# HELP db_query_bytes_total Okunan verinin yaklaşık boyutu',
+                      '# TYPE db_query_bytes_total counter']
+            lines += [f'db_query_bytes_total{{query="{s.query_id}"}} {s.bytes}' for s in statements]
+
+            lines += ['# HELP db_query_errors_total Hata ile biten sorgu sayısı',
+                      '# TYPE db_query_errors_total counter']
+            lines += [f'db_query_errors_total{{query="{s.query_id}"}} {s.errors}' for s in statements]
+
+            lines += ['# HELP db_query_info Parmak izi ile sorgu metni eşlemesi',
+                      '# TYPE db_query_info gauge']
+            lines += [f'db_query_info{{query="{s.query_id}",statement="{_escape(s.statement)}"}} 1'
+                      for s in statements]
+
+            lines += ['# HELP http_request_db_round_trips İstek başına veritabanı round trip sayısı',
+                      '# TYPE http_request_db_round_trips histogram']
+            for route, hist in self._routes.items():
+                labels = f'route="{_escape(route)}"'
+                for bound, cumulative in zip(hist.buckets, hist.cumulative()):
+                    lines.append(f'http_request_db_round_trips_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_db_round_trips_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f'http_request_db_round_trips_sum{{{labels}}} {int(hist.total)}')
+                lines.append(f'http_request_db_round_trips_count{{{labels}}} {hist.count}')
+
+        for name, value in (extra_gauges or {}).items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _get_stats(self, query: str) -> _StatementStats:
+        """Sorgunun parmak izine ait istatistik kaydını bul veya oluştur"""
+        # Aynı SQL metni için normalleştirme bir kez yapılır
+        key = self._fingerprints.get(query)
+        if key is None:
+            key = fingerprint(query)
+            if len(self._fingerprints) < 10000:
+                self._fingerprints[query] = key
+
+        stats = self._statements.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._statements.get(key)
+                if stats is None:
+                    query_id = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+                    stats = _StatementStats(query_id, key)
+                    self._statements[key] = stats
+        return stats
+
+
+def _param_types(params: Any) -> Optional[List[str]]:
+    """Parametre değerleri yerine tipleri (örn: ['str', 'int'])"""
+    if not params:
+        return None
+    values = params.values() if isinstance(params, dict) else params
+    if isinstance(values, (str, bytes)):
+        values = (values,)
+    return [type(value).__name__ for value in values]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    if seconds is None:
+        return None
+    if seconds == float('inf'):
+        return None
+    return round(seconds * 1000, 2)
+
+
+def _escape(value: str) -> str:
+    """Prometheus etiket değeri kaçışları"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
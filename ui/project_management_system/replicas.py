@@ -0,0 +1,210 @@
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from connection_pool import ConnectionPool
+
+# Primary'deki her yazmada artan konum: DataVersions sayaçlarının toplamı (migration 008).
+# Replikanın konumu primary'ninkine ulaştıysa o ana kadarki tüm yazmaları görmüştür.
+POSITION_QUERY = "SELECT ISNULL(SUM(version), 0) FROM DataVersions"
+
+
+class Replica:
+    """Bir okuma endpoint'i: kendi bağlantı havuzu, konumu ve sağlık durumu"""
+
+    def __init__(self, name: str, creator: Callable[[], Any], pool_options: Dict[str, Any]):
+        self.name = name
+        self._creator = creator
+        self._pool_options = pool_options
+        self.pool = ConnectionPool(creator, **pool_options)
+        # İlk sağlık kontrolünden önce okuma almaz
+        self.healthy = False
+        self.position: Optional[int] = None
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+        self.reads = 0
+        self.ejections = 0
+
+    def reset_pool(self):
+        """fork() sonrası: parent'ın bağlantıları bırakılır, havuz yeniden kurulur"""
+        self._inherited = self.pool
+        self.pool = ConnectionPool(self._creator, **self._pool_options)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'healthy': self.healthy,
+            'lag': self.lag,
+            'position': self.position,
+            'error': self.error,
+            'reads': self.reads,
+            'ejections': self.ejections,
+            'pool': self.pool.stats(),
+        }
+
+
+class ReplicaSet:
+    """
+    Okuma replikaları arasında yönlendirme ve gecikmeye göre devre dışı bırakma
+
+    Sağlık kontrolü ayrı bir thread yerine okuma yolunda, en fazla
+    check_interval saniyede bir (o sırada tek thread tarafından) yapılır:
+    önce primary'nin, sonra her replikanın konumu (POSITION_QUERY) okunur.
+
+    Gecikme saat farkından etkilenmesin diye zaman damgası yerine konumlarla
+    ölçülür: primary'nin her yeni konumu ilk görüldüğü anla (bu process'in
+    yazmalarında yazma anıyla) saklanır, replikanın gecikmesi henüz
+    ulaşamadığı en eski konumun yaşıdır. Gecikmesi max_lag'i aşan veya hata
+    veren replika okuma almaz; gecikmesi max_lag / 2'nin altına inince geri
+    alınır (sınırda gidip gelmesin diye).
+    """
+
+    def __init__(self, primary: ConnectionPool, replicas: List[Replica], max_lag: float = 5.0,
+                 check_interval: float = 1.0, position_query: str = POSITION_QUERY):
+        """
+        Args:
+            primary: Primary'nin bağlantı havuzu (konum okumak için)
+            replicas: Okuma endpoint'leri
+            max_lag: Bu kadar saniyeden fazla geride kalan replika okuma almaz
+            check_interval: Sağlık kontrolleri arasındaki en az süre (saniye)
+            position_query: Yazmalarla artan tek bir sayı döndüren sorgu
+        """
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.position_query = position_query
+        self.primary_reads = 0
+
+        # (ilk görüldüğü an, primary konumu), konuma göre artan
+        self._samples = deque(maxlen=100000)
+        self._last_check: Optional[float] = None
+        self._write_seen_at: Optional[float] = None
+        self._check_lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        """
+        Okuma için sağlıklı bir replika seç (sırayla)
+
+        Returns:
+            Replika veya sağlıklı replika yoksa None (okuma primary'ye gider)
+        """
+        self.maybe_check()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def maybe_check(self):
+        """Son kontrolden check_interval geçtiyse sağlık kontrolü yap"""
+        if self._last_check is not None and time.monotonic() - self._last_check < self.check_interval:
+            return
+        # İlk kontrol beklenir; sonrakileri bir thread yaparken diğerleri mevcut durumla devam eder
+        if not self._check_lock.acquire(blocking=self._last_check is None):
+            return
+        try:
+            if self._last_check is None or time.monotonic() - self._last_check >= self.check_interval:
+                self.check()
+        finally:
+            self._check_lock.release()
+
+    def check(self) -> Dict[str, Any]:
+        """
+        Konumları oku, gecikmeleri güncelle, replikaları çıkar / geri al
+
+        Returns:
+            stats() ile aynı özet
+        """
+        # Son kontrolden sonraki ilk yazmanın anı; konum okunmadan önce alınır ki
+        # arada yapılan yazma bir sonraki kontrole kalsın
+        written_at, self._write_seen_at = self._write_seen_at, None
+        try:
+            primary = self._position(self.primary)
+        except Exception as e:
+            # Primary'ye ulaşılamıyorsa gecikme ölçülemez, replikaların durumu korunur
+            print(f"Replika kontrolü: primary konumu okunamadı: {e}")
+            self._last_check = time.monotonic()
+            return self.stats()
+
+        now = time.monotonic()
+        if not self._samples or primary > self._samples[-1][1]:
+            self._samples.append((written_at or now, primary))
+
+        for replica in self.replicas:
+            try:
+                replica.position = self._position(replica.pool)
+            except Exception as e:
+                self.eject(replica, f"{type(e).__name__}: {e}")
+                continue
+            replica.lag = self._lag(replica.position, now)
+            if replica.lag > self.max_lag:
+                self.eject(replica, f"gecikme {replica.lag:.1f} sn > {self.max_lag:g} sn")
+            elif replica.healthy or replica.lag <= self.max_lag / 2:
+                if not replica.healthy and replica.ejections:
+                    print(f"Replika {replica.name} yeniden okuma alıyor (gecikme {replica.lag:.1f} sn)")
+                replica.healthy = True
+                replica.error = None
+
+        # Tüm replikaların geçtiği konumlar artık gecikme hesabında kullanılmaz
+        positions = [replica.position for replica in self.replicas if replica.position is not None]
+        if positions:
+            while len(self._samples) > 1 and self._samples[0][1] <= min(positions):
+                self._samples.popleft()
+        self._last_check = now
+        return self.stats()
+
+    def note_write(self):
+        """Primary'ye yazıldı: yeni konum bir sonraki kontrolde bu anla kaydedilir"""
+        if self._write_seen_at is None:
+            self._write_seen_at = time.monotonic()
+
+    def eject(self, replica: Replica, reason: str):
+        """Replikayı bir sonraki başarılı kontrole kadar okumadan çıkar"""
+        if replica.healthy:
+            replica.ejections += 1
+            print(f"Replika {replica.name} devre dışı: {reason}")
+        replica.healthy = False
+        replica.error = reason
+
+    def after_fork(self):
+        """fork() sonrası child process'te: havuzlar ve kilit yeniden kurulur"""
+        for replica in self.replicas:
+            replica.reset_pool()
+        self._check_lock = threading.Lock()
+
+    def close(self):
+        for replica in self.replicas:
+            replica.pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Replika durumları
+
+        Returns:
+            Replika başına sağlık, gecikme, okuma sayısı ve havuz bilgisi;
+            primary'ye giden okuma sayısı
+        """
+        return {
+            'max_lag': self.max_lag,
+            'primary_reads': self.primary_reads,
+            'replicas': {replica.name: replica.stats() for replica in self.replicas},
+        }
+
+    def _position(self, pool: ConnectionPool) -> int:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.position_query)
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        return int(row[0] or 0)
+
+    def _lag(self, position: int, now: float) -> float:
+        """Replikanın henüz görmediği en eski primary konumunun yaşı (saniye)"""
+        for seen_at, primary in self._samples:
+            if primary > position:
+                return now - seen_at
+        return 0.0
@@ -0,0 +1,291 @@
+"""
+Büyüyen log tablolarının saklama (retention) ve arşivleme işi
+
+TaskStatusHistory ve Notifications'ın sıcak penceresinden (hot_days) eski
+satırlar sınırlı batch'ler halinde gzip'li NDJSON dosyalarına taşınır;
+ChangeLog gibi yalnızca yakın geçmişi gereken tablolar arşivlenmeden
+budanır. Böylece sıcak tabloların boyutu (ve /reports süresi) yıllar içinde
+sabit kalır.
+
+Her batch için önce dosya yazılır (geçici ad + os.replace), ardından sıcak
+satırların silinmesi ve ArchiveBatches kaydı tek transaction'da yapılır.
+Yarıda kalan bir batch'in dosyası ArchiveBatches'ta olmadığı için okunmaz,
+sonraki çalıştırmalarda silinir; satırlar sıcak tabloda kaldığından tekrar
+arşivlenir. Aynı batch'i iki process birlikte taşırsa ArchiveBatches'taki
+UNIQUE (table_name, file_name) ikincisinin transaction'ını geri alır.
+
+Kullanım:
+    python retention.py --sqlite bench.db --archive-dir archive     # bir kez çalıştır
+    python retention.py --sqlite bench.db --history-days 30 --dry-run
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from database import DatabaseManager
+from export import json_default
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    Bir tablonun saklama kuralı
+
+    archive=False ise eski satırlar dosyaya yazılmadan silinir.
+    """
+    table: str
+    key: str
+    time_column: str
+    hot_days: float
+    archive: bool = True
+
+
+def default_policies(history_days: float = 365, notification_days: float = 90,
+                     change_log_days: float = 7) -> List[RetentionPolicy]:
+    return [
+        RetentionPolicy('TaskStatusHistory', 'history_id', 'changed_at', history_days),
+        RetentionPolicy('Notifications', 'notification_id', 'created_at', notification_days),
+        # /api/changes ve analitik budanmış günlükte reset/tam yükleme yapar
+        RetentionPolicy('ChangeLog', 'change_id', 'changed_at', change_log_days, archive=False),
+    ]
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class RetentionJob:
+    """Saklama kurallarını batch'ler halinde uygulayan ve arşivi okuyan iş"""
+
+    def __init__(self, db: DatabaseManager, archive_dir: str, policies: List[RetentionPolicy],
+                 batch_size: int = 5000, max_batches: int = 200):
+        """
+        Args:
+            db: Veritabanı yöneticisi
+            archive_dir: Arşiv dosyalarının kök dizini (tablo başına alt dizin)
+            policies: Saklama kuralları
+            batch_size: Bir batch'te taşınan en fazla satır (kilit süresini sınırlar)
+            max_batches: Bir çalıştırmada tablo başına en fazla batch
+        """
+        self.db = db
+        self.archive_dir = archive_dir
+        self.policies = {policy.table: policy for policy in policies}
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.last_result: Optional[Dict[str, Any]] = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ============================================
+    # ARŞİVLEME
+    # ============================================
+    def run_once(self, now: Optional[datetime] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Tüm kuralları uygula
+
+        Returns:
+            Tablo başına taşınan/silinen satır ve batch sayıları, toplam süre
+        """
+        # Arşive yazılan satırlar primary'den okunmalı: silme primary'de id aralığıyla yapılır
+        with self._lock, self.db.primary():
+            started = time.perf_counter()
+            now = now or datetime.now()
+            tables = {}
+            for policy in self.policies.values():
+                cutoff = now - timedelta(days=policy.hot_days)
+                if dry_run:
+                    tables[policy.table] = {'cutoff': cutoff, 'rows': self.db.execute_scalar(
+                        f"SELECT COUNT(*) FROM {policy.table} WHERE {policy.time_column} < ?", (cutoff,))}
+                    continue
+                if policy.archive:
+                    self._remove_orphans(policy)
+                tables[policy.table] = self._apply(policy, cutoff)
+
+            self.last_result = {'tables': tables, 'dry_run': dry_run,
+                                'elapsed': time.perf_counter() - started}
+            return self.last_result
+
+    def _apply(self, policy: RetentionPolicy, cutoff: datetime) -> Dict[str, Any]:
+        moved = batches = 0
+        for _ in range(self.max_batches):
+            rows = self.db.execute_query(
+                f"SELECT TOP ({self.batch_size}) * FROM {policy.table} "
+                f"WHERE {policy.time_column} < ? ORDER BY {policy.key}", (cutoff,))
+            if not rows:
+                break
+
+            first_id, last_id = rows[0][policy.key], rows[-1][policy.key]
+            delete = (f"DELETE FROM {policy.table} "
+                      f"WHERE {policy.key} BETWEEN ? AND ? AND {policy.time_column} < ?")
+            if policy.archive:
+                file_name = self._write_file(policy, rows)
+                times = [_as_datetime(row[policy.time_column]) for row in rows]
+                # Sıcak satırların silinmesi ve arşiv kaydı aynı transaction'da
+                self.db.execute_update(
+                    f"{delete};\n"
+                    "INSERT INTO ArchiveBatches (table_name, file_name, first_id, last_id, row_count, "
+                    "oldest_at, newest_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (first_id, last_id, cutoff,
+                     policy.table, file_name, first_id, last_id, len(rows), min(times), max(times)))
+            else:
+                self.db.execute_update(delete, (first_id, last_id, cutoff))
+
+            moved += len(rows)
+            batches += 1
+            if len(rows) < self.batch_size:
+                break
+        return {'cutoff': cutoff, 'rows': moved, 'batches': batches}
+
+    def _table_dir(self, table: str) -> str:
+        return os.path.join(self.archive_dir, table)
+
+    def _write_file(self, policy: RetentionPolicy, rows: List[Dict[str, Any]]) -> str:
+        """Satırları gzip'li NDJSON dosyasına yaz; dosya adı (tablo dizinine göre) döner"""
+        directory = self._table_dir(policy.table)
+        os.makedirs(directory, exist_ok=True)
+        file_name = f"{rows[0][policy.key]:012d}-{rows[-1][policy.key]:012d}.ndjson.gz"
+        path = os.path.join(directory, file_name)
+
+        with open(path + '.tmp', 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as archive:
+                for row in rows:
+                    archive.write(json.dumps(row, default=json_default, ensure_ascii=False).encode('utf-8'))
+                    archive.write(b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(path + '.tmp', path)
+        return file_name
+
+    def _remove_orphans(self, policy: RetentionPolicy, min_age: float = 3600.0):
+        """Kaydı commit edilmeden yarıda kalmış (min_age saniyeden eski) batch dosyalarını sil"""
+        directory = self._table_dir(policy.table)
+        if not os.path.isdir(directory):
+            return
+        known = {row['file_name'] for row in self.db.execute_query(
+            "SELECT file_name FROM ArchiveBatches WHERE table_name = ?", (policy.table,))}
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name not in known and time.time() - os.path.getmtime(path) > min_age:
+                os.remove(path)
+
+    # ============================================
+    # OKUMA (sıcak + arşiv)
+    # ============================================
+    def iter_rows(self, table: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                  include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Tablonun satırlarını zaman aralığına göre dolaş
+
+        include_archive verilirse önce aralıkla kesişen arşiv batch'leri
+        (ArchiveBatches'taki oldest_at/newest_at ile seçilir), sonra sıcak
+        tablo okunur. Arşivden gelen tarih alanları ISO metin olarak kalır.
+
+        Args:
+            table: Arşivlenen tablo adı
+            since: Bu zamandan itibaren (dahil)
+            until: Bu zamandan öncesi (hariç)
+            include_archive: Arşiv dosyaları da okunsun mu
+        """
+        policy = self.policies.get(table)
+        if policy is None or not policy.archive:
+            raise ValueError(f"Arşivlenmeyen tablo: {table}")
+
+        conditions, params = [], []
+        if since is not None:
+            conditions.append(f"{policy.time_column} >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append(f"{policy.time_column} < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if include_archive:
+            batches = self.db.execute_query(
+                "SELECT file_name FROM ArchiveBatches WHERE table_name = ?"
+                + (" AND newest_at >= ?" if since is not None else "")
+                + (" AND oldest_at < ?" if until is not None else "")
+                + " ORDER BY first_id",
+                tuple([table] + [value for value in (since, until) if value is not None]))
+            for batch in batches:
+                yield from self._read_file(policy, batch['file_name'], since, until)
+
+        yield from self.db.iter_query(
+            f"SELECT * FROM {table}{where} ORDER BY {policy.key}", tuple(params) if params else None)
+
+    def _read_file(self, policy: RetentionPolicy, file_name: str,
+                   since: Optional[datetime], until: Optional[datetime]) -> Iterator[Dict[str, Any]]:
+        with gzip.open(os.path.join(self._table_dir(policy.table), file_name), 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                row = json.loads(line)
+                if since is not None or until is not None:
+                    at = _as_datetime(row[policy.time_column])
+                    if (since is not None and at < since) or (until is not None and at >= until):
+                        continue
+                yield row
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self.db.execute_query(
+            "SELECT table_name, COUNT(*) AS batches, SUM(row_count) AS archived_rows, "
+            "MIN(oldest_at) AS oldest_at FROM ArchiveBatches GROUP BY table_name")
+        return {row['table_name']: row for row in rows}
+
+    # ============================================
+    # ZAMANLAMA
+    # ============================================
+    def start(self, interval: float = 3600.0):
+        """İşi arka plan thread'inde interval saniyede bir çalıştır (ilki bir interval sonra)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name='retention', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                result = self.run_once()
+                moved = {table: info['rows'] for table, info in result['tables'].items() if info['rows']}
+                if moved:
+                    print(f"Saklama işi: {moved}")
+            except Exception as e:
+                # Herhangi bir hata (ör. PoolTimeoutError) thread'i öldürmesin; sonraki turda tekrar denenir
+                print(f"Saklama işi hatası: {type(e).__name__}: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Saklama/arşivleme işini bir kez çalıştır")
+    parser.add_argument('--sqlite', help="SQLite veritabanı dosyası (yoksa SQL Server)")
+    parser.add_argument('--archive-dir', default='archive')
+    parser.add_argument('--history-days', type=float, default=365)
+    parser.add_argument('--notification-days', type=float, default=90)
+    parser.add_argument('--change-log-days', type=float, default=7)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--dry-run', action='store_true', help="Yalnızca taşınacak satırları say")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLiteBackend
+        manager = DatabaseManager(backend=SQLiteBackend(args.sqlite))
+    else:
+        manager = DatabaseManager(server='localhost\\SQLEXPRESS', database='ProjectManagementDB2')
+
+    job = RetentionJob(manager, args.archive_dir,
+                       default_policies(args.history_days, args.notification_days, args.change_log_days),
+                       batch_size=args.batch_size)
+    print(job.run_once(dry_run=args.dry_run))
+    manager.close()
@@ -0,0 +1,147 @@
+import json
+from collections.abc import Mapping, Sequence
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from export import json_default
+
+# to_json_objects'te değerler arasına konan ayraç: JSON metinlerinde kontrol
+# karakterleri her zaman kaçışlı (\u001f) yazıldığından çıktıda yalnızca ayraç olarak geçer
+_SEPARATOR = '\x1f'
+
+
+class Row(Mapping):
+    """
+    Sütun adlarını ResultSet ile paylaşan hafif satır
+
+    Her satır için yeni bir dict yerine yalnızca (ortak sütun indeksi,
+    sürücünün döndürdüğü değerler) ikilisi tutulur. row['col'] ve row.col
+    erişimini destekler; bu sayede Jinja şablonlarında dict gibi kullanılır.
+    """
+
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index: Dict[str, int], values: Any):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._index[key]]
+        return self._values[key]
+
+    def __getattr__(self, name):
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __repr__(self) -> str:
+        return f"Row({dict(self)!r})"
+
+
+class ResultSet(Sequence):
+    """
+    Sütun adları bir kez, satırlar tuple olarak tutulan sorgu sonucu
+
+    Liste gibi dolaşılır ve indekslenir (her erişimde Row döner). to_json()
+    satırları ara dict oluşturmadan doğrudan (sütunlu) JSON metnine,
+    to_json_objects() ise API'lerin döndürdüğü nesne dizisine çevirir.
+    """
+
+    __slots__ = ('columns', '_index', '_rows')
+
+    def __init__(self, columns: List[str], rows: List[Any]):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._rows = rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ResultSet(self.columns, self._rows[i])
+        return Row(self._index, self._rows[i])
+
+    def __iter__(self) -> Iterator[Row]:
+        index = self._index
+        for values in self._rows:
+            yield Row(index, values)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __bool__(self) -> bool:
+        return bool(self._rows)
+
+    def __repr__(self) -> str:
+        return f"ResultSet(columns={self.columns!r}, rows={len(self._rows)})"
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Eski formata (dictionary listesi) çevir"""
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self._rows]
+
+    def to_json(self) -> str:
+        """
+        Sonucu ara dict oluşturmadan JSON metnine çevir
+
+        Sütun adları bir kez yazılır, satırlar dizi olarak encode edilir:
+        {"columns": [...], "rows": [[...], ...]}
+
+        Returns:
+            JSON metni
+        """
+        encode = json.JSONEncoder(default=json_default, ensure_ascii=False).encode
+        return encode({
+            'columns': self.columns,
+            'rows': [values if isinstance(values, tuple) else tuple(values) for values in self._rows]
+        })
+
+    def to_json_objects(self, default: Callable[[Any], Any] = json_default, ensure_ascii: bool = False,
+                        sort_keys: bool = False) -> str:
+        """
+        Sonucu ara dict oluşturmadan [{"sütun": değer, ...}, ...] JSON dizisine çevir
+
+        Değerler tek seferde (C encoder ile) satır dizileri olarak encode edilir,
+        sütun adları satır başına bir kez hazırlanmış şablonla eklenir. Çıktı
+        json.dumps(self.to_dicts(), separators=(',', ':'), ...) ile aynıdır.
+
+        Args:
+            default: JSON'un tanımadığı değerler için dönüştürücü (skaler döndürmeli)
+            ensure_ascii: ASCII dışı karakterler kaçışlı yazılsın
+            sort_keys: Anahtarlar alfabetik sırada yazılsın
+
+        Returns:
+            JSON metni
+        """
+        if not self._rows:
+            return '[]'
+        count = len(self.columns)
+        if not count:
+            return '[' + ','.join(['{}'] * len(self._rows)) + ']'
+
+        # sort_keys'te değerler de aynı sıraya dizilir; şablon % ile doldurulur
+        order = sorted(range(count), key=self.columns.__getitem__) if sort_keys else list(range(count))
+        pick = itemgetter(*order) if count > 1 else lambda values: (values[0],)
+        columns = [self.columns[i] for i in order]
+        template = '{' + ','.join(json.dumps(name, ensure_ascii=ensure_ascii).replace('%', '%%') + ':%s'
+                                  for name in columns) + '}'
+
+        encoder = json.JSONEncoder(default=default, ensure_ascii=ensure_ascii, separators=(_SEPARATOR, ':'))
+        text = encoder.encode([values if isinstance(values, tuple) else tuple(values) for values in self._rows])
+        objects = []
+        # Değerler skaler olduğundan "]<ayraç>[" yalnızca iki satırın arasında geçer
+        for row in text[2:-2].split(']' + _SEPARATOR + '['):
+            values = row.split(_SEPARATOR)
+            if len(values) != count:
+                raise ValueError("Satır değerleri skaler değil, nesne dizisine çevrilemez")
+            objects.append(template % pick(values))
+        return '[' + ','.join(objects) + ']'
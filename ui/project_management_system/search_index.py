@@ -0,0 +1,453 @@
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from database import DatabaseManager
+from pagination import KeysetPaginator
+
+# str.lower() 'I' -> 'i' ve 'İ' -> 'i̇' (birleşik nokta) yapar; Türkçede I/ı ve İ/i eşleşir
+TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Aksanlar atılır: "gorev" yazan "Görev"i, "SIRA" yazan "şıra"yı bulur
+TURKISH_ASCII = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Prefix genişlemesiyle eşleşen terimin skoru tam eşleşmeye göre düşürülür
+PREFIX_FACTOR = 0.5
+
+# Görev/proje/çalışan değişikliklerinin okunduğu günlük (migration 007)
+CHANGES_QUERY = """
+    SELECT TOP ({limit}) change_id, table_name, row_id, operation, changed_at
+    FROM ChangeLog
+    WHERE change_id > ?
+    ORDER BY change_id
+"""
+
+
+class SearchError(ValueError):
+    """Geçersiz arama parametresi verildiğinde fırlatılır"""
+
+
+def fold(text: str) -> str:
+    """Türkçe büyük/küçük harf ve aksan normalizasyonu"""
+    text = text.translate(TURKISH_UPPER).lower().translate(TURKISH_ASCII)
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return text
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(fold(text)) if text else []
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _contains(postings, doc_id: int) -> bool:
+    if isinstance(postings, int):
+        return postings == doc_id
+    i = bisect_left(postings, doc_id)
+    return i < len(postings) and postings[i] == doc_id
+
+
+class InvertedIndex:
+    """
+    Alan ağırlıklı, prefix destekli ters index (tek belge türü)
+
+    Her alan için terim -> sıralı doc id listesi (array('i'); tek belgelik
+    terimler düz int) tutulur. Skor, sorgudaki her terim için belgenin
+    eşleştiği en yüksek (alan ağırlığı x idf) değerin toplamıdır; tüm terimler
+    eşleşmelidir. Sorgu en seyrek terimin listelerini yüksek ağırlıktan
+    başlayarak en yeni belgeden geriye tarar, diğer terimleri bisect ile
+    kontrol eder ve kalan adayların alabileceği en yüksek skor ilk limit
+    sonucun altına düşünce durur.
+    """
+
+    def __init__(self, weights: Sequence[float], max_expansions: int = 64, max_candidates: int = 20000):
+        """
+        Args:
+            weights: Alan sırasına göre ağırlıklar
+            max_expansions: Bir prefix'in genişletileceği en fazla terim
+            max_candidates: Bir sorguda skorlanacak en fazla aday belge
+        """
+        self.weights = tuple(weights)
+        self.max_expansions = max_expansions
+        self.max_candidates = max_candidates
+
+        self._postings: List[Dict[str, Any]] = [{} for _ in self.weights]
+        # Belge -> alanların normalize metni ('\x1f' ile ayrılmış); silerken terimleri bulmak için
+        self._docs: Dict[int, str] = {}
+        # Prefix araması için sıralı sözlük; yeni terimler birikince birleştirilir
+        self._vocabulary: List[str] = []
+        self._pending: set = set()
+        self._sorted = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: int, values: Sequence[Optional[str]]) -> bool:
+        """Belgeyi ekle veya güncelle; normalize metni değiştiyse True döner"""
+        text = '\x1f'.join(' '.join(tokenize(value)) for value in values)
+        previous = self._docs.get(doc_id)
+        if previous == text:
+            return False
+        if previous is not None:
+            self._unlink(doc_id, previous)
+        self._docs[doc_id] = text
+        for postings, field in zip(self._postings, text.split('\x1f')):
+            for token in set(field.split()):
+                current = postings.get(token)
+                if current is None:
+                    if self._sorted and not any(token in other for other in self._postings):
+                        self._pending.add(token)
+                    postings[token] = doc_id
+                elif isinstance(current, int):
+                    postings[token] = array('i', sorted((current, doc_id)))
+                elif current[-1] < doc_id:
+                    current.append(doc_id)
+                else:
+                    insort(current, doc_id)
+        return True
+
+    def remove(self, doc_id: int) -> bool:
+        text = self._docs.pop(doc_id, None)
+        if text is None:
+            return False
+        self._unlink(doc_id, text)
+        return True
+
+    def _unlink(self, doc_id: int, text: str):
+        for postings, field in zip(self._postings, text.split('\x1f')):
+            for token in set(field.split()):
+                current = postings.get(token)
+                if isinstance(current, int):
+                    del postings[token]  # sözlükten toplu birleştirmede düşer
+                elif current is not None:
+                    del current[bisect_left(current, doc_id)]
+                    if len(current) == 1:
+                        postings[token] = current[0]
+
+    def finish(self):
+        """Toplu yüklemeden veya yeterince yeni terim biriktikten sonra sözlüğü yeniden sırala"""
+        self._vocabulary = sorted(set().union(*self._postings))
+        self._pending.clear()
+        self._sorted = True
+
+    def _expand(self, term: str) -> List[str]:
+        """Terimin kendisi ve onunla başlayan (en fazla max_expansions) terim"""
+        if len(self._pending) > 1000:
+            self.finish()
+        tokens = [term]
+        start = bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:start + self.max_expansions + 1]:
+            if not token.startswith(term):
+                break
+            if token != term:
+                tokens.append(token)
+        tokens.extend(sorted(token for token in self._pending if token.startswith(term) and token != term))
+        return list(dict.fromkeys(tokens))[:self.max_expansions + 1]
+
+    def _sources(self, term: str) -> List[Tuple[float, Any]]:
+        """Terim için (ağırlık, doc listesi) çiftleri, ağırlığa göre azalan"""
+        total = len(self._docs)
+        sources = []
+        for token in self._expand(term):
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            for weight, postings in zip(self.weights, self._postings):
+                docs = postings.get(token)
+                if docs is None:
+                    continue
+                count = 1 if isinstance(docs, int) else len(docs)
+                sources.append((weight * factor * math.log(1 + total / count), docs))
+        sources.sort(key=lambda source: -source[0])
+        return sources
+
+    def search(self, terms: Sequence[str], limit: int) -> Tuple[List[Tuple[float, int]], bool]:
+        """
+        Returns:
+            (skor, doc id) listesi (skor, eşitlikte yeni belge önce) ve aday
+            sınırına takılıp takılmadığı
+        """
+        plan = []
+        for term in terms:
+            sources = self._sources(term)
+            if not sources:
+                return [], False
+            plan.append(sources)
+
+        def size(sources):
+            return sum(1 if isinstance(docs, int) else len(docs) for _, docs in sources)
+
+        driver = min(plan, key=size)
+        others = [sources for sources in plan if sources is not driver]
+        others_max = sum(sources[0][0] for sources in others)
+
+        heap: List[Tuple[float, int]] = []
+        seen = set()
+        truncated = False
+        for weight, docs in driver:
+            bound = weight + others_max
+            if len(heap) >= limit and heap[0][0] >= bound:
+                break
+            for doc_id in ((docs,) if isinstance(docs, int) else reversed(docs)):
+                if doc_id in seen:
+                    continue
+                if len(seen) >= self.max_candidates:
+                    truncated = True
+                    break
+                seen.add(doc_id)
+                score = weight
+                for sources in others:
+                    best = next((w for w, postings in sources if _contains(postings, doc_id)), None)
+                    if best is None:
+                        break
+                    score += best
+                else:
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (score, doc_id))
+                    elif (score, doc_id) > heap[0]:
+                        heapq.heapreplace(heap, (score, doc_id))
+                    if len(heap) >= limit and heap[0][0] >= bound:
+                        break
+            if truncated:
+                break
+        return sorted(heap, reverse=True), truncated
+
+
+class SearchSource(NamedTuple):
+    """
+    Bir belge türünün kaynağı
+
+    query: key ve fields sütunlarını okuyan, WHERE içermeyen SELECT
+    depends: Diğer tür -> bu sorgudaki sütun; o türden bir belgenin metni
+    değişince bu sütunla bağlı belgeler de yeniden okunur (ör. proje adı
+    değişince görevleri)
+    """
+    table: str
+    query: str
+    key: str
+    fields: Dict[str, float]
+    paginator: KeysetPaginator
+    depends: Dict[str, str] = {}
+
+
+class SearchIndex:
+    """
+    Görev, proje ve çalışanlar için bellek içi arama index'i
+
+    İlk aramada kaynak sorgular iter_query ile bir kez okunur; sonrasında
+    index yeniden kurulmaz: app.py'deki yazma yolları (on_data_changed) ve en
+    fazla min_interval saniyede bir aramalar sync() ile ChangeLog'daki
+    (migration 007) yeni değişiklikleri okuyup yalnızca değişen satırları
+    yeniden index'ler. Böylece başka process'lerin ve SQL tarafındaki
+    yazmalar da yakalanır.
+
+    IDENTITY boşluğundan sonraki değişiklikler hemen uygulanır ama okuma
+    konumu boşluk settle saniyeden eskiyene kadar ilerletilmez; uygulama
+    idempotent olduğundan tekrar okunmaları zararsızdır. Günlük budanmışsa
+    veya geride max_changes'ten fazla değişiklik varsa index baştan yüklenir.
+    """
+
+    def __init__(self, db: DatabaseManager, sources: Dict[str, SearchSource], min_interval: float = 2.0,
+                 settle: float = 5.0, max_changes: int = 50000, max_limit: int = 100):
+        """
+        Args:
+            db: Veritabanı yöneticisi
+            sources: API adı -> belge kaynağı
+            min_interval: Aramalar arasında sync() için beklenecek en kısa süre (saniye)
+            settle: id boşluğu sonrasındaki değişikliklerin kesinleşme süresi (saniye)
+            max_changes: Artımlı uygulanacak en fazla günlük satırı (fazlası tam yükleme)
+            max_limit: limit parametresinin üst sınırı
+        """
+        self.db = db
+        self.sources = sources
+        self.min_interval = min_interval
+        self.settle = timedelta(seconds=settle)
+        self.max_changes = max_changes
+        self.max_limit = max_limit
+
+        self._lock = threading.RLock()
+        self._indexes: Optional[Dict[str, InvertedIndex]] = None
+        self._by_table = {source.table: name for name, source in sources.items()}
+        self._change_mark = 0
+        self._synced_at = 0.0
+        self.last_sync: Dict[str, Any] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._indexes is not None
+
+    # ============================================
+    # YÜKLEME VE ARTIMLI GÜNCELLEME
+    # ============================================
+    def load(self) -> Dict[str, Any]:
+        """Tüm belgeleri veritabanından baştan oku"""
+        with self._lock:
+            started = time.perf_counter()
+            # Günlük konumu satırlardan önce okunur: aradaki değişiklikler tekrar uygulanır (zararsız)
+            change_mark = self.db.execute_scalar("SELECT ISNULL(MAX(change_id), 0) FROM ChangeLog")
+            indexes = {}
+            for name, source in self.sources.items():
+                index = InvertedIndex(list(source.fields.values()))
+                for row in self.db.iter_query(source.query):
+                    index.add(row[source.key], [row[column] for column in source.fields])
+                index.finish()
+                indexes[name] = index
+            self._indexes = indexes
+            self._change_mark = change_mark
+            self._synced(sum(len(index) for index in indexes.values()), started, full=True)
+            return self.last_sync
+
+    def sync(self, force: bool = True) -> Dict[str, Any]:
+        """
+        ChangeLog'daki yeni değişiklikleri index'e uygula
+
+        Index henüz yüklenmediyse bir şey yapılmaz (ilk arama yükler).
+        force=False ise son senkrondan min_interval geçmeden sorgu atılmaz.
+        """
+        with self._lock:
+            if self._indexes is None:
+                return self.last_sync
+            if not force and time.monotonic() - self._synced_at < self.min_interval:
+                return self.last_sync
+
+            started = time.perf_counter()
+            log, oldest = self.db.fan_out(
+                lambda: self.db.execute_query(CHANGES_QUERY.format(limit=self.max_changes + 1),
+                                              (self._change_mark,), compact=True),
+                lambda: self.db.execute_scalar("SELECT MIN(change_id) FROM ChangeLog")
+            )
+            if (oldest is not None and self._change_mark < oldest - 1) or len(log) > self.max_changes:
+                return self.load()
+
+            # Satır başına son işlem
+            latest: Dict[str, Dict[int, str]] = {name: {} for name in self.sources}
+            for entry in log:
+                name = self._by_table.get(entry['table_name'])
+                if name is not None:
+                    latest[name][entry['row_id']] = entry['operation']
+
+            changed = 0
+            for name, operations in latest.items():
+                if operations:
+                    changed += self._apply(name, [row_id for row_id, op in operations.items() if op != 'D'],
+                                           [row_id for row_id, op in operations.items() if op == 'D'])
+
+            self._change_mark = self._settled_mark(list(log))
+            self._synced(changed, started, full=False)
+            return self.last_sync
+
+    def _settled_mark(self, log: List) -> int:
+        """Commit edilmemiş olabilecek ilk genç boşluktan önceki son change_id"""
+        horizon = datetime.now() - self.settle
+        mark = self._change_mark
+        for entry in log:
+            if entry['change_id'] != mark + 1 and _as_datetime(entry['changed_at']) > horizon:
+                break
+            mark = entry['change_id']
+        return mark
+
+    def _apply(self, name: str, upserted: Iterable[int], deleted: Iterable[int]) -> int:
+        """Belgeleri yeniden oku/sil; metni değişen belgelere bağlı türleri de güncelle"""
+        source, index = self.sources[name], self._indexes[name]
+        touched = [doc_id for doc_id in deleted if index.remove(doc_id)]
+        upserted = list(upserted)
+        found = set()
+        for row in self._fetch(source, source.key, upserted):
+            found.add(row[source.key])
+            if index.add(row[source.key], [row[column] for column in source.fields]):
+                touched.append(row[source.key])
+        touched.extend(doc_id for doc_id in upserted if doc_id not in found and index.remove(doc_id))
+
+        changed = len(touched)
+        if touched:
+            for other, other_source in self.sources.items():
+                column = other_source.depends.get(name)
+                if column:
+                    other_index = self._indexes[other]
+                    for row in self._fetch(other_source, column, touched):
+                        if other_index.add(row[other_source.key], [row[c] for c in other_source.fields]):
+                            changed += 1
+        return changed
+
+    def _fetch(self, source: SearchSource, column: str, ids: List[int]) -> Iterable[Dict[str, Any]]:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            yield from self.db.execute_query(
+                f"{source.query} WHERE {column} IN ({', '.join('?' for _ in chunk)})", tuple(chunk))
+
+    def _synced(self, documents: int, started: float, full: bool):
+        self._synced_at = time.monotonic()
+        self.last_sync = {
+            'full': full,
+            'documents': documents,
+            'change_mark': self._change_mark,
+            'elapsed': time.perf_counter() - started,
+            'synced_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    # ============================================
+    # ARAMA
+    # ============================================
+    def search(self, query: Optional[str], kinds: Optional[Iterable[str]] = None,
+               limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sorgudaki tüm terimleri (son kelime dahil her biri prefix olarak da)
+        içeren belgeler, tür başına skora göre sıralı
+
+        Returns:
+            results (tür -> [{'id', 'score'}]), truncated, elapsed_ms
+        """
+        names = list(kinds) if kinds else list(self.sources)
+        unknown = [name for name in names if name not in self.sources]
+        if unknown:
+            raise SearchError(f"Bilinmeyen tür: {', '.join(unknown)}")
+        limit = min(limit or 20, self.max_limit)
+        if limit < 1:
+            raise SearchError("limit pozitif olmalı")
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            raise SearchError("Arama metni boş olamaz")
+        if len(terms) > 8:
+            raise SearchError("En fazla 8 kelimeyle arama yapılabilir")
+
+        with self._lock:
+            if self._indexes is None:
+                self.load()
+            else:
+                self.sync(force=False)
+            started = time.perf_counter()
+            results, truncated = {}, False
+            for name in names:
+                hits, cut = self._indexes[name].search(terms, limit)
+                results[name] = [{'id': doc_id, 'score': round(score, 3)} for score, doc_id in hits]
+                truncated = truncated or cut
+            elapsed = time.perf_counter() - started
+        return {'terms': terms, 'results': results, 'truncated': truncated, 'elapsed_ms': round(elapsed * 1000, 3)}
+
+    def fetch_rows(self, name: str, ids: List[int]) -> List[Dict[str, Any]]:
+        """Sonuçları liste API'siyle aynı sorgudan (paginator) verilen sırada oku"""
+        if not ids:
+            return []
+        paginator = self.sources[name].paginator
+        rows = {row[paginator.key[1]]: row for row in self.db.execute_query(
+            f"SELECT {paginator.columns} FROM {paginator.source} "
+            f"WHERE {paginator.key[0]} IN ({', '.join('?' for _ in ids)})", tuple(ids))}
+        return [rows[doc_id] for doc_id in ids if doc_id in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            indexes = self._indexes or {}
+            return {
+                'documents': {name: len(index) for name, index in indexes.items()},
+                'last_sync': self.last_sync,
+            }
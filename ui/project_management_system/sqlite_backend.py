@@ -0,0 +1,713 @@
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import weakref
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backends import Backend
+
+
+# ============================================
+# ŞEMA (sql/create_tables.sql, views.sql ve triggers.sql'in SQLite karşılığı)
+# ============================================
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Departments (
+    department_id INTEGER PRIMARY KEY,
+    department_name VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Employees (
+    EmployeeID INTEGER PRIMARY KEY,
+    FirstName NVARCHAR(50) NOT NULL,
+    LastName NVARCHAR(50) NOT NULL,
+    Email NVARCHAR(100) UNIQUE NOT NULL,
+    DepartmentID INTEGER NOT NULL,
+    HireDate DATE NOT NULL,
+
+    FOREIGN KEY (DepartmentID) REFERENCES Departments(department_id)
+);
+
+CREATE TABLE IF NOT EXISTS Projects (
+    project_id INTEGER PRIMARY KEY,
+    project_name NVARCHAR(100) NOT NULL,
+    description NVARCHAR(255),
+    start_date DATE NOT NULL,
+    end_date DATE,
+    status NVARCHAR(50) DEFAULT 'Aktif'
+);
+
+CREATE TABLE IF NOT EXISTS ProjectMembers (
+    member_id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL,
+    role NVARCHAR(50),
+    assigned_role NVARCHAR(50),
+    assigned_date DATE,
+    role_in_project NVARCHAR(100),
+
+    FOREIGN KEY (project_id) REFERENCES Projects(project_id),
+    FOREIGN KEY (employee_id) REFERENCES Employees(EmployeeID)
+);
+
+CREATE TABLE IF NOT EXISTS Tasks (
+    task_id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL,
+    task_title NVARCHAR(150) NOT NULL,
+    task_description NVARCHAR(255),
+    priority NVARCHAR(20) CHECK (priority IN ('Düşük', 'Orta', 'Yüksek')),
+    status NVARCHAR(30) DEFAULT 'Atandı',
+    start_date DATE NOT NULL,
+    due_date DATE,
+    assigned_role NVARCHAR(50),
+    assigned_date DATE,
+
+    FOREIGN KEY (project_id) REFERENCES Projects(project_id),
+    FOREIGN KEY (employee_id) REFERENCES Employees(EmployeeID)
+);
+
+CREATE TABLE IF NOT EXISTS TaskStatusHistory (
+    history_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    old_status NVARCHAR(30),
+    new_status NVARCHAR(30),
+    changed_at DATETIME DEFAULT (datetime('now', 'localtime')),
+    changed_by INTEGER NOT NULL,
+
+    FOREIGN KEY (task_id) REFERENCES Tasks(task_id) ON DELETE CASCADE,
+    FOREIGN KEY (changed_by) REFERENCES Employees(EmployeeID)
+);
+
+CREATE TABLE IF NOT EXISTS Notifications (
+    notification_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    message NVARCHAR(255) NOT NULL,
+    notification_type NVARCHAR(50) NOT NULL,
+    is_read BIT DEFAULT 0,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+
+    FOREIGN KEY (task_id) REFERENCES Tasks(task_id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES Employees(EmployeeID)
+);
+
+-- Views
+CREATE VIEW IF NOT EXISTS V_TaskDetails AS
+SELECT
+    t.task_id, t.task_title, t.task_description, t.priority, t.status, t.start_date, t.due_date,
+    e.EmployeeID, e.FirstName || ' ' || e.LastName AS EmployeeName, e.Email,
+    p.project_id, p.project_name, p.status AS project_status
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Projects p ON t.project_id = p.project_id;
+
+CREATE VIEW IF NOT EXISTS V_UpcomingDeadlines AS
+SELECT
+    t.task_id, t.task_title, t.status, t.due_date,
+    e.FirstName || ' ' || e.LastName AS EmployeeName, p.project_name
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Projects p ON t.project_id = p.project_id
+WHERE t.due_date IS NOT NULL
+  AND t.status NOT IN ('Tamamlandı')
+  AND t.due_date <= datetime('now', 'localtime', '+3 days')
+  AND t.due_date >= datetime('now', 'localtime');
+
+CREATE VIEW IF NOT EXISTS V_CompletedTasks AS
+SELECT
+    t.task_id, t.task_title, t.due_date, t.start_date,
+    e.FirstName || ' ' || e.LastName AS EmployeeName, p.project_name
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Projects p ON t.project_id = p.project_id
+WHERE t.status = 'Tamamlandı';
+
+CREATE VIEW IF NOT EXISTS V_ProjectMembers AS
+SELECT
+    pm.member_id, pm.role AS ProjectRole, p.project_id, p.project_name, e.EmployeeID,
+    e.FirstName || ' ' || e.LastName AS EmployeeName, d.department_name
+FROM ProjectMembers pm
+INNER JOIN Projects p ON pm.project_id = p.project_id
+INNER JOIN Employees e ON pm.employee_id = e.EmployeeID
+INNER JOIN Departments d ON e.DepartmentID = d.department_id;
+
+CREATE VIEW IF NOT EXISTS V_DepartmentTaskCount AS
+SELECT d.department_name, COUNT(t.task_id) AS TotalTasks
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Departments d ON e.DepartmentID = d.department_id
+GROUP BY d.department_name;
+
+CREATE VIEW IF NOT EXISTS vw_TaskFullDetails AS
+SELECT
+    t.task_id, t.task_title, t.task_description, t.priority, t.status, t.start_date, t.due_date,
+    p.project_id, p.project_name, e.EmployeeID,
+    e.FirstName || ' ' || e.LastName AS EmployeeFullName, d.department_name,
+    pm.assigned_role AS ProjectRole
+FROM Tasks t
+INNER JOIN Projects p ON t.project_id = p.project_id
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Departments d ON e.DepartmentID = d.department_id
+LEFT JOIN ProjectMembers pm ON pm.project_id = p.project_id AND pm.employee_id = e.EmployeeID;
+
+-- DATEDIFF(DAY, GETDATE(), due_date): iki tarih arasındaki gün sınırı sayısı
+CREATE VIEW IF NOT EXISTS vw_UpcomingDeadlines AS
+SELECT
+    t.task_id, t.task_title, t.due_date,
+    CAST(julianday(date(t.due_date)) - julianday(date('now', 'localtime')) AS INTEGER) AS DaysLeft,
+    e.FirstName || ' ' || e.LastName AS AssignedEmployee, p.project_name
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Projects p ON t.project_id = p.project_id
+WHERE t.due_date IS NOT NULL
+  AND CAST(julianday(date(t.due_date)) - julianday(date('now', 'localtime')) AS INTEGER) BETWEEN 1 AND 3
+  AND t.status <> 'Tamamlandı';
+
+CREATE VIEW IF NOT EXISTS vw_CompletedTasks AS
+SELECT
+    t.task_id, t.task_title, t.task_description, t.start_date, t.due_date, t.assigned_date,
+    e.FirstName || ' ' || e.LastName AS EmployeeName, p.project_name
+FROM Tasks t
+INNER JOIN Employees e ON t.employee_id = e.EmployeeID
+INNER JOIN Projects p ON t.project_id = p.project_id
+WHERE t.status = 'Tamamlandı';
+
+CREATE VIEW IF NOT EXISTS vw_ProjectMembersDetails AS
+SELECT
+    pm.project_id, p.project_name, e.EmployeeID,
+    e.FirstName || ' ' || e.LastName AS EmployeeFullName, d.department_name,
+    pm.role AS ProjectRole, pm.assigned_role, pm.assigned_date
+FROM ProjectMembers pm
+INNER JOIN Employees e ON pm.employee_id = e.EmployeeID
+INNER JOIN Projects p ON pm.project_id = p.project_id
+INNER JOIN Departments d ON e.DepartmentID = d.department_id;
+
+CREATE VIEW IF NOT EXISTS vw_DepartmentTaskCount AS
+SELECT d.department_name, COUNT(t.task_id) AS TotalTasks
+FROM Departments d
+LEFT JOIN Employees e ON d.department_id = e.DepartmentID
+LEFT JOIN Tasks t ON e.EmployeeID = t.employee_id
+GROUP BY d.department_name;
+
+-- Trigger'lar: trg_DeadlineApproaching / trg_TaskOverdue yerine notification_scanner.py
+-- (migration 004), trg_TaskStatusHistory / trg_TaskCompleted yerine durum geçişi
+-- prosedürleri (migration 005) kullanılır
+"""
+
+
+class ProcedureError(sqlite3.DatabaseError):
+    """Stored procedure'ün RAISERROR ile verdiği hatanın karşılığı"""
+
+
+# ============================================
+# T-SQL -> SQLite ÇEVİRİSİ
+# ============================================
+_LITERAL = re.compile(r"(?:(?<!\w)N)?'(?:[^']|'')*'")
+_TOP = re.compile(r"^\s*SELECT\s+TOP\s*\(?\s*(\d+)\s*\)?\s+", re.IGNORECASE)
+_EXEC = re.compile(r"^\s*EXEC(?:UTE)?\s+(?:dbo\.)?(\w+)\s*(.*?)\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+_NOCOUNT = re.compile(r"^\s*SET\s+NOCOUNT\s+(ON|OFF)\s*$", re.IGNORECASE)
+_CREATE_TRIGGER = re.compile(r"^\s*CREATE\s+TRIGGER\b", re.IGNORECASE)
+_FUNCTIONS = [
+    (re.compile(r"\bGETDATE\s*\(\s*\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bISNULL\s*\(", re.IGNORECASE), "IFNULL("),
+    (re.compile(r"\bLEN\s*\(", re.IGNORECASE), "LENGTH("),
+]
+
+
+def _split_literals(sql: str) -> List[Tuple[bool, str]]:
+    """SQL'i (literal mi, metin) parçalarına ayır"""
+    parts, last = [], 0
+    for match in _LITERAL.finditer(sql):
+        parts.append((False, sql[last:match.start()]))
+        literal = match.group(0)
+        parts.append((True, literal[1:] if literal.startswith('N') else literal))
+        last = match.end()
+    parts.append((False, sql[last:]))
+    return parts
+
+
+def split_statements(sql: str) -> List[str]:
+    """Batch'i ';' ile ifadelere böl (string literal içindekiler hariç)"""
+    # Trigger gövdesindeki ';' ifadeyi bitirmez, CREATE TRIGGER tek başına gönderilir
+    if _CREATE_TRIGGER.match(sql):
+        return [sql.strip()]
+
+    statements, current = [], []
+    for is_literal, text in _split_literals(sql):
+        if is_literal:
+            current.append(text)
+            continue
+        pieces = text.split(';')
+        current.append(pieces[0])
+        for piece in pieces[1:]:
+            statements.append(''.join(current))
+            current = [piece]
+    statements.append(''.join(current))
+    return [s.strip() for s in statements if s.strip()]
+
+
+def count_placeholders(sql: str) -> int:
+    return sum(text.count('?') for is_literal, text in _split_literals(sql) if not is_literal)
+
+
+@lru_cache(maxsize=1024)
+def translate(sql: str) -> str:
+    """
+    Uygulamanın kullandığı T-SQL alt kümesini SQLite'a çevir
+
+    Desteklenenler: SELECT TOP (n) -> LIMIT n, string birleştirmede '+' -> '||',
+    N'...' literal'leri, GETDATE(), ISNULL(), LEN().
+    """
+    parts = _split_literals(sql)
+    out = []
+    for i, (is_literal, text) in enumerate(parts):
+        if is_literal:
+            out.append(text)
+            continue
+        # Literal'e bitişik '+' string birleştirmedir
+        if i + 1 < len(parts):
+            text = re.sub(r"\+\s*$", "|| ", text)
+        if i > 0:
+            text = re.sub(r"^\s*\+", " ||", text)
+        for pattern, replacement in _FUNCTIONS:
+            text = pattern.sub(replacement, text)
+        out.append(text)
+    result = ''.join(out)
+
+    top = _TOP.match(result)
+    if top:
+        result = "SELECT " + result[top.end():].rstrip().rstrip(';') + f" LIMIT {top.group(1)}"
+    return result
+
+
+# ============================================
+# STORED PROCEDURE KARŞILIKLARI
+# ============================================
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def sp_AddTask(cursor, project_id, employee_id, task_title, task_description, priority,
+               start_date, due_date, assigned_role, assigned_date):
+    """sp_AddTask: duplicate kontrolü, görev ekleme ve ilk durum kaydı"""
+    cursor.execute("SELECT 1 FROM Tasks WHERE task_title = ? AND employee_id = ?",
+                   (task_title, employee_id))
+    if cursor.fetchone():
+        raise ProcedureError('Bu çalışan için aynı task zaten var!')
+
+    cursor.execute("""
+        INSERT INTO Tasks (project_id, employee_id, task_title, task_description, priority, status,
+                           start_date, due_date, assigned_role, assigned_date)
+        VALUES (?, ?, ?, ?, ?, 'Atandı', ?, ?, ?, ?)
+    """, (project_id, employee_id, task_title, task_description, priority,
+          start_date, due_date, assigned_role, assigned_date))
+    new_task_id = cursor.lastrowid
+
+    cursor.execute("""
+        INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by)
+        VALUES (?, NULL, 'Atandı', ?)
+    """, (new_task_id, employee_id))
+
+    cursor.execute("SELECT ? AS NewTaskID", (new_task_id,))
+
+
+def sp_AddTasks(cursor, tasks):
+    """sp_AddTasks: JSON dizisindeki görevleri set tabanlı kontrol ve tek INSERT ... SELECT ile ekle"""
+    items = json.loads(tasks)
+    messages: Dict[int, str] = {}
+
+    # Duplicate kontrolü: mevcut görevler (tek sorgu) ve aynı istekte daha önce geçenler
+    cursor.execute("""
+        SELECT i.key FROM json_each(?) i
+        WHERE EXISTS (SELECT 1 FROM Tasks t
+                      WHERE t.employee_id = json_extract(i.value, '$.employee_id')
+                        AND t.task_title = json_extract(i.value, '$.task_title'))
+    """, (tasks,))
+    messages.update((row[0], 'Bu çalışan için aynı task zaten var!') for row in cursor.fetchall())
+    seen = set()
+    for seq, item in enumerate(items):
+        key = (item['employee_id'], item['task_title'])
+        if key in seen:
+            messages.setdefault(seq, 'Bu çalışan için aynı task zaten var!')
+        seen.add(key)
+
+    cursor.execute("""
+        SELECT i.key FROM json_each(?) i
+        WHERE NOT EXISTS (SELECT 1 FROM Projects p WHERE p.project_id = json_extract(i.value, '$.project_id'))
+           OR NOT EXISTS (SELECT 1 FROM Employees e WHERE e.EmployeeID = json_extract(i.value, '$.employee_id'))
+    """, (tasks,))
+    for row in cursor.fetchall():
+        messages.setdefault(row[0], 'Belirtilen proje veya çalışan bulunamadı!')
+
+    valid = json.dumps([item for seq, item in enumerate(items) if seq not in messages])
+    cursor.execute("""
+        INSERT INTO Tasks (project_id, employee_id, task_title, task_description, priority, status,
+                           start_date, due_date, assigned_role, assigned_date)
+        SELECT json_extract(value, '$.project_id'), json_extract(value, '$.employee_id'),
+               json_extract(value, '$.task_title'), json_extract(value, '$.task_description'),
+               json_extract(value, '$.priority'), 'Atandı', json_extract(value, '$.start_date'),
+               json_extract(value, '$.due_date'), json_extract(value, '$.assigned_role'),
+               json_extract(value, '$.assigned_date')
+        FROM json_each(?)
+        ORDER BY key
+        RETURNING task_id, employee_id, task_title
+    """, (valid,))
+    created = {(row[1], row[2]): row[0] for row in cursor.fetchall()}
+
+    # İlk durum kayıtları
+    cursor.executemany("""
+        INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by)
+        VALUES (?, NULL, 'Atandı', ?)
+    """, [(task_id, employee_id) for (employee_id, _), task_id in created.items()])
+
+    # (employee_id, task_title) duplicate kontrolünden sonra benzersizdir
+    results = [{'task_id': None if seq in messages else created[(item['employee_id'], item['task_title'])],
+                'created': seq not in messages, 'message': messages.get(seq)}
+               for seq, item in enumerate(items)]
+    cursor.execute("""
+        SELECT CAST(key AS INTEGER) AS seq,
+               json_extract(value, '$.task_id') AS task_id,
+               json_extract(value, '$.created') AS created,
+               json_extract(value, '$.message') AS message
+        FROM json_each(?)
+        ORDER BY seq
+    """, (json.dumps(results),))
+
+
+def _apply_status_changes(cursor, changes: List[Tuple[int, str, int]]) -> List[Dict[str, Any]]:
+    """
+    Durum geçişlerini uygula: görev başına tek UPDATE, tek geçmiş kaydı ve
+    yalnızca tamamlanmada tek bildirim (trigger yok)
+
+    Returns:
+        Her değişiklik için task_id, old_status, status, applied, message
+    """
+    ids = [task_id for task_id, _, _ in changes]
+    current = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cursor.execute(
+            f"SELECT task_id, status, employee_id, task_title FROM Tasks "
+            f"WHERE task_id IN ({', '.join('?' * len(chunk))})", chunk)
+        current.update((row[0], row) for row in cursor.fetchall())
+
+    results, applied, now = [], [], _now()
+    for task_id, new_status, changed_by in changes:
+        row = current.get(task_id)
+        if row is None:
+            results.append({'task_id': task_id, 'old_status': None, 'status': None,
+                            'applied': 0, 'message': 'Belirtilen Task bulunamadı!'})
+        elif row[1] == new_status:
+            results.append({'task_id': task_id, 'old_status': row[1], 'status': row[1],
+                            'applied': 0, 'message': 'Zaten bu statüde!'})
+        else:
+            applied.append((task_id, row[1], new_status, changed_by, row[2], row[3]))
+            results.append({'task_id': task_id, 'old_status': row[1], 'status': new_status,
+                            'applied': 1, 'message': None})
+
+    cursor.executemany("UPDATE Tasks SET status = ? WHERE task_id = ?",
+                       [(new_status, task_id) for task_id, _, new_status, _, _, _ in applied])
+    cursor.executemany("""
+        INSERT INTO TaskStatusHistory (task_id, old_status, new_status, changed_by, changed_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(task_id, old, new, changed_by, now) for task_id, old, new, changed_by, _, _ in applied])
+    cursor.executemany("""
+        INSERT INTO Notifications (task_id, user_id, message, notification_type)
+        VALUES (?, ?, 'Görev tamamlandı: ' || ?, 'Görev Tamamlandı')
+    """, [(task_id, employee_id, title) for task_id, _, new, _, employee_id, title in applied
+          if new == 'Tamamlandı'])
+    return results
+
+
+def sp_UpdateTaskStatus(cursor, task_id, new_status, changed_by):
+    """sp_UpdateTaskStatus: tek görevin durum geçişi (tek geçmiş kaydı)"""
+    result = _apply_status_changes(cursor, [(task_id, new_status, changed_by)])[0]
+    if not result['applied']:
+        raise ProcedureError(result['message'])
+
+    cursor.execute("""
+        SELECT ? AS TaskID, ? AS OldStatus, ? AS NewStatus, ? AS ChangedBy, ? AS ChangedAt
+    """, (task_id, result['old_status'], new_status, changed_by, _now()))
+
+
+def sp_ApplyTaskStatusChanges(cursor, changes):
+    """sp_ApplyTaskStatusChanges: JSON dizisindeki durum geçişlerini tek çağrıda uygula"""
+    items = [(int(item['task_id']), item['status'], item.get('changed_by'))
+             for item in json.loads(changes)]
+    results = _apply_status_changes(cursor, items)
+
+    # Sonuçlar, T-SQL sürümündeki gibi girdi sırasıyla tek bir sonuç kümesi olarak döner
+    cursor.execute("""
+        SELECT CAST(key AS INTEGER) AS seq,
+               json_extract(value, '$.task_id') AS task_id,
+               json_extract(value, '$.old_status') AS old_status,
+               json_extract(value, '$.status') AS status,
+               json_extract(value, '$.applied') AS applied,
+               json_extract(value, '$.message') AS message
+        FROM json_each(?)
+        ORDER BY seq
+    """, (json.dumps(results),))
+
+
+def sp_AssignEmployeeToProject(cursor, project_id, employee_id, role_in_project):
+    """sp_AssignEmployeeToProject: duplicate kontrolü ve proje ataması"""
+    cursor.execute("SELECT 1 FROM ProjectMembers WHERE project_id = ? AND employee_id = ?",
+                   (project_id, employee_id))
+    if cursor.fetchone():
+        raise ProcedureError('Bu çalışan zaten bu projeye atanmış!')
+
+    cursor.execute("""
+        INSERT INTO ProjectMembers (project_id, employee_id, role_in_project, assigned_date)
+        VALUES (?, ?, ?, date('now', 'localtime'))
+    """, (project_id, employee_id, role_in_project))
+    cursor.execute("SELECT ? AS NewAssignmentID", (cursor.lastrowid,))
+
+
+def sp_GetProjectTasks(cursor, project_id):
+    """sp_GetProjectTasks: projenin görevleri ve atanan çalışanlar"""
+    cursor.execute("""
+        SELECT
+            t.task_id, t.task_title, t.status, t.employee_id,
+            (e.FirstName || ' ' || e.LastName) AS employee_name,
+            t.start_date, t.due_date
+        FROM Tasks t
+        LEFT JOIN Employees e ON t.employee_id = e.EmployeeID
+        WHERE t.project_id = ?
+    """, (project_id,))
+
+
+def sp_GetEmployeeTaskSummary(cursor, employee_id):
+    """sp_GetEmployeeTaskSummary: çalışanın görevleri, kalan gün ve gecikme durumu"""
+    cursor.execute("""
+        SELECT
+            t.task_id, t.task_title, p.project_name, t.status, t.priority, t.start_date, t.due_date,
+            CAST(julianday(date(t.due_date)) - julianday(date('now', 'localtime')) AS INTEGER) AS DaysLeft,
+            CASE
+                WHEN t.due_date < datetime('now', 'localtime') AND t.status <> 'Tamamlandı'
+                    THEN 'Evet'
+                ELSE 'Hayır'
+            END AS IsOverdue
+        FROM Tasks t
+        INNER JOIN Projects p ON t.project_id = p.project_id
+        WHERE t.employee_id = ?
+        ORDER BY t.due_date ASC
+    """, (employee_id,))
+
+
+PROCEDURES: Dict[str, Callable[..., None]] = {
+    'sp_AddTask': sp_AddTask,
+    'sp_AddTasks': sp_AddTasks,
+    'sp_UpdateTaskStatus': sp_UpdateTaskStatus,
+    'sp_ApplyTaskStatusChanges': sp_ApplyTaskStatusChanges,
+    'sp_AssignEmployeeToProject': sp_AssignEmployeeToProject,
+    'sp_GetProjectTasks': sp_GetProjectTasks,
+    'sp_GetEmployeeTaskSummary': sp_GetEmployeeTaskSummary,
+}
+
+
+# ============================================
+# pyodbc UYUMLU BAĞLANTI / CURSOR
+# ============================================
+class SQLiteCursor:
+    """
+    sqlite3 cursor'ını pyodbc davranışına yaklaştıran sarmalayıcı
+
+    T-SQL'i çevirir, EXEC çağrılarını Python prosedürlerine yönlendirir ve
+    çok ifadeli batch'lerde nextset() ile sonraki sonuç kümesine geçer.
+    """
+
+    def __init__(self, connection: 'SQLiteConnection'):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self._pending: List[Tuple[str, Sequence[Any]]] = []
+        self.fast_executemany = False
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, query: str, params: Optional[Sequence[Any]] = None):
+        statements = split_statements(query)
+        params = list(params or ())
+
+        # Parametreler ifadelere '?' sayısına göre dağıtılır
+        bound = []
+        for statement in statements:
+            if _NOCOUNT.match(statement):
+                continue
+            n = count_placeholders(statement)
+            bound.append((statement, params[:n]))
+            params = params[n:]
+
+        self._pending = bound[1:]
+        if bound:
+            self._run(*bound[0])
+        return self
+
+    def executemany(self, query: str, seq_of_params):
+        self._cursor.executemany(translate(query), seq_of_params)
+        return self
+
+    def nextset(self) -> bool:
+        if not self._pending:
+            return False
+        statement, params = self._pending.pop(0)
+        self._run(statement, params)
+        return True
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int = 1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _run(self, statement: str, params: Sequence[Any]):
+        match = _EXEC.match(statement)
+        if match:
+            procedure = PROCEDURES.get(match.group(1))
+            if procedure is None:
+                raise sqlite3.OperationalError(f"Bilinmeyen prosedür: {match.group(1)}")
+            procedure(self._cursor, *params)
+            return
+        self._cursor.execute(translate(statement), params)
+
+
+class SQLiteConnection:
+    """pyodbc.Connection arayüzünü taklit eden sqlite3 bağlantısı"""
+
+    def __init__(self, raw: sqlite3.Connection):
+        self.raw = raw
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self)
+
+    def execute(self, query: str, params: Optional[Sequence[Any]] = None) -> SQLiteCursor:
+        return self.cursor().execute(query, params)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+def _convert_date(value: bytes) -> date:
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_datetime(value: bytes) -> Any:
+    text = value.decode()
+    return datetime.fromisoformat(text) if len(text) > 10 else date.fromisoformat(text)
+
+
+# DATE/DATETIME sütunları pyodbc'deki gibi date/datetime nesnesi olarak döner
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('DATETIME', _convert_datetime)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+class SQLiteBackend(Backend):
+    """
+    Yerel benchmark ve CI için SQLite backend'i
+
+    Şema, view'lar ve trigger'lar SQLite'a taşınmıştır; stored procedure'ler
+    Python'da yazılmıştır. Uygulamanın gönderdiği T-SQL alt kümesi bağlantı
+    katmanında çevrilir, böylece app.py değişmeden çalışır.
+    """
+
+    name = 'sqlite'
+    _memory_ids = itertools.count(1)
+
+    def __init__(self, path: str = ':memory:', initialize: bool = True, timeout: float = 30.0,
+                 trace: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            path: Veritabanı dosyası (':memory:' ise bağlantılar arasında paylaşılan bellek DB)
+            initialize: True ise tablolar yoksa şema oluşturulur
+            timeout: Kilitli veritabanında bekleme süresi (saniye)
+            trace: Yeni bağlantılarda çalışan her ifadeyi (parametreleri yerine konmuş
+                olarak) alan fonksiyon; plan kontrolü ve hata ayıklama için
+        """
+        self.path = path
+        self.timeout = timeout
+        self.trace = trace
+        self._connections = weakref.WeakSet()
+        self._anchor = None
+        self._lock = threading.Lock()
+
+        if path == ':memory:':
+            # Paylaşılan bellek DB'si son bağlantı kapanınca silinir, bir bağlantı açık tutulur
+            self._uri = f"file:pms_memory_{next(self._memory_ids)}?mode=memory&cache=shared"
+            self._anchor = self._open()
+        else:
+            self._uri = None
+
+        if initialize:
+            self.create_schema()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._uri:
+            raw = sqlite3.connect(self._uri, uri=True, timeout=self.timeout,
+                                  detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        else:
+            raw = sqlite3.connect(self.path, timeout=self.timeout,
+                                  detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA foreign_keys = ON")
+        if self.trace:
+            raw.set_trace_callback(self.trace)
+        return raw
+
+    def connect(self) -> SQLiteConnection:
+        conn = SQLiteConnection(self._open())
+        self._connections.add(conn)
+        return conn
+
+    def set_trace(self, trace: Optional[Callable[[str], None]]):
+        """Trace fonksiyonunu açık (havuzdaki) ve sonraki bağlantılara uygula (None ise kapat)"""
+        self.trace = trace
+        for conn in list(self._connections):
+            try:
+                conn.raw.set_trace_callback(trace)
+            except sqlite3.ProgrammingError:
+                pass  # kapanmış bağlantı
+
+    def create_schema(self):
+        """Tabloları, view'ları ve trigger'ları oluştur (varsa dokunmaz)"""
+        with self._lock:
+            raw = self._open()
+            try:
+                raw.executescript(SQLITE_SCHEMA)
+                raw.commit()
+            finally:
+                raw.close()
+
+    def close(self):
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
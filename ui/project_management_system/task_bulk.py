@@ -0,0 +1,74 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping
+
+PRIORITIES = ('Düşük', 'Orta', 'Yüksek')
+
+
+class TaskBulkError(ValueError):
+    """Toplu görev isteğindeki bir öğe eksik veya hatalı olduğunda fırlatılır"""
+
+
+def _date(value: Any, field: str, position: int) -> str:
+    # POST /api/tasks ile aynı: boş tarih bugün kabul edilir
+    if not value:
+        return datetime.now().strftime('%Y-%m-%d')
+    try:
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise TaskBulkError(f"{position}. görev: {field} YYYY-MM-DD formatında olmalı")
+
+
+def _normalize(task: Mapping[str, Any], position: int) -> Dict[str, Any]:
+    try:
+        project_id = int(task['project_id'])
+        employee_id = int(task['employee_id'])
+        title = str(task['task_title']).strip()
+    except (KeyError, TypeError, ValueError):
+        raise TaskBulkError(f"{position}. görev: project_id, employee_id ve task_title zorunlu")
+    if not title or len(title) > 150:
+        raise TaskBulkError(f"{position}. görev: task_title 1-150 karakter olmalı")
+
+    priority = str(task.get('priority') or 'Orta')
+    if priority not in PRIORITIES:
+        raise TaskBulkError(f"{position}. görev: priority {', '.join(PRIORITIES)} değerlerinden biri olmalı")
+
+    return {
+        'project_id': project_id,
+        'employee_id': employee_id,
+        'task_title': title,
+        'task_description': str(task.get('task_description') or '')[:255],
+        'priority': priority,
+        'start_date': _date(task.get('start_date'), 'start_date', position),
+        'due_date': _date(task.get('due_date'), 'due_date', position),
+        'assigned_role': str(task.get('assigned_role') or 'Ekip Üyesi'),
+        'assigned_date': datetime.now().strftime('%Y-%m-%d'),
+    }
+
+
+def create_tasks(db, tasks: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Görevleri tek prosedür çağrısıyla (sp_AddTasks) toplu ekle
+
+    Duplicate (aynı çalışan + başlık) ve proje/çalışan kontrolleri tüm liste
+    için set tabanlı yapılır; geçerli görevler tek INSERT ... SELECT ile ve
+    ilk durum kayıtlarıyla birlikte tek transaction'da eklenir. Reddedilen
+    görevler diğerlerini engellemez, sonuçta message ile döner.
+
+    Args:
+        db: DatabaseManager örneği
+        tasks: POST /api/tasks gövdesiyle aynı alanlara sahip dictionary'ler
+
+    Returns:
+        Girdi sırasıyla task_id, created, message alanları
+    """
+    items = [_normalize(task, position) for position, task in enumerate(tasks, 1)]
+    if not items:
+        return []
+
+    rows = db.execute_procedure('sp_AddTasks', (json.dumps(items, ensure_ascii=False),))
+    return [{
+        'task_id': row['task_id'],
+        'created': bool(row['created']),
+        'message': row['message'],
+    } for row in sorted(rows, key=lambda row: row['seq'])]
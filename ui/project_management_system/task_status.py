@@ -0,0 +1,56 @@
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+
+class StatusChangeError(ValueError):
+    """Durum geçişi isteği hatalı olduğunda fırlatılır (eksik alan, tekrarlanan görev vb.)"""
+
+
+def _normalize(change: Mapping[str, Any], changed_by: Optional[int]) -> Dict[str, Any]:
+    try:
+        task_id = int(change['task_id'])
+        status = str(change['status']).strip()
+    except (KeyError, TypeError, ValueError):
+        raise StatusChangeError("Her değişiklik task_id ve status içermeli")
+    if not status:
+        raise StatusChangeError(f"Görev {task_id}: status boş olamaz")
+    # Değişikliği yapan her zaman çağıran taraftan (oturum) gelir; istek gövdesi bunu belirleyemez
+    return {'task_id': task_id, 'status': status, 'changed_by': changed_by}
+
+
+def apply_status_changes(db, changes: Iterable[Mapping[str, Any]],
+                         changed_by: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Görev durum geçişlerini tek prosedür çağrısıyla (tek round trip) uygula
+
+    sp_ApplyTaskStatusChanges her geçiş için tek UPDATE, tek TaskStatusHistory
+    kaydı ve yalnızca tamamlanmada tek bildirim yazar; hepsi aynı transaction
+    içindedir. Uygulanamayan geçişler (görev yok, zaten bu statüde) hata
+    fırlatmaz, sonuçta applied=False ve message ile döner.
+
+    Args:
+        db: DatabaseManager örneği
+        changes: {'task_id', 'status'} dictionary'leri (diğer alanlar yok sayılır)
+        changed_by: Değişikliği yapan çalışan (tüm geçişler için)
+
+    Returns:
+        Girdi sırasıyla task_id, old_status, status, applied, message alanları
+    """
+    items = [_normalize(change, changed_by) for change in changes]
+    if not items:
+        return []
+
+    seen = set()
+    for item in items:
+        if item['task_id'] in seen:
+            raise StatusChangeError(f"Görev {item['task_id']} aynı istekte birden fazla kez geçiyor")
+        seen.add(item['task_id'])
+
+    rows = db.execute_procedure('sp_ApplyTaskStatusChanges', (json.dumps(items, ensure_ascii=False),))
+    return [{
+        'task_id': row['task_id'],
+        'old_status': row['old_status'],
+        'status': row['status'],
+        'applied': bool(row['applied']),
+        'message': row['message'],
+    } for row in sorted(rows, key=lambda row: row['seq'])]